@@ -15,11 +15,20 @@
 
 from FunSpec4DTMC.view.mainwindow import MainWindow
 from FunSpec4DTMC.model.SimulationControler import SimulationControler
+from FunSpec4DTMC.model.ResultStore import ResultStore
 from FunSpec4DTMC.model.parser.FunSpecParser import FunSpecParser
+from FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach import MCSForwardApproach
+import functools
+import os.path
+import threading
 import multiprocessing
 from multiprocessing import Process, Manager
 import time
 
+# directory of the result store shared by all projects that store their results, the results are filed under the
+# fingerprint of the chains
+RESULT_STORE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".FunSpec4DTMC", "results")
+
 
 class Simulator:
 
@@ -31,6 +40,7 @@ class Simulator:
         self._number_of_projects = 0
         self._project_number = 1
         self.projects = []
+        self.calculation_options = (False, False, False, False)
         self.new_project()
         self.persistence = False
         self.ignore_input_visualisation = False
@@ -58,6 +68,8 @@ class Simulator:
         self.fs_view.strategySelected.connect(self.select_calculation_method)
         self.fs_view.saveDialogOpened.connect(self.save_mc)
         self.fs_view.modeSelected.connect(self.change_mode)
+        self.fs_view.calculationOptionsSet.connect(self.set_calculation_options)
+        self.fs_view.storedResultsCleared.connect(self.clear_stored_results)
         self.fs_view.calculationPrecisionAdjusted.connect(self.adjust_calculation_precision)
         self.fs_view.displayPrecisionAdjusted.connect(self.adjust_display_precision)
         self.fs_view.discretizationPrecisionAdjusted.connect(self.adjust_dicretization_precision)
@@ -73,6 +85,10 @@ class Simulator:
         except ModuleNotFoundError:
             self.fs_view.enableCythonMode(False)
             self.simulation_simulator.enableCythonMode(False)
+            return
+        if not MCSForwardApproach.is_cython_available():
+            self.fs_view.enableCythonMode(False)
+            self.simulation_simulator.enableCythonMode(False)
 
     def change_mode(self, cython_mode: bool, research_mode: bool):
         """
@@ -84,6 +100,34 @@ class Simulator:
         self.enable_research_mode(research_mode)
 
 
+    def set_calculation_options(self, warm_start: bool, sparse_mode: bool, parallel_chains: bool,
+                                store_results: bool):
+        """
+        Method that sets the options of the calculation of the current and all subsequently created projects
+        :param warm_start: Selected if the iterative strategies start from the last stationary state distribution
+        :param sparse_mode: Selected if transition matrices are stored in compressed sparse row format
+        :param parallel_chains: Selected if the Markov chains of a project are analysed concurrently
+        :param store_results: Selected if the results are stored in the result store and read from it
+        """
+        self.calculation_options = (warm_start, sparse_mode, parallel_chains, store_results)
+        self.apply_calculation_options()
+
+    def apply_calculation_options(self):
+        """
+        Method that applies the options of the calculation to the current project
+        """
+        (warm_start, sparse_mode, parallel_chains, store_results) = self.calculation_options
+        self.simulation_simulator.enableWarmStart(warm_start)
+        self.simulation_simulator.enableSparseMode(sparse_mode)
+        self.simulation_simulator.enableParallelChains(parallel_chains)
+        self.simulation_simulator.set_result_store(RESULT_STORE_DIRECTORY if store_results else None)
+
+    def clear_stored_results(self):
+        """
+        Method that removes all results of the result store
+        """
+        ResultStore(RESULT_STORE_DIRECTORY).clear()
+
     def enable_cython_mode(self, cython_mode: bool):
         """
         Method that enables activation of the cython modes
@@ -139,6 +183,9 @@ class Simulator:
         :param steps: Current iteration step of the calculation
         :param norm: Current Ddviation of the state vector from the previous one in norm
         """
+        if threading.current_thread() is not threading.main_thread():
+            # calculations on a worker are shown by the project tab, which pulls the calculation progress
+            return
         try:
             self.fs_view.update_calculation_characteristics(steps, norm)
         except:
@@ -151,9 +198,12 @@ class Simulator:
         self._number_of_projects += 1
         self.simulation_simulator = SimulationControler()
         self.simulation_simulator.set_calculation_listener(self.update_calculation_characteristics)
+        self.apply_calculation_options()
         self.projects.append(self.simulation_simulator)
         if self._number_of_projects > 1:
             self.fs_view.new_project()
+        self.fs_view.set_calculation_progress(self.simulation_simulator.get_calculation_progress())
+        self.fs_view.set_analysis_executor(self.simulation_simulator.get_analysis_executor())
 
 
     def change_project(self, project_number: int):
@@ -308,6 +358,10 @@ class Simulator:
         else:
             raise NotImplementedError('This definition is not supported')
 
+        if outsourced_definition:
+            self.fs_parser.load_structural_analysis(self.simulation_simulator.get_markov_chains()[-1],
+                                                    input_file_path)
+
         if not self.ignore_input_visualisation:
             try:
                 manager = Manager()
@@ -384,7 +438,7 @@ class Simulator:
         :param alpha: value needed for alpha-relaxation
         :param visualisation_types: plots that have been requested
         :param start_state: a start state for MC simulation
-        :param scheme: calculation schemes in the case of the direct approach
+        :param scheme: calculation schemes in the case of the direct approach and the Krylov subspace methods
         :return:
         """
         if calculation_method == 'MCS - Matrix powering':
@@ -408,6 +462,27 @@ class Simulator:
         elif calculation_method == 'MCS - Forward approach':
             self.simulation_simulator.instantiate_MCSForwardApproach()
 
+        elif calculation_method == 'MCS - Krylov subspace':
+            self.simulation_simulator.instantiate_MCSKrylovSubspace(scheme)
+
+        elif calculation_method == 'MCS - Jacobi':
+            self.simulation_simulator.instantiate_MCSSplittingApproach("Jacobi")
+
+        elif calculation_method == 'MCS - Gauss-Seidel':
+            self.simulation_simulator.instantiate_MCSSplittingApproach("Gauss-Seidel")
+
+        elif calculation_method == 'MCS - SOR':
+            self.simulation_simulator.instantiate_MCSSplittingApproach("SOR")
+
+        elif calculation_method == 'MCS - Decomposition approach':
+            self.simulation_simulator.instantiate_MCSDecompositionApproach()
+
+        elif calculation_method == 'MCS - Periodic approach':
+            self.simulation_simulator.instantiate_MCSPeriodicApproach()
+
+        elif calculation_method == 'MCS - Aggregation-disaggregation':
+            self.simulation_simulator.instantiate_MCSAggregationDisaggregation()
+
 
         else:
             raise NotImplementedError('This simulation method is not implemented')
@@ -418,7 +493,10 @@ class Simulator:
 
     def visualize_results(self, plot: dict, steps: int, alpha: float, specified_period):
         """
-        Function for selection and controlling creation visualization of the results
+        Function for selection and controlling creation visualization of the results. Every requested analysis is
+        calculated on a worker of the project with its own snapshot of the project, its result is presented in the
+        graphical user interface as soon as it is available. The presentations only create the figures of the
+        calculated results.
         :param plot: Plots that have been requested
         :param steps: Number of iteration steps at creation
         :param alpha: value needed for alpha-relaxation
@@ -426,115 +504,140 @@ class Simulator:
         """
         if self.persistence is False:
             self.fs_view.clear_results()
+        simulation = self.simulation_simulator
+        executor = simulation.get_analysis_executor()
 
         graph_plot = plot['graph']
         if graph_plot[0]:
-
-            figures, titles = self.simulation_simulator.get_graph_plot(graph_plot[1], graph_plot[2])
-            for index in range(len(figures)):
-                self.fs_view.visualize_results(figures[index], "Graph of {mc}".format(mc=titles[index]))
+            job = simulation.get_job_controler()
+            executor.submit(job.calculate_period,
+                            functools.partial(self.present_graph_plots, job, graph_plot[1], graph_plot[2]),
+                            self.analysis_failed, job.get_calculation_progress())
 
         if plot['period']:
-            periods, titles = self.simulation_simulator.calculate_period()
-            for index in range(len(periods)):
-                self.fs_view.visualize_results(self.fs_parser.plot_period(periods[index]),
-                                            "Period of {mc}".format(mc=titles[index]))
+            job = simulation.get_job_controler()
+            executor.submit(job.calculate_period, self.present_periods, self.analysis_failed,
+                            job.get_calculation_progress())
 
         ssd_vector = plot["stationary state distribution vector"]
-        if ssd_vector[0]:
-            try:
-                stationary_state_distributions, titles = self.simulation_simulator.calculate_stationary_state_distributions(steps, alpha, specified_period)
-                for index in range(len(stationary_state_distributions)):
-                    self.fs_view.visualize_results(self.fs_parser.vector_plot(stationary_state_distributions[index]),
-                                                "Stationary state distribution vector of {mc}".format(mc=titles[index]))
-                    if ssd_vector[1]:
-                        path = ssd_vector[2] + '/stationary_state_distribution_mc{mc}.json'.format(mc=index)
-                        self.fs_parser.save_vector(stationary_state_distributions[index], path)
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+        job = simulation.get_job_controler()
+        ssd_plots = [(plot['stationary state distribution plot'], "SSD plot of {mc}",
+                      job.plot_stationary_state_distributions),
+                     (plot["cumulative stationary state distribution"], "CSSD plot of {mc}",
+                      job.plot_cumulative_stationary_state_distributions),
+                     (plot["complementary cumulative stationary state distribution"], "Complementary CSSD plot of {mc}",
+                      job.plot_complementary_cumulative_stationary_state_distributions)]
+        ssd_plots = [ssd_plot for ssd_plot in ssd_plots if ssd_plot[0][0]]
+        if ssd_vector[0] or ssd_plots:
+            executor.submit(functools.partial(job.calculate_stationary_state_distributions,
+                                              steps, alpha, specified_period),
+                            functools.partial(self.present_stationary_state_distributions, ssd_vector, ssd_plots,
+                                              steps, alpha, specified_period),
+                            self.analysis_failed, job.get_calculation_progress())
+
+        random_walk_plots = [(plot["evolution of state average"], "Evolution of state average plot of {mc}",
+                              "plot_evolution_of_state_average"),
+                             (plot["random walk"], "Random walk plot of {mc}", "plot_random_walk"),
+                             (plot["evolution of state probabilities"], "Evolution of state probabilities plot of {mc}",
+                              "plot_evolution_of_state_probabilities")]
+        for requested, title, plot_function in random_walk_plots:
+            if requested:
+                # the walks are simulated on the worker, only their figures are created on the thread of the
+                # user interface
+                job = simulation.get_job_controler()
+                executor.submit(functools.partial(job.simulate_random_walks, steps),
+                                functools.partial(self.present_random_walk_plots, getattr(job, plot_function),
+                                                  title, steps),
+                                self.analysis_failed, job.get_calculation_progress())
 
+        vector_tm = plot["transition matrix"]
+        if vector_tm[0]:
+            job = simulation.get_job_controler()
+            executor.submit(job.get_transition_matrix, functools.partial(self.present_transition_matrices, vector_tm),
+                            self.analysis_failed, job.get_calculation_progress())
 
-        ssd_plot = plot['stationary state distribution plot']
-        if ssd_plot[0]:
-            try:
-                figures, titles = self.simulation_simulator.plot_stationary_state_distributions(steps,
-                                                                                                alpha,
-                                                                                                specified_period,
-                                                                                                ssd_plot[1])
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "SSD plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
-
-        cssd_plot = plot["cumulative stationary state distribution"]
-        if cssd_plot[0]:
-            try:
-                figures, titles = self.simulation_simulator.plot_cumulative_stationary_state_distributions(steps,
-                                                                                                           alpha,
-                                                                                                           specified_period,
-                                                                                                           cssd_plot[1])
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "CSSD plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def present_graph_plots(self, simulation: SimulationControler, graph_layout: str, mark_closures: bool, result):
+        """
+        Function for presenting the graphs of the Markov chains, the structural analyses have been calculated
+        :param simulation: snapshot of the project the structural analyses have been calculated with
+        :param graph_layout: layout directive of the graph
+        :param mark_closures: Possibility to highlight closures in the graph
+        :param result: periods, titles
+        """
+        figures, titles = simulation.get_graph_plot(graph_layout, mark_closures)
+        for index in range(len(figures)):
+            self.fs_view.visualize_results(figures[index], "Graph of {mc}".format(mc=titles[index]))
 
-        ccssd_plot = plot["complementary cumulative stationary state distribution"]
-        if ccssd_plot[0]:
-            try:
-                figures, titles = self.simulation_simulator.plot_complementary_cumulative_stationary_state_distributions(steps,
-                                                                                                                         alpha,
-                                                                                                                         specified_period,
-                                                                                                                         ccssd_plot[1])
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "Complementary CSSD plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def present_periods(self, result):
+        """
+        Function for presenting the periods of the Markov chains
+        :param result: periods, titles
+        """
+        periods, titles = result
+        for index in range(len(periods)):
+            self.fs_view.visualize_results(self.fs_parser.plot_period(periods[index]),
+                                           "Period of {mc}".format(mc=titles[index]))
 
-        if plot["evolution of state average"]:
-            try:
-                figures, titles = self.simulation_simulator.plot_evolution_of_state_average(steps)
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "Evolution of state average plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def present_stationary_state_distributions(self, ssd_vector: list, ssd_plots: list, steps: int, alpha: float,
+                                               specified_period, result):
+        """
+        Function for presenting the stationary state distributions of the Markov chains. The plots are created from
+        the calculated distributions by the snapshot of the project the calculation was run with.
+        :param ssd_vector: vector request (selected, save, directory)
+        :param ssd_plots: list of plot requests ((selected, separated), title, plot function of the snapshot)
+        :param steps: Number of iteration steps
+        :param alpha: value needed for alpha-relaxation
+        :param specified_period: specified value for period
+        :param result: stationary state distributions, titles
+        """
+        stationary_state_distributions, titles = result
+        if ssd_vector[0]:
+            for index in range(len(stationary_state_distributions)):
+                self.fs_view.visualize_results(self.fs_parser.vector_plot(stationary_state_distributions[index]),
+                                               "Stationary state distribution vector of {mc}".format(mc=titles[index]))
+                if ssd_vector[1]:
+                    path = ssd_vector[2] + '/stationary_state_distribution_mc{mc}.json'.format(mc=index)
+                    self.fs_parser.save_vector(stationary_state_distributions[index], path)
+        for ssd_plot, title, plot_function in ssd_plots:
+            figures, plot_titles = plot_function(steps, alpha, specified_period, ssd_plot[1],
+                                                 stationary_state_distributions)
+            for index in range(len(figures)):
+                self.fs_view.visualize_results(figures[index], title.format(mc=plot_titles[index]))
 
-        if plot["random walk"]:
-            try:
-                figures, titles = self.simulation_simulator.plot_random_walk(steps)
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "Random walk plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def present_random_walk_plots(self, plot_function, title: str, steps: int, result):
+        """
+        Function for creating and presenting the random walk plots of the Markov chains
+        :param plot_function: plot method of the snapshot of the project the walks were simulated with
+        :param title: title of the plots
+        :param steps: Number of iteration steps
+        :param result: random walks, titles
+        """
+        random_walks, titles = result
+        figures, titles = plot_function(steps, random_walks)
+        for index in range(len(figures)):
+            self.fs_view.visualize_results(figures[index], title.format(mc=titles[index]))
 
-        if plot["evolution of state probabilities"]:
-            try:
-                figures, titles = self.simulation_simulator.plot_evolution_of_state_probabilities(steps)
-                for index in range(len(figures)):
-                    self.fs_view.visualize_results(figures[index], "Evolution of state probabilities plot of {mc}".format(mc=titles[index]))
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def present_transition_matrices(self, vector_tm: list, result):
+        """
+        Function for presenting the transition matrices of the Markov chains
+        :param vector_tm: transition matrix request (selected, save, directory)
+        :param result: transition matrices, titles
+        """
+        transition_matrices, titles = result
+        for index in range(len(transition_matrices)):
+            self.fs_view.visualize_results(self.fs_parser.matrix_plot(transition_matrices[index]),
+                                           "Transition matrix of {mc}".format(mc=titles[index]))
+            if vector_tm[1]:
+                path = vector_tm[2] + '/transition_matrix_mc{mc}.json'.format(mc=index)
+                self.fs_parser.save_matrix(transition_matrices[index], path)
 
-        vector_tm = plot["transition matrix"]
-        if vector_tm[0]:
-            try:
-                transition_matrices, titles = self.simulation_simulator.get_transition_matrix()
-                for index in range(len(transition_matrices)):
-
-                    self.fs_view.visualize_results(self.fs_parser.matrix_plot(transition_matrices[index]),
-                                                "Transition matrix of {mc}".format(mc=titles[index]))
-                    if vector_tm[1]:
-                        path = vector_tm[2] + '/transition_matrix_mc{mc}.json'.format(mc=index)
-                        self.fs_parser.save_matrix(transition_matrices[index], path)
-            except:
-                self.fs_view.show_calculation_error_dialog()
-                raise InterruptedError
+    def analysis_failed(self, error: Exception):
+        """
+        Function that is informed about a failed analysis, cancelled analyses are dropped without a message
+        :param error: exception of the calculation
+        """
+        if not isinstance(error, InterruptedError):
+            self.fs_view.show_calculation_error_dialog()
 
 def timeout(process):
     """
@@ -0,0 +1,136 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from FunSpec4DTMC.model.CalculationProgress import CalculationProgress
+
+
+class AnalysisExecutor:
+
+    def __init__(self, max_workers: int = 1):
+        """
+        Constructor of the executor of the analyses of a project. Every analysis is split into a calculation, which
+        runs on a worker thread, and a presentation of its result, which is handed to the result listener. The
+        user interface forwards the presentation to its own thread, e.g. with a queued signal.
+        :param max_workers: number of worker threads, more than one runs independent analyses concurrently
+        """
+        self._max_workers = max_workers
+        self._executor = None
+        self._futures = []
+        self._result_listener = None
+        self._lock = threading.Lock()
+
+    def set_result_listener(self, listener: object):
+        """
+        Setter method of the result listener, a function (function, argument) called on the worker thread that
+        has to execute function(argument) on the thread of the user interface
+        :param listener: result listener or None to execute the presentations directly
+        """
+        self._result_listener = listener
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Setter method of the number of worker threads, takes effect for subsequently submitted analyses
+        :param max_workers: number of worker threads
+        """
+        with self._lock:
+            self._max_workers = max_workers
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def get_executor(self):
+        """
+        Getter method of the thread pool, it is created on first use
+        :return: ThreadPoolExecutor
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                    thread_name_prefix="analysis")
+            return self._executor
+
+    def submit(self, calculation, presentation, failure=None, calculation_progress: CalculationProgress = None):
+        """
+        Function for submitting an analysis
+        :param calculation: function without arguments that calculates the result
+        :param presentation: function that presents the result
+        :param failure: function that is informed about an exception of the calculation
+        :param calculation_progress: progress of this calculation only, see CalculationProgress.create_job_progress,
+        it is cancelled together with the analysis
+        :return: cancellable future of the calculation
+        """
+        future = self.get_executor().submit(calculation)
+        with self._lock:
+            self._futures = [(running, progress) for running, progress in self._futures if not running.done()]
+            self._futures.append((future, calculation_progress))
+        future.add_done_callback(lambda done: self._finished(done, presentation, failure))
+        return future
+
+    def _finished(self, future, presentation, failure):
+        """
+        Hands the result or the exception of a finished calculation to the result listener
+        :param future: future of the calculation
+        :param presentation: function that presents the result
+        :param failure: function that is informed about an exception of the calculation
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            self._publish(presentation, future.result())
+        elif failure is not None:
+            self._publish(failure, error)
+
+    def _publish(self, function, argument):
+        """
+        Executes function(argument) through the result listener
+        :param function: presentation or failure function
+        :param argument: result or exception
+        """
+        if self._result_listener is None:
+            function(argument)
+        else:
+            self._result_listener(function, argument)
+
+    def is_running(self):
+        """
+        Function to check whether analyses are pending or running
+        :return: True if an analysis has not finished yet
+        """
+        with self._lock:
+            return any(not future.done() for future, _ in self._futures)
+
+    def cancel(self):
+        """
+        Function to cancel the pending analyses and to stop the running calculations at their next step. Only the
+        analyses submitted so far are cancelled, subsequently submitted analyses run with their own progress.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        for future, calculation_progress in futures:
+            future.cancel()
+            if calculation_progress is not None:
+                calculation_progress.cancel()
+
+    def shutdown(self):
+        """
+        Function to cancel all analyses and to release the worker threads
+        """
+        self.cancel()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
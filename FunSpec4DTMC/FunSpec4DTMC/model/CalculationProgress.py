@@ -0,0 +1,115 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+
+
+class CalculationProgress:
+
+    def __init__(self, max_updates_per_second: float = 20, parent=None):
+        """
+        Constructor of the progress of a calculation. The simulators report every step with update, which only
+        stores the current state and checks the cancellation. The listener is informed at most
+        max_updates_per_second times per second, the user interface may also pull the state with get_state.
+        :param max_updates_per_second: maximal number of listener notifications per second
+        :param parent: progress of the project the steps are forwarded to, see create_job_progress
+        """
+        self._cancelled = threading.Event()
+        self._parent = parent
+        self._listener = None
+        self._interval = 1.0 / max_updates_per_second
+        self._last_publication = 0.0
+        self._step = 0
+        self._norm = None
+
+    def set_max_updates_per_second(self, max_updates_per_second: float):
+        """
+        Setter method of the maximal number of listener notifications per second
+        :param max_updates_per_second: maximal number of listener notifications per second
+        """
+        self._interval = 1.0 / max_updates_per_second
+
+    def set_listener(self, listener: object):
+        """
+        Setter method of the listener, a function (step, norm) that may raise an exception to stop the calculation
+        :param listener: listener or None
+        """
+        self._listener = listener
+
+    def update(self, step: int, norm=None):
+        """
+        Function that receives the calculation status of every step
+        :param step: current step
+        :param norm: current accuracy of the calculation
+        """
+        if self._cancelled.is_set():
+            raise InterruptedError
+        self._step = step
+        self._norm = norm
+        if self._parent is not None:
+            self._parent.update(step, norm)
+        elif self._listener is not None:
+            now = time.monotonic()
+            if now - self._last_publication >= self._interval:
+                self._last_publication = now
+                self.publish()
+
+    def create_job_progress(self):
+        """
+        Creates the progress of a single calculation. It forwards every step to this progress, which shows the state
+        of all calculations, but has its own cancellation, so cancelling the calculation does not affect the other
+        calculations and a new calculation does not resume a cancelled one.
+        :return: CalculationProgress
+        """
+        return CalculationProgress(parent=self)
+
+    def publish(self):
+        """
+        Function that informs the listener about the current calculation status
+        """
+        if self._listener is not None:
+            try:
+                self._listener(self._step, self._norm)
+            except:
+                raise InterruptedError
+
+    def get_state(self):
+        """
+        Getter method of the current calculation status
+        :return: step, norm
+        """
+        return self._step, self._norm
+
+    def cancel(self):
+        """
+        Function to stop the running calculation at its next step
+        """
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        """
+        Function to check whether the calculation has been cancelled
+        :return: True if cancelled
+        """
+        return self._cancelled.is_set()
+
+    def reset(self):
+        """
+        Function to prepare the progress for a new calculation
+        """
+        self._cancelled.clear()
+        self._last_publication = 0.0
+        self._step = 0
+        self._norm = None
@@ -0,0 +1,285 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+import numpy as np
+import scipy.sparse
+from FunSpec4DTMC.model.CalculationProgress import CalculationProgress
+from FunSpec4DTMC.model.markov_chain.MarkovChainConventionalApproach import MarkovChainConventionalApproach
+
+ANALYSES = ("stationary state distribution", "structural analysis", "transition matrix")
+
+
+class MarkovChainPool:
+
+    def __init__(self, max_workers: int = None, calculation_progress: CalculationProgress = None):
+        """
+        Constructor of the project-level executor that analyses the Markov chains of a project on a process pool.
+        Every chain is analysed by its own copy of the simulator, the transition matrices of conventional chains are
+        passed to the workers in shared memory instead of being pickled.
+        :param max_workers: number of worker processes, the number of processors if None
+        :param calculation_progress: progress that is informed about finished chains and cancels the workers
+        """
+        self._max_workers = max_workers
+        self._calculation_progress = calculation_progress
+        self._executor = None
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Setter method of the number of worker processes, the pool is created anew on its next use
+        :param max_workers: number of worker processes
+        """
+        self._max_workers = max_workers
+        self.shutdown()
+
+    def get_executor(self):
+        """
+        Getter method of the process pool, it is created on first use and kept for subsequent analyses
+        :return: ProcessPoolExecutor
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers,
+                                                 mp_context=multiprocessing.get_context())
+        return self._executor
+
+    def shutdown(self):
+        """
+        Function to release the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def map(self, simulator, markov_chains: list, analysis: str, arguments: tuple = (),
+            calculation_progress: CalculationProgress = None):
+        """
+        Function for analysing Markov chains concurrently. Results that are stored on a Markov chain and remain
+        valid are not calculated again, new results are stored on the Markov chains. Every call has its own
+        cancellation flag in shared memory, so cancelling it does not affect other calls on the same pool.
+        :param simulator: simulator whose strategy and settings are used for every chain
+        :param markov_chains: Markov chains
+        :param analysis: "stationary state distribution" with arguments (steps, alpha, specified period),
+        "structural analysis" or "transition matrix"
+        :param arguments: arguments of the analysis
+        :param calculation_progress: progress of the call, the progress of the pool if None
+        :return: list of results in the order of the Markov chains
+        """
+        if analysis not in ANALYSES:
+            raise NotImplementedError('This analysis is not implemented')
+        results = [self.get_stored_result(simulator, markov_chain, analysis, arguments)
+                   for markov_chain in markov_chains]
+        pending = [index for index in range(len(markov_chains)) if results[index] is None]
+        if not pending:
+            return results
+        if calculation_progress is None:
+            calculation_progress = self._calculation_progress
+        worker_simulator = copy.copy(simulator)
+        worker_simulator.set_markov_chain(None)
+        worker_simulator.remove_calculation_listeners()
+        executor = self.get_executor()
+        cancel_flag, cancel_block = share_array(np.zeros(1, dtype=np.bool_))
+        shared_blocks = [cancel_block]
+        futures = {}
+        try:
+            for index in pending:
+                specification, blocks = share_markov_chain(markov_chains[index])
+                shared_blocks.extend(blocks)
+                futures[executor.submit(_analyse_markov_chain, worker_simulator, specification, analysis,
+                                        arguments, cancel_flag)] = index
+            finished = len(markov_chains) - len(pending)
+            running = set(futures)
+            while running:
+                done, running = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    results[index] = self.store_result(simulator, markov_chains[index], analysis, arguments,
+                                                       future.result())
+                    finished += 1
+                if calculation_progress is not None:
+                    calculation_progress.update(finished)
+        except BaseException:
+            # stops the remaining chains of this call after a cancellation or a failed chain
+            np.ndarray(1, dtype=np.bool_, buffer=cancel_block.buf)[0] = True
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            for block in shared_blocks:
+                block.close()
+                block.unlink()
+        return results
+
+    @staticmethod
+    def get_stored_result(simulator, markov_chain, analysis: str, arguments: tuple):
+        """
+        Returns a result that is already stored on the Markov chain
+        :param simulator: simulator whose strategy and settings are used for every chain
+        :param markov_chain: Markov chain
+        :param analysis: analysis
+        :param arguments: arguments of the analysis
+        :return: stored result or None
+        """
+        if analysis == "stationary state distribution":
+            if not simulator.is_reproducible():
+                return None
+            return markov_chain.get_cached_stationary_state_distribution(simulator.get_result_key(*arguments))
+        if analysis == "structural analysis":
+            return markov_chain.get_structural_analysis()
+        if analysis == "transition matrix" and markov_chain.get_type() == "MarkovChainConventionalApproach":
+            return markov_chain.get_transition_matrix()
+        return None
+
+    @staticmethod
+    def store_result(simulator, markov_chain, analysis: str, arguments: tuple, outcome: tuple):
+        """
+        Stores the outcome of a worker on the Markov chain
+        :param simulator: simulator whose strategy and settings are used for every chain
+        :param markov_chain: Markov chain
+        :param analysis: analysis
+        :param arguments: arguments of the analysis
+        :param outcome: result, structural analysis of the worker
+        :return: result
+        """
+        result, structural_analysis = outcome
+        if structural_analysis is not None and markov_chain.get_structural_analysis() is None:
+            markov_chain.set_structural_analysis(structural_analysis)
+        if analysis == "stationary state distribution":
+            if simulator.is_reproducible():
+                markov_chain.set_cached_stationary_state_distribution(simulator.get_result_key(*arguments), result)
+            else:
+                markov_chain.set_stationary_state_distribution(result)
+        return result
+
+
+def share_array(array: np.ndarray):
+    """
+    Copies an array into a shared memory block
+    :param array: array
+    :return: descriptor (name, shape, dtype), shared memory block
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return (block.name, array.shape, array.dtype.str), block
+
+
+def attach_array(descriptor: tuple):
+    """
+    Attaches an array in a shared memory block without copying it
+    :param descriptor: descriptor (name, shape, dtype)
+    :return: array, shared memory block
+    """
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf), block
+
+
+def share_markov_chain(markov_chain):
+    """
+    Creates the specification of a Markov chain for a worker process. The transition matrix of a conventional
+    chain is placed in shared memory, functional chains are pickled.
+    :param markov_chain: Markov chain
+    :return: specification, list of shared memory blocks
+    """
+    if markov_chain.get_type() != "MarkovChainConventionalApproach":
+        return ("pickled", markov_chain), []
+    transition_matrix = markov_chain.get_transition_matrix()
+    if scipy.sparse.issparse(transition_matrix):
+        transition_matrix = scipy.sparse.csr_matrix(transition_matrix)
+        shared = [share_array(transition_matrix.data), share_array(transition_matrix.indices),
+                  share_array(transition_matrix.indptr)]
+        matrix_specification = ("csr", transition_matrix.shape, [descriptor for descriptor, block in shared])
+    else:
+        shared = [share_array(np.asarray(transition_matrix, dtype=float))]
+        matrix_specification = ("dense", None, [shared[0][0]])
+    specification = ("shared", np.array(markov_chain.get_initial_state_vector()),
+                     markov_chain.get_state_designations(), matrix_specification,
+                     markov_chain.get_structural_analysis(), markov_chain.get_warm_start_vector())
+    return specification, [block for descriptor, block in shared]
+
+
+def create_cancellation_listener(cancel_flag: np.ndarray):
+    """
+    Creates the calculation listener of a worker process that stops the calculation once its call is cancelled
+    :param cancel_flag: cancellation flag of the call in shared memory
+    :return: calculation listener
+    """
+    def check_cancellation(step: int, norm=None):
+        if cancel_flag[0]:
+            raise InterruptedError
+    return check_cancellation
+
+
+def _analyse_markov_chain(simulator, specification: tuple, analysis: str, arguments: tuple, cancel_flag: tuple):
+    """
+    Analyses a single Markov chain in a worker process
+    :param simulator: simulator without Markov chain
+    :param specification: specification of the Markov chain
+    :param analysis: analysis
+    :param arguments: arguments of the analysis
+    :param cancel_flag: descriptor of the cancellation flag of the call
+    :return: result, structural analysis
+    """
+    blocks = []
+    try:
+        flag, block = attach_array(cancel_flag)
+        blocks.append(block)
+        if flag[0]:
+            raise InterruptedError
+        if specification[0] == "pickled":
+            markov_chain = specification[1]
+        else:
+            (kind, initial_state_vector, state_designations, matrix_specification, structural_analysis,
+             warm_start_vector) = specification
+            matrix_format, shape, descriptors = matrix_specification
+            arrays = []
+            for descriptor in descriptors:
+                array, block = attach_array(descriptor)
+                arrays.append(array)
+                blocks.append(block)
+            if matrix_format == "csr":
+                transition_matrix = scipy.sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+            else:
+                transition_matrix = arrays[0]
+            markov_chain = MarkovChainConventionalApproach(initial_state_vector, transition_matrix,
+                                                           state_designations)
+            markov_chain.set_structural_analysis(structural_analysis)
+            if warm_start_vector is not None:
+                markov_chain.set_stationary_state_distribution(warm_start_vector)
+        simulator.set_markov_chain(markov_chain)
+        simulator.add_calculation_listener(create_cancellation_listener(flag))
+        if analysis == "stationary state distribution":
+            result = np.array(simulator.get_stationary_state_distribution(*arguments))
+        elif analysis == "structural analysis":
+            result = simulator.get_structural_analysis()
+        else:
+            result = simulator.calculate_transition_matrix()
+            if not scipy.sparse.issparse(result):
+                result = np.array(result)
+        structural_analysis = markov_chain.get_structural_analysis()
+        return result, structural_analysis
+    finally:
+        simulator = None
+        markov_chain = None
+        transition_matrix = None
+        arrays = None
+        flag = None
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass
@@ -0,0 +1,336 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import importlib
+import inspect
+import marshal
+import os
+import shutil
+import tempfile
+import numpy as np
+import scipy.sparse
+from FunSpec4DTMC.model.markov_chain.StructuralAnalysis import StructuralAnalysis
+
+# exceptions of unreadable or incomplete result files, which are treated as missing
+_LOAD_ERRORS = (OSError, ValueError, KeyError, EOFError)
+# default size limit of a result store in bytes
+DEFAULT_MAX_SIZE = 1 << 30
+
+
+class ResultStore:
+
+    def __init__(self, directory: str, mmap_mode: str = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Constructor of the content-addressed store of the results of solved Markov chains. The results are filed
+        under the fingerprint of the chain specification, so they are found again for every chain with the same
+        specification, e.g. after reopening a project or in a repeated parameter sweep. Stationary state
+        distributions and dense transition matrices are stored as .npy, sparse transition matrices and structural
+        analyses, which contain the closures and periods, as .npz.
+        :param directory: directory of the store, created on first use
+        :param mmap_mode: mode the stored vectors and dense matrices are memory mapped with, e.g. "r", None to read
+        them into memory
+        :param max_size: size limit of the store in bytes, the results of the least recently used chains are removed
+        once it is exceeded, None for no limit
+        """
+        self._directory = directory
+        self._mmap_mode = mmap_mode
+        self._max_size = max_size
+        self._size = None
+
+    def get_directory(self):
+        """
+        Getter method of the directory of the store
+        :return: directory
+        """
+        return self._directory
+
+    def get_max_size(self):
+        """
+        Getter method of the size limit of the store
+        :return: size limit in bytes or None
+        """
+        return self._max_size
+
+    def get_size(self):
+        """
+        Returns the size of all files in the store
+        :return: size in bytes
+        """
+        size = 0
+        for path, _, file_names in os.walk(self._directory):
+            for file_name in file_names:
+                try:
+                    size += os.path.getsize(os.path.join(path, file_name))
+                except OSError:
+                    pass
+        self._size = size
+        return size
+
+    def clear(self):
+        """
+        Removes all stored results
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
+        self._size = 0
+
+    @staticmethod
+    def get_fingerprint(markov_chain):
+        """
+        Returns the SHA-1 fingerprint of the specification of a Markov chain. Conventional chains are identified by
+        their initial state vector and the bytes of their transition matrix in compressed sparse row format, so the
+        fingerprint does not depend on the storage format. Functional chains are identified by their initial state
+        vector, states, factors, factor distributions and the source of their transition functions. The fingerprint
+        is kept by the chain until its specification changes.
+        :param markov_chain: Markov chain
+        :return: hexadecimal fingerprint
+        """
+        if markov_chain.get_fingerprint() is not None:
+            return markov_chain.get_fingerprint()
+        fingerprint = hashlib.sha1(markov_chain.get_type().encode())
+        _update_fingerprint(fingerprint, np.asarray(markov_chain.get_initial_state_vector(), dtype=float))
+        if markov_chain.get_type() == "MarkovChainConventionalApproach":
+            _update_fingerprint(fingerprint, scipy.sparse.csr_matrix(markov_chain.get_transition_matrix()))
+        else:
+            _update_fingerprint(fingerprint, markov_chain.get_states())
+            _update_fingerprint(fingerprint, markov_chain.get_factors())
+            _update_fingerprint(fingerprint, markov_chain.get_factor_distributions())
+            fingerprint.update(ResultStore.get_transition_function_source(markov_chain))
+        markov_chain.set_fingerprint(fingerprint.hexdigest())
+        return markov_chain.get_fingerprint()
+
+    @staticmethod
+    def get_transition_function_source(markov_chain):
+        """
+        Returns the source of the transition functions of a functional Markov chain. Modules without source file,
+        e.g. the in-memory modules of a parameter sweep, are represented by the byte code of their functions.
+        :param markov_chain: MarkovChainForwardApproach
+        :return: bytes
+        """
+        module = importlib.import_module(markov_chain.get_transition_functions())
+        try:
+            return inspect.getsource(module).encode()
+        except (OSError, TypeError):
+            return b"".join(marshal.dumps(transition_function.__code__)
+                            for transition_function in markov_chain.get_resolved_transition_functions())
+
+    @staticmethod
+    def get_key_name(key: tuple):
+        """
+        Returns the file name part of a result key
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: hexadecimal digest of the key
+        """
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def get_path(self, fingerprint: str, file_name: str):
+        """
+        Returns the path of a result file of a Markov chain
+        :param fingerprint: fingerprint of the Markov chain
+        :param file_name: name of the result file
+        :return: path
+        """
+        return os.path.join(self._directory, fingerprint[:2], fingerprint, file_name)
+
+    def get_stationary_state_distribution_path(self, fingerprint: str, key: tuple):
+        """
+        Returns the path of a stationary state distribution of a Markov chain
+        :param fingerprint: fingerprint of the Markov chain
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: path
+        """
+        return self.get_path(fingerprint, "stationary_state_distribution_{key}.npy".format(key=self.get_key_name(key)))
+
+    def _write(self, path: str, write):
+        """
+        Writes a result file atomically through a unique temporary file, so that concurrent threads and processes
+        never read a partially written file. Afterwards the size limit of the store is enforced.
+        :param path: path of the result file
+        :param write: function that writes the result to the given path
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        base, extension = os.path.splitext(os.path.basename(path))
+        file_descriptor, temporary_path = tempfile.mkstemp(suffix=".tmp" + extension, prefix=base + ".",
+                                                           dir=os.path.dirname(path))
+        os.close(file_descriptor)
+        try:
+            write(temporary_path)
+            size = os.path.getsize(temporary_path)
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        if self._size is not None:
+            self._size += size
+        self._limit_size(os.path.dirname(path))
+
+    def _limit_size(self, keep: str):
+        """
+        Removes the results of the least recently used chains until the store is within its size limit
+        :param keep: directory of the chain that has just been written, it is not removed
+        """
+        if self._max_size is None:
+            return
+        if self._size is None or self._size > self._max_size:
+            self.get_size()
+        if self._size <= self._max_size:
+            return
+        entries = []
+        for prefix in os.listdir(self._directory):
+            prefix_directory = os.path.join(self._directory, prefix)
+            if not os.path.isdir(prefix_directory):
+                continue
+            for fingerprint in os.listdir(prefix_directory):
+                directory = os.path.join(prefix_directory, fingerprint)
+                if os.path.isdir(directory) and directory != keep:
+                    try:
+                        entries.append((os.path.getmtime(directory), directory))
+                    except OSError:
+                        pass
+        for _, directory in sorted(entries):
+            if self._size <= self._max_size:
+                break
+            shutil.rmtree(directory, ignore_errors=True)
+            self.get_size()
+
+    def _touch(self, fingerprint: str):
+        """
+        Marks the results of a chain as recently used
+        :param fingerprint: fingerprint of the Markov chain
+        """
+        try:
+            os.utime(os.path.dirname(self.get_path(fingerprint, "")))
+        except OSError:
+            pass
+
+    def save_stationary_state_distribution(self, fingerprint: str, key: tuple, stationary_state_distribution):
+        """
+        Stores the stationary state distribution of a Markov chain
+        :param fingerprint: fingerprint of the Markov chain
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :param stationary_state_distribution: stationary state distribution
+        """
+        stationary_state_distribution = np.asarray(stationary_state_distribution, dtype=float)
+        self._write(self.get_stationary_state_distribution_path(fingerprint, key),
+                    lambda temporary_path: np.save(temporary_path, stationary_state_distribution))
+
+    def load_stationary_state_distribution(self, fingerprint: str, key: tuple):
+        """
+        Loads a stored stationary state distribution of a Markov chain
+        :param fingerprint: fingerprint of the Markov chain
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: stationary state distribution or None if it has not been stored
+        """
+        path = self.get_stationary_state_distribution_path(fingerprint, key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            stationary_state_distribution = np.load(path, mmap_mode=self._mmap_mode)
+        except _LOAD_ERRORS:
+            return None
+        self._touch(fingerprint)
+        return stationary_state_distribution
+
+    def save_transition_matrix(self, fingerprint: str, transition_matrix):
+        """
+        Stores the transition matrix of a Markov chain, sparse matrices in compressed sparse row format
+        :param fingerprint: fingerprint of the Markov chain
+        :param transition_matrix: dense or sparse transition matrix
+        """
+        if scipy.sparse.issparse(transition_matrix):
+            self._write(self.get_path(fingerprint, "transition_matrix.npz"),
+                        lambda temporary_path: scipy.sparse.save_npz(temporary_path,
+                                                                   scipy.sparse.csr_matrix(transition_matrix)))
+        else:
+            self._write(self.get_path(fingerprint, "transition_matrix.npy"),
+                        lambda temporary_path: np.save(temporary_path, np.asarray(transition_matrix, dtype=float)))
+
+    def load_transition_matrix(self, fingerprint: str, sparse: bool):
+        """
+        Loads a stored transition matrix of a Markov chain in the requested format
+        :param fingerprint: fingerprint of the Markov chain
+        :param sparse: True to return the matrix in compressed sparse row format
+        :return: transition matrix or None if it has not been stored
+        """
+        sparse_path = self.get_path(fingerprint, "transition_matrix.npz")
+        dense_path = self.get_path(fingerprint, "transition_matrix.npy")
+        try:
+            if os.path.isfile(sparse_path):
+                transition_matrix = scipy.sparse.csr_matrix(scipy.sparse.load_npz(sparse_path))
+                transition_matrix = transition_matrix if sparse else transition_matrix.toarray()
+            elif os.path.isfile(dense_path):
+                transition_matrix = np.load(dense_path, mmap_mode=None if sparse else self._mmap_mode)
+                transition_matrix = scipy.sparse.csr_matrix(transition_matrix) if sparse else transition_matrix
+            else:
+                return None
+        except _LOAD_ERRORS:
+            return None
+        self._touch(fingerprint)
+        return transition_matrix
+
+    def save_structural_analysis(self, fingerprint: str, structural_analysis: StructuralAnalysis):
+        """
+        Stores the structural analysis of a Markov chain, the closures and periods are calculated for it
+        :param fingerprint: fingerprint of the Markov chain
+        :param structural_analysis: structural analysis
+        """
+        self._write(self.get_path(fingerprint, "structure.npz"),
+                    lambda temporary_path: structural_analysis.save(temporary_path, fingerprint))
+
+    def load_structural_analysis(self, fingerprint: str, number_of_states: int):
+        """
+        Loads a stored structural analysis of a Markov chain
+        :param fingerprint: fingerprint of the Markov chain
+        :param number_of_states: number of states of the Markov chain
+        :return: StructuralAnalysis or None if it has not been stored
+        """
+        path = self.get_path(fingerprint, "structure.npz")
+        if not os.path.isfile(path):
+            return None
+        try:
+            structural_analysis = StructuralAnalysis.load(path, fingerprint)
+        except _LOAD_ERRORS:
+            return None
+        if structural_analysis is None or \
+                structural_analysis.get_graph().get_number_of_vertices() != number_of_states:
+            return None
+        self._touch(fingerprint)
+        return structural_analysis
+
+
+def _update_fingerprint(fingerprint, value):
+    """
+    Feeds a part of a Markov chain specification into a fingerprint. Arrays contribute their type, shape and bytes,
+    nested lists are traversed, other values contribute their representation.
+    :param fingerprint: hash object
+    :param value: part of the specification
+    """
+    if scipy.sparse.issparse(value):
+        value = scipy.sparse.csr_matrix(value, dtype=float, copy=True)
+        value.sum_duplicates()
+        value.eliminate_zeros()
+        fingerprint.update("csr{shape}".format(shape=value.shape).encode())
+        for array in (value.data, value.indices, value.indptr):
+            _update_fingerprint(fingerprint, array)
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        fingerprint.update("{dtype}{shape}".format(dtype=value.dtype.str, shape=value.shape).encode())
+        fingerprint.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        fingerprint.update("[{length}".format(length=len(value)).encode())
+        for item in value:
+            _update_fingerprint(fingerprint, item)
+        fingerprint.update(b"]")
+    else:
+        fingerprint.update(repr(value).encode())
@@ -13,6 +13,7 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import copy
 import matplotlib.pyplot as plt
 import numpy as np
 from FunSpec4DTMC.model.markov_chain.MarkovChainForwardApproach import MarkovChainForwardApproach
@@ -24,8 +25,18 @@ from FunSpec4DTMC.model.markov_chain_simulator.MCSLimitingDistribution import MC
 from FunSpec4DTMC.model.markov_chain_simulator.MCSMatrixPowering import MCSMatrixPowering
 from FunSpec4DTMC.model.markov_chain_simulator.MCSRandomWalk import MCSRandomWalk
 from FunSpec4DTMC.model.markov_chain_simulator.MCSDirectApproach import MCSDirectApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSKrylovSubspace import MCSKrylovSubspace
+from FunSpec4DTMC.model.markov_chain_simulator.MCSSplittingApproach import MCSSplittingApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSDecompositionApproach import MCSDecompositionApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSPeriodicApproach import MCSPeriodicApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSAggregationDisaggregation import MCSAggregationDisaggregation
 from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
 from FunSpec4DTMC.model.Systems.Systems import GIGI1Qmax, System
+from FunSpec4DTMC.model.Systems.ParameterSweep import ParameterSweep
+from FunSpec4DTMC.model.CalculationProgress import CalculationProgress
+from FunSpec4DTMC.model.AnalysisExecutor import AnalysisExecutor
+from FunSpec4DTMC.model.MarkovChainPool import MarkovChainPool
+from FunSpec4DTMC.model.ResultStore import ResultStore, DEFAULT_MAX_SIZE
 
 
 class SimulationControler:
@@ -37,11 +48,20 @@ class SimulationControler:
         self.MCSimulator = MarkovChainSimulator(self.markov_chain)
         self.researchMode = True
         self.cythonMode = False
+        self.sparseMode = False
+        self.warmStart = False
+        self.parallelChains = False
+        self.replications = 1
+        self.relative_ci_width = 0.05
         self.precision = 10e-16
         self.discretization_precision = 10e-9
         self.markov_chains = []
         self.system_reset()
-        self._calculation_listener = None
+        self.calculation_progress = CalculationProgress()
+        self._calculation_listener = self.calculation_progress.update
+        self.analysis_executor = AnalysisExecutor()
+        self.markov_chain_pool = MarkovChainPool(calculation_progress=self.calculation_progress)
+        self.result_store = None
         self.number_of_mc = 0
 
     def set_queueing_system(self, system_configuration: dict):
@@ -55,6 +75,30 @@ class SimulationControler:
         self.system.enableResearchMode(self.researchMode)
         return self.system
 
+    def create_parameter_sweep(self, system_input: list, grids: dict, results_file_path: str,
+                               service_time_adjustment: bool = False, separated_factors: bool = True,
+                               max_workers: int = None):
+        """
+        Function for creating a parameter sweep over GI/GI/1-Qmax systems with the precisions and modes of the project.
+        The sweep is only available through this API, not in the graphical interface.
+        :param system_input: system input as entered in the system specification dialog
+        :param grids: values per parameter
+        :param results_file_path: path of the results file
+        :param service_time_adjustment: Adjustment of the service time to calculation precision
+        :param separated_factors: Separation of the factor space
+        :param max_workers: number of worker processes
+        :return: ParameterSweep
+        """
+        sweep = ParameterSweep(system_input, grids, results_file_path, max_workers)
+        sweep.set_calculation_precision(self.precision)
+        sweep.set_discretization_precision(self.discretization_precision)
+        sweep.enableResearchMode(self.researchMode)
+        sweep.enableSparseMode(self.sparseMode)
+        sweep.set_system_options(service_time_adjustment, separated_factors)
+        if self.result_store is not None:
+            sweep.set_result_store_directory(self.result_store.get_directory(), self.result_store.get_max_size())
+        return sweep
+
     def enableResearchMode(self, enabled: bool):
         """
         Method that enables activation of the research modes
@@ -70,6 +114,92 @@ class SimulationControler:
         """
         self.cythonMode = enabled
 
+    def enableSparseMode(self, enabled: bool):
+        """
+        Method that enables the sparse storage of the transition matrices of subsequently added Markov chains
+        and the sparse derivation of transition matrices from functional specifications
+        :param enabled: Selected if transition matrices are stored in compressed sparse row format
+        """
+        self.sparseMode = enabled
+
+    def enableWarmStart(self, enabled: bool):
+        """
+        Method that enables the warm start of the iterative strategies from previously calculated stationary state
+        distributions
+        :param enabled: Selected if the iterative strategies start from the last stationary state distribution
+        """
+        self.warmStart = enabled
+        self.MCSimulator.enableWarmStart(enabled)
+
+    def enableParallelChains(self, enabled: bool, max_workers: int = None):
+        """
+        Method that enables the concurrent analysis of the Markov chains of the project on a process pool, every
+        chain is analysed by its own copy of the current simulator
+        :param enabled: Selected if the Markov chains are analysed concurrently
+        :param max_workers: number of worker processes, the number of processors if None
+        """
+        self.parallelChains = enabled
+        self.markov_chain_pool.set_max_workers(max_workers)
+
+    def set_result_store(self, directory: str = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Method that sets the directory of the store the stationary state distributions, transition matrices and
+        structural analyses are persisted in, results found in the store are not calculated again
+        :param directory: directory of the result store, None to disable it
+        :param max_size: size limit of the result store in bytes, None for no limit
+        """
+        self.result_store = None if directory is None else ResultStore(directory, max_size=max_size)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def clear_result_store(self):
+        """
+        Method that removes all results of the result store
+        """
+        if self.result_store is not None:
+            self.result_store.clear()
+
+    def get_result_store(self):
+        """
+        Getter method of the result store
+        :return: ResultStore or None
+        """
+        return self.result_store
+
+    def is_parallel(self):
+        """
+        Method to check whether the Markov chains of the project are analysed concurrently
+        :return: True if there are several Markov chains and the parallel mode is enabled
+        """
+        return self.parallelChains and len(self.markov_chains) > 1
+
+    def get_titles(self):
+        """
+        Method that returns the titles of the Markov chains of the current project
+        :return: titles
+        """
+        return ["Markov chain {number}".format(number=index) for index in range(1, len(self.markov_chains) + 1)]
+
+    def prefetch_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int):
+        """
+        Method to calculate the stationary state distributions of all Markov chains concurrently before they are
+        plotted one after another, the plots reuse the distributions stored on the Markov chains
+        :param steps: iteration steps for calculation of the stationary state vector
+        :param  alpha: value used for alpha-relaxation
+        :param specified_period: specified value for period
+        """
+        if self.is_parallel():
+            self.calculate_stationary_state_distributions(steps, alpha, specified_period)
+
+    def set_random_walk_replications(self, replications: int, relative_ci_width: float = 0.05):
+        """
+        Method to set the number of independent random walks of subsequently instantiated random walk simulators.
+        The replications are only available through this API, the graphical interface uses a single random walk.
+        :param replications: number of independent random walks, more than one enables the replicated mode
+        :param relative_ci_width: target relative width of the confidence intervals
+        """
+        self.replications = replications
+        self.relative_ci_width = relative_ci_width
+
     def adjust_precision(self, precision: float):
         """
         Method for adjusting the accuracy of calculation of the simulator
@@ -90,10 +220,53 @@ class SimulationControler:
 
     def set_calculation_listener(self, listener: object):
         """
-        Function that allows to set the calculation listener.
+        Function that allows to set the calculation listener. It is informed by the calculation progress at most
+        a few times per second instead of every step.
         :param listener: Object that observes the calculation
         """
-        self._calculation_listener = listener
+        self.calculation_progress.set_listener(listener)
+
+    def get_calculation_progress(self):
+        """
+        Getter method of the progress of the calculations of the project
+        :return: CalculationProgress
+        """
+        return self.calculation_progress
+
+    def get_analysis_executor(self):
+        """
+        Getter method of the executor of the analyses of the project
+        :return: AnalysisExecutor
+        """
+        return self.analysis_executor
+
+    def set_analysis_workers(self, max_workers: int):
+        """
+        Method to set the number of analyses of the project that are calculated concurrently, the graphical
+        interface uses the default of the AnalysisExecutor
+        :param max_workers: number of worker threads
+        """
+        self.analysis_executor.set_max_workers(max_workers)
+
+    def get_job_controler(self):
+        """
+        Method that returns a snapshot of the controler for a calculation on a worker thread. The snapshot has its
+        own copy of the simulator with the current strategy and settings and its own list of Markov chains, so the
+        project may instantiate another strategy, change settings or add Markov chains while the calculation is
+        running. The Markov chains themselves are shared, results stored on them are available to the project
+        afterwards. The process pool and the result store are shared as well, both may be used by several
+        calculations at the same time. The snapshot has its own calculation progress, which cancels only this
+        calculation and forwards its steps to the calculation progress of the project.
+        :return: SimulationControler
+        """
+        job_controler = copy.copy(self)
+        job_controler.calculation_progress = self.calculation_progress.create_job_progress()
+        job_controler._calculation_listener = job_controler.calculation_progress.update
+        job_controler.MCSimulator = self.MCSimulator.get_job_copy()
+        job_controler.MCSimulator.replace_calculation_listener(self._calculation_listener,
+                                                               job_controler._calculation_listener)
+        job_controler.markov_chains = list(self.markov_chains)
+        return job_controler
 
     def add_conventional_markov_chain(self, initial_state_vector: np.ndarray, transition_matrix: np.ndarray, state_designations: list):
         """
@@ -103,7 +276,7 @@ class SimulationControler:
         :param state_designations: Optional state designations
         """
         self.markov_chains.append(MarkovChainConventionalApproach(initial_state_vector, transition_matrix,
-                                                                  state_designations))
+                                                                  state_designations, self.sparseMode))
         self.number_of_mc += 1
 
     def add_forward_markov_chain(self, states: np.ndarray, state_space_names: list, initial_state_vector: np.ndarray,
@@ -137,29 +310,35 @@ class SimulationControler:
 
     def reset_markov_chains(self):
         """
-        Allows to reset the stationary state distribution of the Markov chain
+        Allows to reset the stationary state distributions of the Markov chains, including the distributions
+        stored for previous calculations
         """
         markov_chains = self.get_markov_chains()
         for mc in markov_chains:
-            mc.set_stationary_state_distribution(None)
+            mc.invalidate_stationary_state_distribution()
 
     def instantiate_MCSMatrixPowering(self):
         """
         Function for instantiating the simulator MCSMatrixPowering
         """
         self.reset_markov_chains()
-        self.MCSimulator = MCSMatrixPowering()
+        self.MCSimulator = MCSMatrixPowering(sparseMode=self.sparseMode)
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSRandomWalk(self, start_state: int):
         """
         Function for instantiating the simulator MCSRandomWalk
         """
         self.reset_markov_chains()
-        self.MCSimulator = MCSRandomWalk(start_state=start_state)
+        self.MCSimulator = MCSRandomWalk(start_state=start_state, replications=self.replications,
+                                         relative_ci_width=self.relative_ci_width)
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSCesaroLimit(self):
         """
@@ -169,6 +348,8 @@ class SimulationControler:
         self.MCSimulator = MCSCesaroLimit()
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSModifiedCesaroLimit(self):
         """
@@ -178,6 +359,8 @@ class SimulationControler:
         self.MCSimulator = MCSModifiedCesaroLimit()
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSLimitingDistribution(self):
         """
@@ -187,6 +370,8 @@ class SimulationControler:
         self.MCSimulator = MCSLimitingDistribution()
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSDirectApproach(self, scheme:str="Gaussian scheme"):
         """
@@ -196,15 +381,75 @@ class SimulationControler:
         self.MCSimulator = MCSDirectApproach(self.researchMode, scheme)
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def instantiate_MCSKrylovSubspace(self, scheme:str="GMRES"):
+        """
+        Function for instantiating the simulator MCSKrylovSubspace
+        """
+        self.reset_markov_chains()
+        self.MCSimulator = MCSKrylovSubspace(scheme)
+        self.MCSimulator.set_calculation_precision(self.precision)
+        self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def instantiate_MCSSplittingApproach(self, scheme:str="Gauss-Seidel"):
+        """
+        Function for instantiating the simulator MCSSplittingApproach
+        """
+        self.reset_markov_chains()
+        self.MCSimulator = MCSSplittingApproach(scheme)
+        self.MCSimulator.set_calculation_precision(self.precision)
+        self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def instantiate_MCSDecompositionApproach(self):
+        """
+        Function for instantiating the simulator MCSDecompositionApproach
+        """
+        self.reset_markov_chains()
+        self.MCSimulator = MCSDecompositionApproach()
+        self.MCSimulator.set_calculation_precision(self.precision)
+        self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def instantiate_MCSPeriodicApproach(self):
+        """
+        Function for instantiating the simulator MCSPeriodicApproach
+        """
+        self.reset_markov_chains()
+        self.MCSimulator = MCSPeriodicApproach()
+        self.MCSimulator.set_calculation_precision(self.precision)
+        self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
+
+    def instantiate_MCSAggregationDisaggregation(self, partition: str = "Automatic"):
+        """
+        Function for instantiating the simulator MCSAggregationDisaggregation
+        :param partition: "Automatic", "Coupling" or "State dimension"
+        """
+        self.reset_markov_chains()
+        self.MCSimulator = MCSAggregationDisaggregation(partition=partition)
+        self.MCSimulator.set_calculation_precision(self.precision)
+        self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def instantiate_MCSForwardApproach(self):
         """
         Function for instantiating the simulator MCSForwardApproach
         """
         self.reset_markov_chains()
-        self.MCSimulator = MCSForwardApproach(cythonMode=self.cythonMode)
+        self.MCSimulator = MCSForwardApproach(cythonMode=self.cythonMode, sparseMode=self.sparseMode)
         self.MCSimulator.set_calculation_precision(self.precision)
         self.MCSimulator.add_calculation_listener(self._calculation_listener)
+        self.MCSimulator.enableWarmStart(self.warmStart)
+        self.MCSimulator.set_result_store(self.result_store)
 
     def get_system(self):
         """
@@ -235,6 +480,12 @@ class SimulationControler:
         Method to calculate the period of the Markov chains of the current project
         :return: results, titles
         """
+        if self.is_parallel():
+            structural_analyses = self.markov_chain_pool.map(self.MCSimulator, self.markov_chains,
+                                                             "structural analysis",
+                                                             calculation_progress=self.calculation_progress)
+            return [structural_analysis.get_period() for structural_analysis in structural_analyses], \
+                self.get_titles()
         results = []
         titles = []
         index = 1
@@ -268,138 +519,107 @@ class SimulationControler:
         :param specified_period: specified value for period
         :return: results, titles
         """
+        if self.is_parallel():
+            results = self.markov_chain_pool.map(self.MCSimulator, self.markov_chains,
+                                                 "stationary state distribution", (steps, alpha, specified_period),
+                                                 self.calculation_progress)
+            return results, self.get_titles()
         results = []
         titles = []
         index = 1
         for mc in self.markov_chains:
             self.MCSimulator.set_markov_chain(mc)
-            try:
-                results.append(self.MCSimulator.calculate_stationary_state_distribution(steps, alpha, specified_period))
-            except:
-                raise InterruptedError
+            results.append(self.MCSimulator.get_stationary_state_distribution(steps, alpha, specified_period))
             titles.append("Markov chain {number}".format(number=index))
             index += 1
         return results, titles
 
-
-    def plot_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated:bool=True):
+    def _plot_stationary_state_distributions(self, plot_function, steps: int, alpha: float, specified_period: int,
+                                             separated: bool, stationary_state_distributions: list):
         """
-        Method to plot the stationary state distribution of the Markov chains of the current project
+        Method to plot the stationary state distributions of the Markov chains of the current project with a plot
+        method of the simulator, either separately or in a single figure
+        :param plot_function: plot method of the simulator
         :param steps: iteration steps for calculation of the stationary state vector
         :param  alpha: value used for alpha-relaxation
         :param specified_period: specified value for period
+        :param separated: Selected if every Markov chain is plotted in its own figure
+        :param stationary_state_distributions: already calculated distributions, None to calculate them
         :return: results, titles
         """
+        if stationary_state_distributions is None:
+            self.prefetch_stationary_state_distributions(steps, alpha, specified_period)
+            stationary_state_distributions = [None] * len(self.markov_chains)
         if separated or len(self.markov_chains) == 1:
             results = []
             titles = []
             index = 1
-            for mc in self.markov_chains:
-                try:
-                    self.MCSimulator.set_markov_chain(mc)
-                except:
-                    raise InterruptedError
-                results.append(self.MCSimulator.plot_stationary_state_distribution(steps, alpha, specified_period))
-                titles.append("Markov chain {number}".format(number=index))
-                index += 1
-        else:
-            figure = plt.figure()
-            index = 1
-            for mc in self.markov_chains:
+            for mc, stationary_state_distribution in zip(self.markov_chains, stationary_state_distributions):
                 self.MCSimulator.set_markov_chain(mc)
-                try:
-                    label = "Markov chain {number}".format(number=index)
-                    figure = self.MCSimulator.plot_stationary_state_distribution(steps, alpha, specified_period,
-                                                                                 figure=figure, label=label)
-                except:
-                    raise InterruptedError
+                results.append(plot_function(steps, alpha, specified_period,
+                                             stationary_state_distribution=stationary_state_distribution))
+                titles.append("Markov chain {number}".format(number=index))
                 index += 1
-            results = [figure]
-            titles = ["all Markov chains"]
-        return results, titles
+            return results, titles
+        figure = plt.figure()
+        index = 1
+        for mc, stationary_state_distribution in zip(self.markov_chains, stationary_state_distributions):
+            self.MCSimulator.set_markov_chain(mc)
+            figure = plot_function(steps, alpha, specified_period, figure=figure,
+                                   label="Markov chain {number}".format(number=index),
+                                   stationary_state_distribution=stationary_state_distribution)
+            index += 1
+        return [figure], ["all Markov chains"]
 
-    def plot_cumulative_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated:bool=True):
+    def plot_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated:bool=True,
+                                            stationary_state_distributions: list = None):
         """
-        Method to plot the cumulative stationary state distribution of the Markov chains of the current project
+        Method to plot the stationary state distribution of the Markov chains of the current project
         :param steps: iteration steps for calculation of the stationary state vector
         :param  alpha: value used for alpha-relaxation
         :param specified_period: specified value for period
+        :param separated: Selected if every Markov chain is plotted in its own figure
+        :param stationary_state_distributions: already calculated distributions, None to calculate them
         :return: results, titles
         """
-        if separated or len(self.markov_chains) == 1:
-            results = []
-            titles = []
-            index = 1
-            for mc in self.markov_chains:
-                self.MCSimulator.set_markov_chain(mc)
-                try:
-                    results.append(self.MCSimulator.plot_cumulative_stationary_state_distribution(steps, alpha, specified_period))
-                except:
-                    raise InterruptedError
-                titles.append("Markov chain {number}".format(number=index))
-                index += 1
-
-        else:
-            figure = plt.figure()
-            index = 1
-            for mc in self.markov_chains:
-                self.MCSimulator.set_markov_chain(mc)
-                try:
-                    figure = self.MCSimulator.\
-                        plot_cumulative_stationary_state_distribution(steps, alpha, specified_period, figure=figure,
-                                                                      label="Markov chain {number}".format(number=index))
-                except:
-                    raise InterruptedError
-                index += 1
-            results = [figure]
-            titles = ["all Markov chains"]
-        return results, titles
+        return self._plot_stationary_state_distributions(
+            self.MCSimulator.plot_stationary_state_distribution, steps, alpha, specified_period, separated,
+            stationary_state_distributions)
 
+    def plot_cumulative_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated:bool=True,
+                                                       stationary_state_distributions: list = None):
+        """
+        Method to plot the cumulative stationary state distribution of the Markov chains of the current project
+        :param steps: iteration steps for calculation of the stationary state vector
+        :param  alpha: value used for alpha-relaxation
+        :param specified_period: specified value for period
+        :param separated: Selected if every Markov chain is plotted in its own figure
+        :param stationary_state_distributions: already calculated distributions, None to calculate them
+        :return: results, titles
+        """
+        return self._plot_stationary_state_distributions(
+            self.MCSimulator.plot_cumulative_stationary_state_distribution,
+            steps, alpha, specified_period, separated, stationary_state_distributions)
 
-    def plot_complementary_cumulative_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated: bool=True):
+    def plot_complementary_cumulative_stationary_state_distributions(self, steps: int, alpha: float, specified_period: int, separated: bool=True,
+                                                                     stationary_state_distributions: list = None):
         """
         Method to plot the complementary cumulative stationary state distribution of the Markov chains of the current project
         :param steps: iteration steps for calculation of the stationary state vector
         :param  alpha: value used for alpha-relaxation
         :param specified_period: specified value for period
+        :param separated: Selected if every Markov chain is plotted in its own figure
+        :param stationary_state_distributions: already calculated distributions, None to calculate them
         :return: results, titles
         """
-        if separated or len(self.markov_chains) == 1:
-            results = []
-            titles = []
-            index = 1
-            for mc in self.markov_chains:
-                self.MCSimulator.set_markov_chain(mc)
-                try:
-                    results.append(self.MCSimulator.
-                                   plot_complementary_cumulative_stationary_state_distribution(steps,
-                                                                                               alpha,
-                                                                                               specified_period))
-                except:
-                    raise InterruptedError
-                titles.append("Markov chain {number}".format(number=index))
-                index += 1
-        else:
-            figure = plt.figure()
-            for mc in self.markov_chains:
-                self.MCSimulator.set_markov_chain(mc)
-                index=1
-                try:
-                    figure = self.MCSimulator.plot_complementary_cumulative_stationary_state_distribution(steps,
-                                                                                                          alpha,
-                                                                                                          specified_period,
-                                                                                                          figure=figure,                                                                          label="Markov chain {number}".format(number=index)
-                                                                                                          )
-                except:
-                    raise InterruptedError
-                index += 1
-            results = [figure]
-            titles = ["all Markov chains"]
-        return results, titles
+        return self._plot_stationary_state_distributions(
+            self.MCSimulator.plot_complementary_cumulative_stationary_state_distribution,
+            steps, alpha, specified_period, separated, stationary_state_distributions)
 
-    def plot_random_walk(self, steps: int):
+    def simulate_random_walks(self, steps: int):
         """
-        Method to plot a random Walk on the  Markov chains of the current project
+        Method to simulate a random walk on every Markov chain of the current project, the walks are shown by the
+        random walk plots
         :param steps: number of iteration steps
         :return: results, titles
         """
@@ -408,51 +628,57 @@ class SimulationControler:
         index = 1
         for mc in self.markov_chains:
             self.MCSimulator.set_markov_chain(mc)
-            try:
-                results.append(self.MCSimulator.plot_random_walk(steps))
-            except:
-                raise InterruptedError
+            results.append(self.MCSimulator.simulate_random_walk(steps))
             titles.append("Markov chain {number}".format(number=index))
             index += 1
         return results, titles
 
-    def plot_evolution_of_state_average(self, steps: int):
+    def _plot_random_walks(self, plot_function, steps: int, random_walks: list):
         """
-        Method to plot the evolution of the state average on the  Markov chains of the current project
+        Method to create a random walk plot of every Markov chain of the current project
+        :param plot_function: plot method of the simulator
         :param steps: number of iteration steps
+        :param random_walks: already simulated random walks, None to simulate them
         :return: results, titles
         """
+        if random_walks is None:
+            random_walks = [None] * len(self.markov_chains)
         results = []
         titles = []
         index = 1
-        for mc in self.markov_chains:
+        for mc, passed_states in zip(self.markov_chains, random_walks):
             self.MCSimulator.set_markov_chain(mc)
-            try:
-                results.append(self.MCSimulator.plot_evolution_of_state_average(steps))
-            except:
-                raise InterruptedError
+            results.append(plot_function(steps, passed_states))
             titles.append("Markov chain {number}".format(number=index))
             index += 1
         return results, titles
 
-    def plot_evolution_of_state_probabilities(self, steps: int):
+    def plot_random_walk(self, steps: int, random_walks: list = None):
+        """
+        Method to plot a random Walk on the  Markov chains of the current project
+        :param steps: number of iteration steps
+        :param random_walks: already simulated random walks, None to simulate them
+        :return: results, titles
+        """
+        return self._plot_random_walks(self.MCSimulator.plot_random_walk, steps, random_walks)
+
+    def plot_evolution_of_state_average(self, steps: int, random_walks: list = None):
+        """
+        Method to plot the evolution of the state average on the  Markov chains of the current project
+        :param steps: number of iteration steps
+        :param random_walks: already simulated random walks, None to simulate them
+        :return: results, titles
+        """
+        return self._plot_random_walks(self.MCSimulator.plot_evolution_of_state_average, steps, random_walks)
+
+    def plot_evolution_of_state_probabilities(self, steps: int, random_walks: list = None):
         """
         Method to plot the evolution of the state probabilities on the  Markov chains of the current project
         :param steps: number of iteration steps
+        :param random_walks: already simulated random walks, None to simulate them
         :return: results, titles
         """
-        results = []
-        titles = []
-        index = 1
-        for mc in self.markov_chains:
-            self.MCSimulator.set_markov_chain(mc)
-            try:
-                results.append(self.MCSimulator.plot_evolution_of_state_probabilities(steps))
-            except:
-                raise InterruptedError
-            titles.append("Markov chain {number}".format(number=index))
-            index += 1
-        return results, titles
+        return self._plot_random_walks(self.MCSimulator.plot_evolution_of_state_probabilities, steps, random_walks)
 
     def get_mc(self):
         """
@@ -473,6 +699,10 @@ class SimulationControler:
         Method to return the transition matrix of the current Markov chain
         :return: transition matrix
         """
+        if self.is_parallel():
+            return self.markov_chain_pool.map(self.MCSimulator, self.markov_chains, "transition matrix",
+                                              calculation_progress=self.calculation_progress), \
+                self.get_titles()
         titles = []
         results = []
         index = 1
@@ -0,0 +1,276 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import csv
+import itertools
+import sys
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from FunSpec4DTMC.model.Systems.Systems import GIGI1Qmax
+from FunSpec4DTMC.model.markov_chain.MarkovChainForwardApproach import MarkovChainForwardApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach import MCSForwardApproach
+from FunSpec4DTMC.model.parser.FunSpecParser import FunSpecParser
+from FunSpec4DTMC.model.ResultStore import ResultStore, DEFAULT_MAX_SIZE
+
+# position of the sweepable parameters in the system input of a GI/GI/1-Qmax system
+SWEEP_PARAMETERS = {"arrival time distribution": 0,
+                    "batch size distribution": 1,
+                    "service time": 2,
+                    "Qmax": 3}
+
+RESULT_COLUMNS = ["number of states", "steps", "norm", "mean", "first state probability", "last state probability",
+                  "stationary state distribution", "error"]
+
+
+class ParameterSweep:
+
+    def __init__(self, system_input: list, grids: dict, results_file_path: str, max_workers: int = None):
+        """
+        Constructor of a parameter sweep over GI/GI/1-Qmax systems
+        :param system_input: system input [arrival time distribution, batch size distribution, service time, Qmax,
+        transition functions] as entered in the system specification dialog
+        :param grids: values per parameter, either "arrival time distribution", "batch size distribution",
+        "service time", "Qmax" or a single distribution parameter like "arrival time distribution.rate".
+        The points of the last grid are solved in order, every point starts from the solution of its predecessor.
+        :param results_file_path: path of the results file, one column per parameter and result
+        :param max_workers: number of worker processes, the number of processors if None
+        """
+        for name in grids:
+            if name.split(".", 1)[0] not in SWEEP_PARAMETERS:
+                raise KeyError(name)
+        self._system_input = system_input
+        self._grids = grids
+        self._results_file_path = results_file_path
+        self._max_workers = max_workers
+        self._calculation_precision = 10e-16
+        self._discretization_precision = 10e-9
+        self._research_mode = False
+        self._sparse_mode = False
+        self._service_time_adjustment = False
+        self._separated_factors = True
+        self._result_store_directory = None
+        self._result_store_max_size = DEFAULT_MAX_SIZE
+
+    def set_calculation_precision(self, precision: float):
+        """
+        Setter method of the calculation precision of the stationary solves
+        :param precision: calculation precision
+        """
+        self._calculation_precision = precision
+
+    def set_discretization_precision(self, precision: float):
+        """
+        Setter method of the discretization precision of the distributions
+        :param precision: discretization precision
+        """
+        self._discretization_precision = precision
+
+    def enableResearchMode(self, enabled: bool):
+        """
+        Method for setting up the usage mode of the systems
+        :param enabled: Activation of research Mode
+        """
+        self._research_mode = enabled
+
+    def enableSparseMode(self, enabled: bool):
+        """
+        Method to enable the sparse derivation of the transition matrices
+        :param enabled: sparse mode selection
+        """
+        self._sparse_mode = enabled
+
+    def set_system_options(self, service_time_adjustment: bool, separated_factors: bool):
+        """
+        Setter method of the options of the Markov chain specification of the systems
+        :param service_time_adjustment: Adjustment of the service time to calculation precision
+        :param separated_factors: Separation of the factor space
+        """
+        self._service_time_adjustment = service_time_adjustment
+        self._separated_factors = separated_factors
+
+    def set_result_store_directory(self, directory: str, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Setter method of the directory of the result store, points that have already been solved with the same
+        specification and settings are read from the store instead of being solved again
+        :param directory: directory of the result store, None to solve every point
+        :param max_size: size limit of the result store in bytes, None for no limit
+        """
+        self._result_store_directory = directory
+        self._result_store_max_size = max_size
+
+    def get_lines(self):
+        """
+        Method for splitting the grid into lines along the last parameter. The lines are independent, the points of
+        a line are neighbours and are solved one after another.
+        :return: list of lines, each a list of parameter dicts
+        """
+        names = list(self._grids)
+        line_name = names[-1]
+        lines = []
+        for values in itertools.product(*[self._grids[name] for name in names[:-1]]):
+            lines.append([dict(zip(names, values + (line_value,))) for line_value in self._grids[line_name]])
+        return lines
+
+    def get_settings(self):
+        """
+        Getter method of the settings passed to the worker processes
+        :return: settings
+        """
+        return {"calculation precision": self._calculation_precision,
+                "discretization precision": self._discretization_precision,
+                "research mode": self._research_mode,
+                "sparse mode": self._sparse_mode,
+                "service time adjustment": self._service_time_adjustment,
+                "separated factors": self._separated_factors,
+                "result store directory": self._result_store_directory,
+                "result store size": self._result_store_max_size}
+
+    def run(self, listener=None):
+        """
+        Method for running the sweep. The lines are solved on a process pool, the results are appended to the
+        results file as soon as a line has finished.
+        :param listener: optional function (number of finished points, number of points) informed about the progress
+        :return: number of solved points
+        """
+        lines = self.get_lines()
+        number_of_points = sum(len(line) for line in lines)
+        finished = 0
+        settings = self.get_settings()
+        with open(self._results_file_path, "w", newline="") as results_file:
+            writer = csv.writer(results_file)
+            writer.writerow(list(self._grids) + RESULT_COLUMNS)
+            results_file.flush()
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = [executor.submit(_solve_line, self._system_input, line, settings) for line in lines]
+                try:
+                    for future in as_completed(futures):
+                        for parameters, result in future.result():
+                            writer.writerow([self._format(parameters[name]) for name in self._grids] +
+                                            [self._format(result.get(column, "")) for column in RESULT_COLUMNS])
+                            finished += 1
+                        results_file.flush()
+                        if listener is not None:
+                            try:
+                                listener(finished, number_of_points)
+                            except Exception as error:
+                                raise InterruptedError from error
+                except InterruptedError:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        return finished
+
+    @staticmethod
+    def _format(value):
+        """
+        Formats a parameter or result for the results file
+        :param value: value
+        :return: formatted value
+        """
+        if isinstance(value, dict):
+            return ";".join("{key}={value}".format(key=key, value=value[key]) for key in sorted(value))
+        if isinstance(value, np.ndarray):
+            return " ".join(repr(float(v)) for v in value)
+        return value
+
+
+def get_point_input(system_input: list, parameters: dict):
+    """
+    Creates the system input of a single point of the sweep
+    :param system_input: system input of the sweep
+    :param parameters: parameter values of the point
+    :return: system input of the point
+    """
+    point_input = copy.deepcopy(system_input)
+    for name, value in parameters.items():
+        parameter = name.split(".", 1)
+        position = SWEEP_PARAMETERS[parameter[0]]
+        if len(parameter) == 1:
+            point_input[position] = copy.deepcopy(value)
+        else:
+            point_input[position][parameter[1]] = value
+    return point_input
+
+
+def create_markov_chain(system_input: list, settings: dict, module_name: str):
+    """
+    Creates the functional Markov chain of a GI/GI/1-Qmax system. The transition functions are compiled into an
+    in-memory module instead of the project directory.
+    :param system_input: system input of the point
+    :param settings: settings of the sweep
+    :param module_name: name of the transition function module
+    :return: MarkovChainForwardApproach
+    """
+    system = GIGI1Qmax(*FunSpecParser().get_system_configuration(system_input))
+    system.set_discretization_precision(settings["discretization precision"])
+    system.enableResearchMode(settings["research mode"])
+    (states, state_designations, initial_state_vector, factors, factor_distributions, transition_functions) = \
+        system.calculate_mc_specification(settings["service time adjustment"], settings["separated factors"])
+    if settings["separated factors"]:
+        factors = factors[0]
+        factor_distributions = factor_distributions[0]
+    module = types.ModuleType(module_name)
+    exec("\n".join(transition_functions), module.__dict__)
+    sys.modules[module_name] = module
+    return MarkovChainForwardApproach(initial_state_vector, None, factors, None, factor_distributions, module_name,
+                                      states, state_designations)
+
+
+def _solve_line(system_input: list, line: list, settings: dict):
+    """
+    Solves the points of a line of the sweep, every point starts from the stationary state distribution of its
+    predecessor. Points found in the result store are not solved again, their steps are reported as 0.
+    :param system_input: system input of the sweep
+    :param line: list of parameter dicts
+    :param settings: settings of the sweep
+    :return: list of (parameters, result)
+    """
+    results = []
+    state_distribution = None
+    result_store = None
+    if settings["result store directory"] is not None:
+        result_store = ResultStore(settings["result store directory"], max_size=settings["result store size"])
+    for index, parameters in enumerate(line):
+        module_name = "_parameter_sweep_{id}_{index}".format(id=id(line), index=index)
+        status = {"steps": 0, "norm": None}
+
+        def listener(step, norm):
+            status["steps"] = step
+            status["norm"] = norm
+
+        try:
+            markov_chain = create_markov_chain(get_point_input(system_input, parameters), settings, module_name)
+            if state_distribution is not None:
+                markov_chain.set_initial_state_vector(
+                    MCSForwardApproach.adapt_state_vector(state_distribution, markov_chain.get_number_of_states()))
+            simulator = MCSForwardApproach(markov_chain, sparseMode=settings["sparse mode"])
+            simulator.set_calculation_precision(settings["calculation precision"])
+            simulator.set_result_store(result_store)
+            simulator.add_calculation_listener(listener)
+            state_distribution = simulator.get_stationary_state_distribution(0)
+            states = np.array(markov_chain.get_states()[0], dtype=float)
+            results.append((parameters, {"number of states": len(state_distribution),
+                                         "steps": status["steps"],
+                                         "norm": status["norm"],
+                                         "mean": float(np.dot(states, state_distribution)),
+                                         "first state probability": float(state_distribution[0]),
+                                         "last state probability": float(state_distribution[-1]),
+                                         "stationary state distribution": state_distribution}))
+        except Exception as error:
+            state_distribution = None
+            results.append((parameters, {"error": repr(error)}))
+        finally:
+            sys.modules.pop(module_name, None)
+    return results
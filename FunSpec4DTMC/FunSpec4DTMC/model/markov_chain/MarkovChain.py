@@ -14,6 +14,7 @@
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+from FunSpec4DTMC.model.markov_chain.StructuralAnalysis import StructuralAnalysis
 
 class MarkovChain(object):
 
@@ -33,10 +34,11 @@ class MarkovChain(object):
         self._state_designations = state_designation
         self._initial_state_vector = initial_state_vector
         self._type = "MarkovChain"
-        self._graph = None
-        self._closures = []
-        self._period = 0
+        self._structural_analysis = None
         self._stationary_state_distribution = None
+        self._stationary_state_distributions = {}
+        self._warm_start_vector = None
+        self._fingerprint = None
 
 
 
@@ -47,6 +49,15 @@ class MarkovChain(object):
         """
         return self._initial_state_vector[:]
 
+    def set_initial_state_vector(self, initial_state_vector: np.ndarray):
+        """
+        Setter method of the initial state vector
+        :param initial_state_vector: vector which indicates the system state at beginning of the analysis
+        """
+        if len(initial_state_vector) != self.get_number_of_states():
+            raise ValueError("The initial state vector does not match the number of states")
+        self._initial_state_vector = initial_state_vector
+        self.invalidate_stationary_state_distribution()
 
     def get_state_designations(self):
         """
@@ -76,50 +87,116 @@ class MarkovChain(object):
         """
         return self._type
 
+    def set_structural_analysis(self, structural_analysis):
+        """
+        Setter method of the structural analysis (graph, classes, periods) of the MC
+        """
+        self._structural_analysis = structural_analysis
+
+    def get_structural_analysis(self):
+        """
+        Getter method of the structural analysis of the MC
+        :return: structural analysis or None if it has not been calculated yet
+        """
+        return self._structural_analysis
+
+    def invalidate_structural_analysis(self):
+        """
+        Discards the structural analysis after the transition structure of the MC has been changed
+        """
+        self._structural_analysis = None
+
     def set_graph(self, graph):
         """
         Setter method of the MC graph
         """
-        self._graph = graph
+        self._structural_analysis = StructuralAnalysis(graph)
 
     def get_graph(self):
         """
         Getter method of MC graph
         :return: MC graph
         """
-        return self._graph
-
-    def set_closures(self, closures):
-        """
-        Setter method of the MC closures
-        """
-        self._closures = closures
+        structural_analysis = self.get_structural_analysis()
+        if structural_analysis is None:
+            return None
+        return structural_analysis.get_graph()
 
     def get_closures(self):
         """
         Getter method of MC closures
         :return: MC closures
         """
-        return self._closures
-
-    def set_period(self, period):
-        """
-        Setter method of the MC period
-        """
-        self._period = period
+        structural_analysis = self.get_structural_analysis()
+        if structural_analysis is None:
+            return []
+        return structural_analysis.get_closures()
 
     def get_period(self):
         """
         Getter method of the period of the MC
-        :return period
+        :return period, 0 if the structural analysis has not been calculated yet
         """
-        return self._period
+        structural_analysis = self.get_structural_analysis()
+        if structural_analysis is None:
+            return 0
+        return structural_analysis.get_period()
 
     def set_stationary_state_distribution(self, ssd):
         """
-        Setter method of the stationary state distribution of the MC
+        Setter method of the stationary state distribution of the MC, a calculated distribution is also kept as
+        warm start vector
         """
         self._stationary_state_distribution = ssd
+        if ssd is not None:
+            self._warm_start_vector = ssd
+
+    def invalidate_stationary_state_distribution(self):
+        """
+        Discards the stationary state distributions and the fingerprint after the MC has been changed, the last
+        distribution remains available as warm start vector
+        """
+        self._stationary_state_distribution = None
+        self._stationary_state_distributions = {}
+        self._fingerprint = None
+
+    def set_fingerprint(self, fingerprint: str):
+        """
+        Setter method of the fingerprint of the specification of the MC in the result store
+        :param fingerprint: hexadecimal fingerprint
+        """
+        self._fingerprint = fingerprint
+
+    def get_fingerprint(self):
+        """
+        Getter method of the fingerprint of the specification of the MC in the result store
+        :return: hexadecimal fingerprint or None if it has not been calculated since the last change
+        """
+        return self._fingerprint
+
+    def set_cached_stationary_state_distribution(self, key: tuple, ssd):
+        """
+        Stores a stationary state distribution of the MC for the calculation it results from
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :param ssd: stationary state distribution
+        """
+        self._stationary_state_distributions[key] = ssd
+        self.set_stationary_state_distribution(ssd)
+
+    def get_cached_stationary_state_distribution(self, key: tuple):
+        """
+        Getter method of the stationary state distribution of the MC for a calculation
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: stationary state distribution or None if it has not been calculated yet
+        """
+        return self._stationary_state_distributions.get(key)
+
+    def get_warm_start_vector(self):
+        """
+        Getter method of the last calculated stationary state distribution of the MC
+        :return: warm start vector or None
+        """
+        return self._warm_start_vector
 
     def get_stationary_state_distribution(self):
         """
@@ -13,22 +13,24 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 import numpy as np
+import scipy.sparse
 from FunSpec4DTMC.model.markov_chain.MarkovChain import MarkovChain
 
 class MarkovChainConventionalApproach(MarkovChain):
 
     def __init__(self, initial_state_vector: np.ndarray, transition_matrix: np.ndarray,
-                 state_designation: np.ndarray=None):
+                 state_designation: np.ndarray=None, sparse: bool=False):
         """
         Constructor for Markov chains in conventional specification
         :param initial_state_vector: vector which indicates the system state at beginning of the analysis
         :param transition_matrix: matrix that defines the Markov chain
         :param state_designation: designation of the states of the Markov chain
+        :param sparse: Selected if the transition matrix should be stored in compressed sparse row format
         """
         if initial_state_vector is not None:
             MarkovChain.__init__(self, None, initial_state_vector, state_designation)
         if transition_matrix is not None:
-            self._transition_matrix = TransitionMatrix(transition_matrix)
+            self._transition_matrix = TransitionMatrix(transition_matrix, sparse)
         self._type = "MarkovChainConventionalApproach"
 
     def get_transition_matrix(self):
@@ -40,10 +42,30 @@ class MarkovChainConventionalApproach(MarkovChain):
 
     def set_transition_matrix(self, transition_matrix: np.ndarray) -> None:
         """
-        Sets the transition matrix of markov chain
+        Sets the transition matrix of markov chain, keeping the storage format of the current matrix
         :param transition_matrix
         """
-        self._transition_matrix = TransitionMatrix(transition_matrix)
+        self._transition_matrix = TransitionMatrix(transition_matrix, self.is_sparse())
+        self.invalidate_structural_analysis()
+        self.invalidate_stationary_state_distribution()
+
+    def set_transition_probability(self, resent_state: int, subsequent_state: int, transition_probability: float):
+        """
+        Sets a single transition probability of the Markov chain
+        :param resent_state: state where transition begins
+        :param subsequent_state: state where transition ends
+        :param transition_probability: probability for transition from resent state to subsequent state
+        """
+        self._transition_matrix.set_transition_probability(resent_state, subsequent_state, transition_probability)
+        self.invalidate_structural_analysis()
+        self.invalidate_stationary_state_distribution()
+
+    def is_sparse(self):
+        """
+        Returns whether the transition matrix is stored in compressed sparse row format
+        :return: True if the transition matrix is sparse
+        """
+        return hasattr(self, "_transition_matrix") and self._transition_matrix.is_sparse()
 
 
     def get_type(self):
@@ -57,13 +79,20 @@ class MarkovChainConventionalApproach(MarkovChain):
 
 class TransitionMatrix(object):
 
-    def __init__(self, transition_matrix: np.ndarray):
+    def __init__(self, transition_matrix: np.ndarray, sparse: bool=False):
         """
         Constructor of the class TransitionMatrix
-        :param transition_matrix: stochastic matrix that defines the Markov chain
+        :param transition_matrix: stochastic matrix that defines the Markov chain, either dense or scipy.sparse
+        :param sparse: Selected if a dense matrix should be converted to compressed sparse row format
         """
+        if scipy.sparse.issparse(transition_matrix) or sparse:
+            transition_matrix = scipy.sparse.csr_matrix(transition_matrix, dtype=float)
         if self.check_for_probability_matrix(transition_matrix):
-            if isinstance(transition_matrix[0], np.ndarray):
+            if scipy.sparse.issparse(transition_matrix):
+                self._transition_matrix = transition_matrix
+                self._number_of_states_of_states = transition_matrix.shape[0]
+
+            elif isinstance(transition_matrix[0], np.ndarray):
                 self._transition_matrix = transition_matrix
                 self._number_of_states_of_states = len(transition_matrix)
 
@@ -80,17 +109,21 @@ class TransitionMatrix(object):
     @staticmethod
     def check_for_probability_matrix(matrix: np.ndarray):
         """
-        Checks the probability characteristic of a matrix
+        Checks the probability characteristic of a matrix. Sparse matrices are checked on their stored entries only.
         :param: matrix: input matrix to check
         """
         dimension = matrix.shape
+        if scipy.sparse.issparse(matrix):
+            entries = matrix.data
+        else:
+            entries = matrix
         if dimension[0] != dimension[1]:
             return False
-        elif np.sum(matrix.sum(1) - np.ones(dimension[0])) > 10e-15:
+        elif np.sum(np.asarray(matrix.sum(1)).ravel() - np.ones(dimension[0])) > 10e-15:
             return False
-        elif (matrix < 0).any():
+        elif (entries < 0).any():
             return False
-        elif (matrix > 1).any():
+        elif (entries > 1).any():
             return False
         else:
             return True
@@ -102,7 +135,7 @@ class TransitionMatrix(object):
         :param subsequent_state: state where transition ends
         :param transition_probability: probability for transition from resent state to subsequent state
         """
-        self._transition_matrix[resent_state][subsequent_state] = transition_probability
+        self._transition_matrix[resent_state, subsequent_state] = transition_probability
         if not self.check_for_probability_matrix( self._transition_matrix):
             raise ValueError
 
@@ -113,11 +146,20 @@ class TransitionMatrix(object):
         """
         return self._transition_matrix
 
+    def is_sparse(self):
+        """
+        Returns whether the transition matrix is stored in compressed sparse row format
+        :return: True if the transition matrix is sparse
+        """
+        return scipy.sparse.issparse(self._transition_matrix)
+
     def set_transition_matrix(self, tr_matrix: np.ndarray):
         """
         Sets transition matrix
         :param tr_matrix: matrix of floats
         """
+        if self.is_sparse():
+            tr_matrix = scipy.sparse.csr_matrix(tr_matrix, dtype=float)
         self._transition_matrix = tr_matrix
         if not self.check_for_probability_matrix(self._transition_matrix):
             raise ValueError
@@ -13,8 +13,24 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import importlib
+import sys
 from FunSpec4DTMC.model.markov_chain.MarkovChain import MarkovChain
 
+# generation counter per transition function module, raised whenever the module is regenerated
+_transition_function_generations = {}
+
+
+def invalidate_transition_functions(file_path: str):
+    """
+    Marks the transition function module as regenerated, so that all Markov chains resolve it anew
+    :param file_path: module path of the transition functions
+    """
+    _transition_function_generations[file_path] = _transition_function_generations.get(file_path, 0) + 1
+    sys.modules.pop(file_path, None)
+    importlib.invalidate_caches()
+
+
 class MarkovChainForwardApproach(MarkovChain):
 
     def __init__(self, initial_state_vector, state_space_names, factors, factor_space_names, factor_distribution, transition_functions,
@@ -36,6 +52,9 @@ class MarkovChainForwardApproach(MarkovChain):
         self._factor_space_names = factor_space_names
         self._factor_distributions = factor_distribution
         self._transition_functions = transition_functions
+        self._resolved_transition_functions = None
+        self._transition_function_generation = None
+        self._successor_index = None
         self._type = "MarkovChainForwardApproach"
 
     def get_state_space_names(self):
@@ -73,6 +92,94 @@ class MarkovChainForwardApproach(MarkovChain):
         """
         return self._transition_functions
 
+    def get_resolved_transition_functions(self):
+        """
+        Getter method for the callable transition functions of the MC definition. The module is imported once and
+        resolved again only after it has been regenerated.
+        :return: list of transition functions
+        """
+        generation = _transition_function_generations.get(self._transition_functions, 0)
+        if self._resolved_transition_functions is None or self._transition_function_generation != generation:
+            TransitionFunction = importlib.import_module(self._transition_functions)
+            transition_functions = []
+            index = 1
+            while hasattr(TransitionFunction, 'transition_function{index}'.format(index=index)):
+                transition_functions.append(
+                    getattr(TransitionFunction, 'transition_function{index}'.format(index=index)))
+                index += 1
+            if self._transition_function_generation is not None:
+                self._structural_analysis = None
+                self.invalidate_stationary_state_distribution()
+            self._resolved_transition_functions = transition_functions
+            self._transition_function_generation = generation
+            self._successor_index = None
+        return self._resolved_transition_functions
+
+    def set_successor_index(self, successor_index):
+        """
+        Setter method for the compiled successor index of the MC definition
+        :param successor_index: list of integer arrays succ[state, factor] -> subsequent state
+        """
+        self._successor_index = successor_index
+
+    def get_successor_index(self):
+        """
+        Getter method for the compiled successor index of the MC definition
+        :return: successor index or None if it has not yet been compiled for the current transition functions
+        """
+        if self._transition_function_generation != _transition_function_generations.get(self._transition_functions, 0):
+            self._successor_index = None
+        return self._successor_index
+
+    def get_structural_analysis(self):
+        """
+        Getter method of the structural analysis, the analysis is discarded once the transition functions
+        have been regenerated
+        :return: structural analysis or None
+        """
+        if self.is_regenerated():
+            self._structural_analysis = None
+        return self._structural_analysis
+
+    def get_stationary_state_distribution(self):
+        """
+        Getter method of the stationary state distribution, the distribution is discarded once the transition
+        functions have been regenerated
+        :return stationary state distribution
+        """
+        if self.is_regenerated():
+            self.invalidate_stationary_state_distribution()
+        return self._stationary_state_distribution
+
+    def get_cached_stationary_state_distribution(self, key: tuple):
+        """
+        Getter method of the stationary state distribution for a calculation, the distributions are discarded once
+        the transition functions have been regenerated
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: stationary state distribution or None
+        """
+        if self.is_regenerated():
+            self.invalidate_stationary_state_distribution()
+        return MarkovChain.get_cached_stationary_state_distribution(self, key)
+
+    def get_fingerprint(self):
+        """
+        Getter method of the fingerprint in the result store, the fingerprint is discarded once the transition
+        functions have been regenerated
+        :return: hexadecimal fingerprint or None
+        """
+        if self.is_regenerated():
+            self.invalidate_stationary_state_distribution()
+        return self._fingerprint
+
+    def is_regenerated(self):
+        """
+        Returns whether the transition functions have been regenerated since they were resolved
+        :return: True if the transition functions have been regenerated
+        """
+        return self._transition_function_generation is not None and \
+            self._transition_function_generation != _transition_function_generations.get(self._transition_functions, 0)
+
     def get_type(self):
         """
         returns the type MarkovChainForwardApproach
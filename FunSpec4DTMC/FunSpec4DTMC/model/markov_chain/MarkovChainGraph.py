@@ -0,0 +1,180 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.csgraph
+
+
+class MarkovChainGraph(object):
+
+    def __init__(self, number_of_vertices: int, sources: np.ndarray, targets: np.ndarray, vertices: list = None):
+        """
+        Constructor of the graph of a Markov chain. The edges are stored once as compressed sparse row
+        adjacency, all analyses run in O(V+E) on it.
+        :param number_of_vertices: number of vertices
+        :param sources: integer array of the source vertex of every edge
+        :param targets: integer array of the target vertex of every edge
+        :param vertices: designations of the vertices, the vertex indices are used if None
+        """
+        self._number_of_vertices = number_of_vertices
+        if vertices is None:
+            self._vertices = list(range(number_of_vertices))
+        else:
+            self._vertices = list(vertices)
+        adjacency = scipy.sparse.csr_matrix((np.ones(len(sources), dtype=np.int8),
+                                             (np.asarray(sources, dtype=np.intp), np.asarray(targets, dtype=np.intp))),
+                                            shape=(number_of_vertices, number_of_vertices))
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1
+        self._adjacency = adjacency
+        self._component_labels = None
+
+    @classmethod
+    def from_edge_set(cls, graph):
+        """
+        Creates the graph from a vertex set and a set of edge tuples
+        :param graph: graph (V, E)
+        :return: MarkovChainGraph
+        """
+        (V, E) = graph
+        try:
+            vertices = sorted(V)
+        except TypeError:
+            vertices = list(V)
+        vertex_index = {v: index for index, v in enumerate(vertices)}
+        edges = np.array([(vertex_index[e[0]], vertex_index[e[1]]) for e in E], dtype=np.intp).reshape(-1, 2)
+        return cls(len(vertices), edges[:, 0], edges[:, 1], vertices)
+
+    def get_number_of_vertices(self):
+        """
+        Getter method of the number of vertices
+        :return: number of vertices
+        """
+        return self._number_of_vertices
+
+    def get_vertices(self):
+        """
+        Getter method of the vertex designations
+        :return: vertex designations
+        """
+        return self._vertices
+
+    def get_adjacency(self):
+        """
+        Getter method of the adjacency matrix in compressed sparse row format
+        :return: adjacency matrix
+        """
+        return self._adjacency
+
+    def get_edges(self):
+        """
+        Getter method of the edges as integer arrays
+        :return: sources, targets
+        """
+        sources = np.repeat(np.arange(self._number_of_vertices), np.diff(self._adjacency.indptr))
+        return sources, self._adjacency.indices
+
+    def get_successors(self, vertex: int):
+        """
+        Getter method of the successors of a vertex
+        :param vertex: vertex index
+        :return: successor indices
+        """
+        return self._adjacency.indices[self._adjacency.indptr[vertex]:self._adjacency.indptr[vertex + 1]]
+
+    def get_component_labels(self):
+        """
+        Calculates the strongly connected component of every vertex with the iterative Tarjan algorithm
+        of scipy.sparse.csgraph
+        :return: component label of every vertex
+        """
+        if self._component_labels is None:
+            number_of_components, self._component_labels = \
+                scipy.sparse.csgraph.connected_components(self._adjacency, directed=True, connection="strong")
+        return self._component_labels
+
+    def strongly_connected_components(self):
+        """
+        Method for calculating all strongly connected components
+        :return: list of vertex index arrays
+        """
+        labels = self.get_component_labels()
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        return np.split(order, boundaries)
+
+    def closed_classes(self):
+        """
+        Method for calculating all closed classes, i.e. strongly connected components without outgoing edges
+        :return: list of vertex index arrays
+        """
+        labels = self.get_component_labels()
+        sources, targets = self.get_edges()
+        leaving = labels[sources] != labels[targets]
+        open_components = set(np.unique(labels[sources[leaving]]).tolist())
+        return [component for component in self.strongly_connected_components()
+                if labels[component[0]] not in open_components]
+
+    def transient_states(self):
+        """
+        Method for calculating all vertices that are not part of a closed class
+        :return: vertex index array
+        """
+        recurrent = np.zeros(self._number_of_vertices, dtype=bool)
+        for closed_class in self.closed_classes():
+            recurrent[closed_class] = True
+        return np.flatnonzero(~recurrent)
+
+    def class_period(self, component: np.ndarray):
+        """
+        Method for calculating the period of a strongly connected component. The component is searched
+        breadth first and the period is the gcd of level[u] + 1 - level[v] over all edges (u, v) of the component.
+        :param component: vertex index array of the component
+        :return: period
+        """
+        adjacency = self._adjacency[component][:, component]
+        if adjacency.nnz == 0:
+            return 1
+        levels = scipy.sparse.csgraph.shortest_path(adjacency, method="D", unweighted=True, indices=0)
+        levels = levels.astype(np.int64)
+        sources = np.repeat(np.arange(len(component)), np.diff(adjacency.indptr))
+        return int(np.gcd.reduce(np.abs(levels[sources] + 1 - levels[adjacency.indices])))
+
+    def cyclic_classes(self, component: np.ndarray, period: int = None):
+        """
+        Method for calculating the cyclic classes of a strongly connected component. Vertices whose breadth first
+        levels are congruent modulo the period form a cyclic class, every edge leads from class r to class r + 1.
+        :param component: vertex index array of the component
+        :param period: period of the component, calculated if None
+        :return: list of vertex index arrays, one for every residue of the period
+        """
+        if period is None:
+            period = self.class_period(component)
+        if period == 1:
+            return [component]
+        adjacency = self._adjacency[component][:, component]
+        levels = scipy.sparse.csgraph.shortest_path(adjacency, method="D", unweighted=True, indices=0)
+        residues = levels.astype(np.int64) % period
+        return [component[residues == residue] for residue in range(period)]
+
+    def period(self):
+        """
+        Method for calculating the period of the graph as least common multiple of the periods of the closed classes
+        :return: period
+        """
+        period = 1
+        for closed_class in self.closed_classes():
+            period = int(np.lcm(period, self.class_period(closed_class)))
+        return period
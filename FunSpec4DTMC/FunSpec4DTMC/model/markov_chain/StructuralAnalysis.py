@@ -0,0 +1,153 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+from FunSpec4DTMC.model.markov_chain.MarkovChainGraph import MarkovChainGraph
+
+
+class StructuralAnalysis(object):
+
+    def __init__(self, graph: MarkovChainGraph):
+        """
+        Constructor of the structural analysis of a Markov chain. Strongly connected components, closed classes,
+        transient states and periods are calculated on first use and kept until the chain is changed.
+        :param graph: graph of the Markov chain
+        """
+        self._graph = graph
+        self._strongly_connected_components = None
+        self._closed_classes = None
+        self._transient_states = None
+        self._class_periods = None
+        self._cyclic_classes = None
+
+    def get_graph(self):
+        """
+        Getter method of the graph
+        :return: graph of the Markov chain
+        """
+        return self._graph
+
+    def get_strongly_connected_components(self):
+        """
+        Getter method of the strongly connected components
+        :return: list of vertex index arrays
+        """
+        if self._strongly_connected_components is None:
+            self._strongly_connected_components = self._graph.strongly_connected_components()
+        return self._strongly_connected_components
+
+    def get_closed_classes(self):
+        """
+        Getter method of the closed classes
+        :return: list of vertex index arrays
+        """
+        if self._closed_classes is None:
+            self._closed_classes = self._graph.closed_classes()
+        return self._closed_classes
+
+    def get_closures(self):
+        """
+        Getter method of the closed classes as lists of vertex designations
+        :return: closures of the graph
+        """
+        vertices = self._graph.get_vertices()
+        return [[vertices[v] for v in closed_class] for closed_class in self.get_closed_classes()]
+
+    def get_transient_states(self):
+        """
+        Getter method of the transient states
+        :return: vertex index array
+        """
+        if self._transient_states is None:
+            self._transient_states = self._graph.transient_states()
+        return self._transient_states
+
+    def get_class_periods(self):
+        """
+        Getter method of the periods of the closed classes, in the order of get_closed_classes
+        :return: list of periods
+        """
+        if self._class_periods is None:
+            self._class_periods = [self._graph.class_period(closed_class)
+                                   for closed_class in self.get_closed_classes()]
+        return self._class_periods
+
+    def get_cyclic_classes(self):
+        """
+        Getter method of the cyclic classes of the closed classes, in the order of get_closed_classes
+        :return: list of lists of vertex index arrays
+        """
+        if self._cyclic_classes is None:
+            self._cyclic_classes = [self._graph.cyclic_classes(closed_class, class_period)
+                                    for closed_class, class_period in zip(self.get_closed_classes(),
+                                                                          self.get_class_periods())]
+        return self._cyclic_classes
+
+    def get_period(self):
+        """
+        Getter method of the period of the Markov chain, the least common multiple of the class periods
+        :return: period
+        """
+        period = 1
+        for class_period in self.get_class_periods():
+            period = int(np.lcm(period, class_period))
+        return period
+
+    def save(self, file_path: str, fingerprint: str = ""):
+        """
+        Method to store the structural analysis to memory in numpy .npz format
+        :param file_path: external file used as storage path
+        :param fingerprint: fingerprint of the specification the analysis belongs to
+        """
+        sources, targets = self._graph.get_edges()
+        closed_classes = self.get_closed_classes()
+        arrays = {"number_of_vertices": self._graph.get_number_of_vertices(),
+                  "sources": sources,
+                  "targets": targets,
+                  "closed_classes": np.concatenate(closed_classes) if closed_classes else np.zeros(0, dtype=np.intp),
+                  "closed_class_sizes": np.array([len(closed_class) for closed_class in closed_classes],
+                                                 dtype=np.intp),
+                  "class_periods": np.array(self.get_class_periods(), dtype=np.int64),
+                  "fingerprint": np.array(fingerprint)}
+        vertices = self._graph.get_vertices()
+        if vertices != list(range(self._graph.get_number_of_vertices())):
+            arrays["vertices"] = np.array(vertices, dtype=float)
+        with open(file_path, "wb") as fp:
+            np.savez_compressed(fp, **arrays)
+
+    @classmethod
+    def load(cls, file_path: str, fingerprint: str = None):
+        """
+        Method to load a stored structural analysis
+        :param file_path: external file used as storage path
+        :param fingerprint: expected fingerprint of the specification, None to skip the check
+        :return: StructuralAnalysis or None if the stored analysis belongs to another specification
+        """
+        with np.load(file_path) as data:
+            if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+                return None
+            vertices = None
+            if "vertices" in data:
+                vertices = data["vertices"]
+                if vertices.ndim == 2:
+                    vertices = [tuple(vertex) for vertex in vertices.tolist()]
+                else:
+                    vertices = vertices.tolist()
+            graph = MarkovChainGraph(int(data["number_of_vertices"]), data["sources"], data["targets"], vertices)
+            analysis = cls(graph)
+            boundaries = np.cumsum(data["closed_class_sizes"])[:-1]
+            analysis._closed_classes = np.split(data["closed_classes"], boundaries) \
+                if len(data["closed_class_sizes"]) else []
+            analysis._class_periods = data["class_periods"].tolist()
+        return analysis
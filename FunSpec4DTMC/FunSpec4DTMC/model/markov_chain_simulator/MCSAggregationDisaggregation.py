@@ -0,0 +1,206 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+from FunSpec4DTMC.model.markov_chain.MarkovChainGraph import MarkovChainGraph
+from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import solve_closed_class, solve_coupling
+from FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach import MCSForwardApproach
+import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
+
+
+class MCSAggregationDisaggregation(MarkovChainSimulator):
+
+    def __init__(self, markov_chain: MarkovChain = None, identification: str = None, partition: str = "Automatic",
+                 coupling_threshold: float = 1e-3, aggregation_dimension=0):
+        """
+        Constructor MCSAggregationDisaggregation
+        :param markov_chain: MarkovChainConventionalApproach or MarkovChainForwardApproach
+        :param identification: designation of the simulator
+        :param partition: "Coupling" to aggregate the strongly connected components of the transitions with a
+        probability of at least coupling_threshold, "State dimension" to aggregate the states of a functional
+        Markov chain with equal value in one dimension of the state space, "Automatic" to use the state dimension
+        for functional Markov chains with a multidimensional state space and the coupling otherwise
+        :param coupling_threshold: transitions below this probability are treated as weak coupling
+        :param aggregation_dimension: index or name of the state space dimension used for aggregation
+        """
+        MarkovChainSimulator.__init__(self, markov_chain, identification)
+        self._type = "MCSAggregationDisaggregation"
+        self._partition = partition
+        self._coupling_threshold = coupling_threshold
+        self._aggregation_dimension = aggregation_dimension
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, self._partition, self._coupling_threshold, self._aggregation_dimension)
+
+    def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period: int = 1):
+        """
+        Method for calculating the stationary state distribution with iterative aggregation/disaggregation
+        (Koury, McAllister and Stewart). The states are partitioned into blocks I_1, ..., I_N. In every step
+        1. the coarse chain C_IJ = sum_{i in I} x_i / x_I sum_{j in J} P_ij is solved exactly for xi,
+        2. the distribution is disaggregated to z_i = xi_I x_i / x_I,
+        3. a block Jacobi step solves x_I (I - P_II) = sum_{J != I} z_J P_JI for every block.
+        The coarse generator is assembled from the weak coupling only, so the coupling is not lost in 1 - C_II.
+        For nearly completely decomposable chains the error is reduced by the weak coupling in every step instead of
+        the subdominant eigenvalue of P.
+        :param simulation_steps: number of iteration steps, 0 to iterate until the calculation precision is reached
+        :param alpha: not used
+        :param specified_period: not used
+        :return stationary state distribution
+        """
+        full_transition_matrix = self.get_sparse_transition_matrix()
+        recurrent_states = self.calculate_recurrent_states()
+        transition_matrix = full_transition_matrix[recurrent_states][:, recurrent_states].tocsr()
+        labels = np.unique(self.calculate_partition(full_transition_matrix)[recurrent_states], return_inverse=True)[1]
+        labels = labels.ravel()
+        number_of_states = transition_matrix.shape[0]
+        number_of_blocks = int(np.max(labels)) + 1
+        aggregation = scipy.sparse.csr_matrix((np.ones(number_of_states), (np.arange(number_of_states), labels)),
+                                              shape=(number_of_states, number_of_blocks))
+        same_block = labels[np.repeat(np.arange(number_of_states), np.diff(transition_matrix.indptr))] == \
+            labels[transition_matrix.indices]
+        diagonal_blocks = scipy.sparse.csr_matrix((transition_matrix.data * same_block,
+                                                   transition_matrix.indices.copy(), transition_matrix.indptr.copy()),
+                                                  shape=transition_matrix.shape)
+        diagonal_blocks.eliminate_zeros()
+        coupling = (transition_matrix - diagonal_blocks).tocsr()
+        block_solver = self.block_solver(diagonal_blocks) if number_of_blocks > 1 else None
+
+        state_distribution = self.get_warm_start_vector()
+        if state_distribution is not None:
+            state_distribution = np.asarray(state_distribution, dtype=float)[recurrent_states]
+        if state_distribution is None or np.any(aggregation.transpose().dot(state_distribution) <= 0):
+            state_distribution = np.full(number_of_states, 1.0 / number_of_states)
+        predecessor_state_distribution = np.zeros(number_of_states)
+
+        step = 0
+        norm = self.norm(state_distribution, predecessor_state_distribution)
+        if number_of_blocks == 1:
+            # the only block is the closed class itself, its block solve is the exact solution
+            step = 1
+            state_distribution = solve_closed_class(transition_matrix)
+            norm = 0
+        while number_of_blocks > 1 and ((simulation_steps == 0 and norm > self.get_calculation_precision()) or
+                                        (simulation_steps != 0 and step < simulation_steps)):
+            if simulation_steps == 0:
+                self.check_iterations(step, norm)
+            step += 1
+            try:
+                self.notify_calculation_listeners(step, norm)
+            except:
+                raise InterruptedError
+            predecessor_state_distribution = state_distribution
+            state_distribution = self._transition(state_distribution, transition_matrix, aggregation, coupling,
+                                                  block_solver)
+            norm = self.norm(state_distribution, predecessor_state_distribution)
+        try:
+            self.notify_calculation_listeners(step, norm)
+        except:
+            raise InterruptedError
+        stationary_state_distribution = np.zeros(full_transition_matrix.shape[0])
+        stationary_state_distribution[recurrent_states] = state_distribution
+        return stationary_state_distribution
+
+    def get_sparse_transition_matrix(self):
+        """
+        Method that returns the transition matrix in compressed sparse row format, for functional Markov chains it is
+        derived with the forward algorithm
+        :return: transition matrix
+        """
+        if self.get_markov_chain().get_type() == "MarkovChainForwardApproach":
+            transition_matrix = MCSForwardApproach(self.get_markov_chain(), sparseMode=True) \
+                .calculate_transition_matrix()
+        else:
+            transition_matrix = self.get_markov_chain().get_transition_matrix()
+        return scipy.sparse.csr_matrix(transition_matrix, dtype=float)
+
+    def calculate_recurrent_states(self):
+        """
+        Method for determining the states of the closed class from the structural analysis, the transient states
+        have no stationary probability and are left out of the iteration
+        :return: index array of the recurrent states
+        """
+        closed_classes = self.get_structural_analysis().get_closed_classes()
+        if len(closed_classes) != 1:
+            raise ValueError("The aggregation/disaggregation approach requires a single closed class, "
+                             "use the decomposition approach instead")
+        return np.sort(closed_classes[0])
+
+    def calculate_partition(self, transition_matrix):
+        """
+        Method for partitioning the states into the blocks of the coarse chain
+        :param transition_matrix: transition matrix in compressed sparse row format
+        :return: block label of every state
+        """
+        if self._partition in ("Automatic", "State dimension") and \
+                self.get_markov_chain().get_type() == "MarkovChainForwardApproach":
+            states = np.asarray(self.get_markov_chain().get_states()[0])
+            if states.ndim == 2:
+                dimension = self._aggregation_dimension
+                if isinstance(dimension, str):
+                    dimension = list(self.get_markov_chain().get_state_space_names()).index(dimension)
+                return np.unique(states[:, dimension], return_inverse=True)[1].ravel()
+        strong = transition_matrix.multiply(transition_matrix >= self._coupling_threshold).tocsr()
+        sources = np.repeat(np.arange(strong.shape[0]), np.diff(strong.indptr))
+        graph = MarkovChainGraph(strong.shape[0], sources, strong.indices)
+        return graph.get_component_labels()
+
+    def block_solver(self, diagonal_blocks):
+        """
+        Method for factorizing (I - P_D)^T of the block diagonal part P_D of the transition matrix. The factors
+        are block diagonal as well. Returns None if a block is closed, the smoothing then falls back to a power step.
+        :param diagonal_blocks: block diagonal part of the transition matrix
+        :return: sparse LU-decomposition or None
+        """
+        n = diagonal_blocks.shape[0]
+        try:
+            return scipy.sparse.linalg.splu((scipy.sparse.identity(n, format="csc") - diagonal_blocks)
+                                            .transpose().tocsc(), permc_spec="COLAMD")
+        except RuntimeError:
+            return None
+
+    def _transition(self, state_distribution, transition_matrix, aggregation, coupling, block_solver):
+        """
+        Performs one aggregation/disaggregation step
+        :param state_distribution: current state distribution, blocks without probability mass are disaggregated
+        uniformly
+        :param transition_matrix: transition matrix in compressed sparse row format
+        :param aggregation: n x N matrix assigning every state to its block
+        :param coupling: off block diagonal part of the transition matrix
+        :param block_solver: LU-decomposition of (I - P_D)^T or None
+        :return: successor state distribution
+        """
+        block_distribution = aggregation.transpose().dot(state_distribution)
+        empty_blocks = block_distribution <= 0
+        if np.any(empty_blocks):
+            # a block without probability mass is disaggregated uniformly instead of dividing by zero
+            empty_states = aggregation.dot(empty_blocks.astype(float)) > 0
+            state_distribution = np.where(empty_states, 1.0, state_distribution)
+            block_distribution = aggregation.transpose().dot(state_distribution)
+        weights = state_distribution / aggregation.dot(block_distribution)
+        coarse_coupling = aggregation.transpose().dot(scipy.sparse.diags(weights).dot(coupling)).dot(aggregation)
+        coarse_distribution = solve_coupling(coarse_coupling)
+        state_distribution = aggregation.dot(coarse_distribution) * weights
+        if block_solver is None:
+            state_distribution = self.vector_matrix_product(state_distribution, transition_matrix)
+        else:
+            state_distribution = np.maximum(block_solver.solve(coupling.transpose().dot(state_distribution)), 0)
+        return state_distribution / np.sum(state_distribution)
+
@@ -32,58 +32,24 @@ class MCSCesaroLimit(MarkovChainSimulator):
 
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
         """
-        Method for calculating the stationary state distribution
+        Method for calculating the stationary state distribution as a batch with a single row
         :param simulation_steps: number of iteration steps
         :param alpha: value used for the alpha relaxation
         :param specified_period: specified value for period
         :return stationary state distribution
         """
-        cesaro_sum = self.get_markov_chain().get_initial_state_vector()[:]
-        predecessor_cesaro_sum = np.zeros(len(cesaro_sum))
+        return self.calculate_state_distributions(self.get_start_vector(), simulation_steps, alpha)[0]
 
-        if simulation_steps == 0:
-            step = 0
-            norm = self.norm(cesaro_sum, predecessor_cesaro_sum)
-            while norm > self.get_calculation_precision():
-                step += 1
-                try:
-                    self.notify_calculation_listeners(step, norm)
-                except:
-                    raise InterruptedError
-                predecessor_cesaro_sum = cesaro_sum
-                cesaro_sum = (step * cesaro_sum + self._transition(cesaro_sum))/(step+1)
-                cesaro_sum = alpha * cesaro_sum + (1 - alpha) * predecessor_cesaro_sum
-                cesaro_sum /= sum(cesaro_sum)
-                norm = self.norm(cesaro_sum, predecessor_cesaro_sum)
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
-
-        else:
-            step = 0
-            for step in range(1, simulation_steps):
-                try:
-                    self.notify_calculation_listeners(step)
-                except:
-                    raise InterruptedError
-                predecessor_cesaro_sum = cesaro_sum
-                cesaro_sum = (step * cesaro_sum + self._transition(cesaro_sum)) / (step + 1)
-                cesaro_sum = alpha * cesaro_sum + (1 - alpha) * predecessor_cesaro_sum
-                cesaro_sum /= sum(cesaro_sum)
-            norm = self.norm(cesaro_sum, predecessor_cesaro_sum)
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
-        return cesaro_sum
-
-    def _transition(self, cesaro_sum: np.ndarray):
+    def calculate_subsequent_state_distributions(self, cesaro_sums: np.ndarray, step: int, alpha: float = 1):
         """
-        Method for calculating the successor state distribution
-        :param cesaro_sum: current state distribution
-        :return: successor state distribution
+        Method for calculating the successor Cesaro sums
+        c_{i+1} = alpha (i c_i + c_i P) / (i + 1) + (1 - alpha) c_i
+        :param cesaro_sums: current Cesaro sums as rows
+        :param step: current step i
+        :param alpha: value used for the alpha relaxation
+        :return: successor Cesaro sums
         """
-        return np.dot(cesaro_sum, self.get_markov_chain().get_transition_matrix())
-
-
+        successor_cesaro_sums = (step * cesaro_sums +
+                                 self.matrix_product(cesaro_sums, self.get_markov_chain().get_transition_matrix())) / \
+            (step + 1)
+        return alpha * successor_cesaro_sums + (1 - alpha) * cesaro_sums
@@ -0,0 +1,122 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import numpy as np
+import scipy.sparse
+from concurrent.futures import ProcessPoolExecutor
+from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import solve_closed_class, \
+    calculate_absorption_probabilities, combine_class_distributions
+import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
+
+
+class MCSDecompositionApproach(MarkovChainSimulator):
+
+    def __init__(self, markov_chain: MarkovChain = None, identification: str = None, parallel_threshold: int = 20000):
+        """
+        Constructor MCSDecompositionApproach
+        :param markov_chain: MarkovChainConventionalApproach
+        :param identification: designation of the simulator
+        :param parallel_threshold: number of recurrent states from which the closed classes are solved on a
+        process pool
+        """
+        MarkovChainSimulator.__init__(self, markov_chain, identification)
+        self._type = "MCSDecompositionApproach"
+        self._parallel_threshold = parallel_threshold
+        self._absorption_probabilities = None
+
+    def calculate_stationary_state_distribution(self, simulation_steps: int = None, alpha=None,
+                                                specified_period: int = 1):
+        """
+        Method for calculating the limiting distribution of a reducible chain for its initial state vector.
+        The closed classes C_1, ..., C_m of the structural analysis are solved independently on their sub-matrices.
+        With the transient states T, Q = P[T, T] and the initial state vector x_0, the probability to end up in C_k is
+        a_k = x_0[C_k] 1 + x_0[T] (I - Q)^-1 P[T, C_k] 1
+        and the limiting distribution is x = sum_k a_k x_k, where x_k is the stationary state distribution of C_k.
+        For periodic classes x_k is the Cesaro limit of the class.
+        :param simulation_steps: not used, the distribution is calculated directly
+        :param alpha: not used
+        :param specified_period: not used
+        :return stationary state distribution
+        """
+        transition_matrix = scipy.sparse.csr_matrix(self.get_markov_chain().get_transition_matrix(), dtype=float)
+        initial_state_vector = np.asarray(self.get_markov_chain().get_initial_state_vector(), dtype=float)
+        structural_analysis = self.get_structural_analysis()
+        closed_classes = structural_analysis.get_closed_classes()
+        transient_states = structural_analysis.get_transient_states()
+        try:
+            self.notify_calculation_listeners(0)
+        except:
+            raise InterruptedError
+
+        sub_matrices = [transition_matrix[closed_class][:, closed_class] for closed_class in closed_classes]
+        class_distributions = self.calculate_class_distributions(sub_matrices, structural_analysis.get_class_periods())
+        absorption_probabilities = self.calculate_absorption_probabilities(transition_matrix, initial_state_vector,
+                                                                           closed_classes, transient_states)
+        self._absorption_probabilities = absorption_probabilities
+
+        state_distribution = combine_class_distributions(transition_matrix.shape[0], closed_classes,
+                                                         class_distributions, absorption_probabilities)
+        try:
+            self.notify_calculation_listeners(len(closed_classes),
+                                              self.norm(state_distribution, self._transition(state_distribution)))
+        except:
+            raise InterruptedError
+        return state_distribution
+
+    def calculate_class_distributions(self, sub_matrices: list, class_periods: list):
+        """
+        Method for calculating the stationary state distributions of the closed classes. The classes are solved on a
+        process pool if they contain at least parallel_threshold states together.
+        :param sub_matrices: transition matrices of the closed classes
+        :param class_periods: periods of the closed classes, not needed by the sparse LU-decomposition
+        :return: list of stationary state distributions
+        """
+        if len(sub_matrices) > 1 and sum(sub_matrix.shape[0] for sub_matrix in sub_matrices) >= self._parallel_threshold:
+            with ProcessPoolExecutor(max_workers=min(len(sub_matrices), os.cpu_count() or 1)) as executor:
+                return list(executor.map(solve_closed_class, sub_matrices))
+        return [solve_closed_class(sub_matrix) for sub_matrix in sub_matrices]
+
+    def calculate_absorption_probabilities(self, transition_matrix, initial_state_vector: np.ndarray,
+                                           closed_classes: list, transient_states: np.ndarray):
+        """
+        Method for calculating the probabilities to end up in each closed class when starting with the initial
+        state vector
+        :param transition_matrix: transition matrix in compressed sparse row format
+        :param initial_state_vector: initial state vector
+        :param closed_classes: list of vertex index arrays of the closed classes
+        :param transient_states: vertex index array of the transient states
+        :return: absorption probability of every closed class
+        """
+        return calculate_absorption_probabilities(transition_matrix, initial_state_vector, closed_classes,
+                                                  transient_states)
+
+    def get_absorption_probabilities(self):
+        """
+        Getter method of the absorption probabilities of the last calculation
+        :return: absorption probability of every closed class
+        """
+        return self._absorption_probabilities
+
+    def _transition(self, state_distribution):
+        """
+        Calculates state distribution after a single transition step
+        state distribution after transition i:
+        x_{i+1} =  x_i * P
+        :param state_distribution: current state distribution
+        :return: successor state distribution
+        """
+        return self.vector_matrix_product(state_distribution, self.get_markov_chain().get_transition_matrix())
+
@@ -14,8 +14,10 @@
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import scipy.linalg
+import scipy.sparse
 import numpy as np
 from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import solve_stationary_state_distribution
 import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
 
 class MCSDirectApproach(MarkovChainSimulator):
@@ -30,6 +32,13 @@ class MCSDirectApproach(MarkovChainSimulator):
         self._scheme = scheme
         self._type = "MCSDirectApproach"
 
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, self._research_mode, self._scheme)
+
     def calculate_stationary_state_distribution(self, simulation_steps: int = None, alpha=None, specified_period:int=1):
         """
         Method for calculating the stationary state distribution
@@ -39,6 +48,10 @@ class MCSDirectApproach(MarkovChainSimulator):
         :return stationary state distribution
         """
         A = self.get_markov_chain().get_transition_matrix()
+        if self._scheme == "Sparse LU scheme":
+            return self.sparse_lu_solution(A)
+        if scipy.sparse.issparse(A):
+            A = A.toarray()
         Q = np.eye(len(A)) - A
         if self._research_mode:
             P, L, U = scipy.linalg.lu(np.transpose(Q))
@@ -65,13 +78,7 @@ class MCSDirectApproach(MarkovChainSimulator):
         :param i: current evaluation index
         :return: pivoted matrix
         """
-        dimension = len(A)
-        maximum = 0.0
-        max = i
-        for j in range(i, dimension):
-            if (abs(A[j][i]) > maximum):
-                maximum = abs(A[j][i])
-                max = j
+        max = i + int(np.argmax(np.abs(A[i:, i])))
 
         if i != max:
             self.swap_rows(A, i, max)
@@ -91,7 +98,8 @@ class MCSDirectApproach(MarkovChainSimulator):
 
     def forward_substitution(self, L, b):
         """
-        Method to perform the forward substitution step L*y = b of the LU-decomposition
+        Method to perform the forward substitution step L*y = b of the LU-decomposition.
+        Each row is reduced by a single dot product with the already computed part of y.
         :param L: lower triangular matrix
         :param b: result vector
         :return: y: solution vector
@@ -99,18 +107,14 @@ class MCSDirectApproach(MarkovChainSimulator):
         y = np.zeros(len(b))
 
         for i in range(len(b)):
-            y[i] = b[i]
-
-            for j in range(i):
-                y[i] -= L[i][j] * y[j]
-
-            y[i] /= L[i][i]
+            y[i] = (b[i] - np.dot(L[i, :i], y[:i])) / L[i, i]
 
         return y
 
     def backward_substitution(self, U, y, mu=None):
         """
-        Method to perform the backward substitution step U*x = y of the LU-decomposition
+        Method to perform the backward substitution step U*x = y of the LU-decomposition.
+        Each row is reduced by a single dot product with the already computed part of x.
         :param L: upper triangular matrix
         :param y: result vector
         :return: x: solution vector
@@ -122,38 +126,41 @@ class MCSDirectApproach(MarkovChainSimulator):
             x[-1] = mu
 
         for i in reversed(range(len(y))):
-            x[i] = y[i]
-            for j in range(i + 1, len(x)):
-                x[i] -= U[i][j] * x[j]
-            x[i] /= U[i][i]
+            x[i] = (y[i] - np.dot(U[i, i + 1:], x[i + 1:])) / U[i, i]
 
         return x
 
 
     def lu_decomposition(self, A):
         """
-        Method to perform the lu-decomposition of a matrix
+        Method to perform the lu-decomposition of a matrix.
+        The Doolittle scheme is evaluated column by column: after pivoting, the upper part of column i
+        is obtained by a unit lower triangular solve and the lower part by a single matrix-vector product.
         :param A: input matrix
         :return: L: lower triangular matrix
         :return: U: upper triangular matrix
         """
-        M = np.copy(A)
+        M = np.array(A, dtype=float)
         n = len(M)
-        L = np.zeros((n,n))
+        L = np.zeros((n, n))
         U = np.zeros((n, n))
         for i in range(n):
 
             self.pivoting(M, i)
-            for j in range(i + 1):
-                s = 0
-                for k in range(j):
-                    s += (U[k][i] * L[j][k])
-                U[j][i] = M[j][i] - s
-
-            for j in range(i, n):
-                s = 0
-                for k in range(i):
-                    s += U[k][i] * L[j][k]
-                if U[i][i] != 0:
-                    L[j][i] = (M[j][i] - s) / U[i][i]
+            U[:i + 1, i] = scipy.linalg.solve_triangular(L[:i + 1, :i + 1], M[:i + 1, i], lower=True,
+                                                         unit_diagonal=True, check_finite=False)
+
+            if U[i, i] != 0:
+                L[i:, i] = (M[i:, i] - np.dot(L[i:, :i], U[:i, i])) / U[i, i]
         return L, U
+
+    def sparse_lu_solution(self, A):
+        """
+        Method to solve x(I-P) = 0 with sparse LU-decompositions. Every closed class of the structural analysis is
+        solved on its own sub-matrix and weighted with the probability to end up in it from the initial state
+        vector, so transient states and reducible chains do not make the system singular.
+        :param A: transition matrix
+        :return: stationary state distribution
+        """
+        return solve_stationary_state_distribution(A, self.get_markov_chain().get_initial_state_vector(),
+                                                   self.get_structural_analysis())
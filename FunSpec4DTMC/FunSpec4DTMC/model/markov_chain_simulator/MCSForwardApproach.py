@@ -14,39 +14,46 @@
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
-import time
-import importlib
+import scipy.sparse
 from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
 from FunSpec4DTMC.model.markov_chain import MarkovChainForwardApproach
-import FunSpec4DTMC.model.markov_chain_simulator.forward_algorithm_cython_implementation.ForwardAlgorithm as FA
+try:
+    import FunSpec4DTMC.model.markov_chain_simulator.forward_algorithm_cython_implementation.ForwardAlgorithm as FA
+except ImportError:
+    FA = None
+if FA is not None and not hasattr(FA, "successor_index"):
+    # extension built from an outdated ForwardAlgorithm.pyx with the former entry points
+    FA = None
 
 
 class MCSForwardApproach(MarkovChainSimulator):
 
 
-    def __init__(self, markov_chain: MarkovChainForwardApproach = None, cythonMode=False, identification: str = None):
+    def __init__(self, markov_chain: MarkovChainForwardApproach = None, cythonMode=False, identification: str = None,
+                 sparseMode=False):
         """
         Constructor of the MCSForwardApproach
         :param markov_chain: MarkovChainForwardApproach
-        :param cythonMode: cythonMode selection
+        :param cythonMode: cythonMode selection, requires the compiled forward algorithm
         :param identification: designation of the simulator
+        :param sparseMode: selection of the sparse derivation of the transition matrix
         """
         MarkovChainSimulator.__init__(self, markov_chain, identification)
         self._type = "MCSForwardApproach"
-        self.cythonMode = cythonMode
-
-    def create_transition_function_from_file_path(self, file_path):
-        TransitionFunction = importlib.import_module(file_path)
-        transition_functions = []
-        index = 1
-        while hasattr(TransitionFunction
-                , 'transition_function{index}'.format(index=index)):
-            transition_functions.append(
-                getattr(TransitionFunction, 'transition_function{index}'.format(index=index)))
-            index += 1
-        return transition_functions
-
+        self.cythonMode = False
+        self.enableCythonMode(cythonMode)
+        self.sparseMode = sparseMode
+        self._stage_matrices = None
+        self._stage_matrices_index = None
 
+    @staticmethod
+    def is_cython_available():
+        """
+        Method to check whether the forward algorithm has been compiled from the current ForwardAlgorithm.pyx,
+        e.g. with setup.py build_ext
+        :return: True if the cython mode can be used
+        """
+        return FA is not None
 
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
         """
@@ -56,7 +63,7 @@ class MCSForwardApproach(MarkovChainSimulator):
         :param specified_period: specified value for period
         :return stationary state distribution
         """
-        state_vector = np.array(self.get_markov_chain().get_initial_state_vector()[:])
+        state_vector = self.get_start_vector()
         number_of_states = len(state_vector)
         if (specified_period == 0) or (specified_period is None):
             period = self.calculate_mc_period()
@@ -70,20 +77,19 @@ class MCSForwardApproach(MarkovChainSimulator):
             norm.append(False)
 
         index = 0
-        t= time.clock()
+        curr_norm = np.inf
         if simulation_steps == 0:
             while False in norm:
+                self.check_iterations(step, curr_norm)
                 step += 1
                 x[index] = state_vector
                 if not self.cythonMode:
                     state_vector = self._forward_algorithm(state_vector)
                 else:
                     state_vector = FA.forward_algorithm(
-                                        self.get_markov_chain().get_states(),
+                                        self.get_successor_index(),
                                         state_vector,
-                                        self.get_markov_chain().get_factors(),
-                                        self.get_markov_chain().get_factor_distributions(),
-                                        self.get_markov_chain().get_transition_functions())
+                                        self.get_markov_chain().get_factor_distributions())
 
                 state_vector /= sum(state_vector)
                 index = (index + 1) % period
@@ -103,11 +109,9 @@ class MCSForwardApproach(MarkovChainSimulator):
                 else:
 
                     state_vector = FA.forward_algorithm(
-                                        self.get_markov_chain().get_states(),
+                                        self.get_successor_index(),
                                         state_vector,
-                                        self.get_markov_chain().get_factors(),
-                                        self.get_markov_chain().get_factor_distributions(),
-                                        self.get_markov_chain().get_transition_functions())
+                                        self.get_markov_chain().get_factor_distributions())
                 state_vector /= sum(state_vector)
                 index = (index + 1) % period
                 norm = self.norm(state_vector, x[index])
@@ -119,100 +123,146 @@ class MCSForwardApproach(MarkovChainSimulator):
         for index in range(int(period)):
             xs = xs + x[index] / period
         xs /= sum(xs)
-        print("Zeit:" + str(time.clock()-t))
         return xs
 
 
+    def get_batch_period(self, specified_period: int = 1):
+        """
+        Method that returns the period the state vectors are averaged over
+        :param specified_period: specified value for period, 0 or None to use the period of the Markov chain
+        :return: period
+        """
+        if (specified_period == 0) or (specified_period is None):
+            return self.calculate_mc_period()
+        return specified_period
+
+    def calculate_subsequent_state_distributions(self, state_distributions: np.ndarray, step: int, alpha: float = 1):
+        """
+        Calculates the successor state distributions of a batch by applying the stage matrices of the forward
+        algorithm, one product per stage matrix. The stage matrices are built once per successor index.
+        :param state_distributions: current state distributions as rows
+        :param step: current step
+        :param alpha: not used
+        :return: successor state distributions
+        """
+        successor_index = self.get_successor_index()
+        if self._stage_matrices is None or self._stage_matrices_index is not successor_index:
+            self._stage_matrices = self.calculate_stage_matrices()
+            self._stage_matrices_index = successor_index
+        return self._batch_forward_algorithm(state_distributions, self._stage_matrices)
+
+    def _batch_forward_algorithm(self, state_distributions: np.ndarray, stage_matrices: list):
+        """
+        Calculates the subsequent state distributions of a k x n matrix of state distributions by applying the
+        stage matrices of the forward algorithm
+        :param state_distributions: current state distributions as rows
+        :param stage_matrices: stage matrices in compressed sparse row format
+        :return: subsequent state distributions
+        """
+        for stage_matrix in stage_matrices:
+            state_distributions = self.matrix_product(state_distributions, stage_matrix)
+        return state_distributions
+
     def _forward_algorithm(self, state_distribution: np.array):
         """
         Calculates the subsequent state distribution by applying the forward algorithm.
+        The compiled successor index turns every stage into a single scatter of the weighted probability mass.
         :param state_distribution: current state distribution
         :return: subsequent state distribution
         """
-        old = state_distribution[:]
-        states = self.get_markov_chain().get_states()
         number_of_states = len(state_distribution)
-        factors = self.get_markov_chain().get_factors()
         factor_distributions = self.get_markov_chain().get_factor_distributions()
-        transition_functions = self.create_transition_function_from_file_path(
-                                            self.get_markov_chain().get_transition_functions())
-        new = np.zeros(number_of_states)
-        for index in range(len(transition_functions)):
-            new = np.zeros(number_of_states)
-            curr_states = (states[index])
-            map = {}
-
-            for state_index in range(len(curr_states)):
-                try:
-                    map[str(float(curr_states[state_index]))] = int(state_index)
-                except:
-                    map[str(self.adjust_input_type(curr_states[state_index]))] = int(state_index)
-
-            for j in range(number_of_states):
-                if old[j] != 0.0:
-                    curr_factors = factors[index]
-                    curr_factor_distribution = factor_distributions[index]
-                    l = len(curr_factors)
-
-                    for k in range(l):
-                        new[map[str(self.adjust_input_type(transition_functions[index](curr_states[j], curr_factors[k])))]] += \
-                            old[j] * curr_factor_distribution[k]
-            old = new
-
+        successor_index = self.get_successor_index()
+        new = np.asarray(state_distribution, dtype=float)
+        for index in range(len(successor_index)):
+            new = np.bincount(successor_index[index].ravel(),
+                              weights=np.outer(new, factor_distributions[index]).ravel(),
+                              minlength=number_of_states)
         return new
 
-
+    def calculate_successor_index(self):
+        """
+        Method for compiling the successor index of the functional Markov chain, using the Cython implementation
+        if the cython mode is enabled.
+        :return: successor index: one integer array succ[state, factor] -> subsequent state per transition function
+        """
+        if not self.cythonMode:
+            return MarkovChainSimulator.calculate_successor_index(self)
+        return FA.successor_index(self.get_markov_chain().get_states(),
+                                  self.get_markov_chain().get_factors(),
+                                  self.get_markov_chain().get_factor_distributions(),
+                                  self.get_markov_chain().get_resolved_transition_functions())
 
     def enableCythonMode(self, enabled):
         """
         Method to enable the cython mode
         :param enabled: cython mode selection
         """
+        if enabled and not self.is_cython_available():
+            raise ImportError("The forward algorithm has not been compiled, run setup.py build_ext")
         self.cythonMode = enabled
 
+    def enableSparseMode(self, enabled):
+        """
+        Method to enable the sparse derivation of the transition matrix
+        :param enabled: sparse mode selection
+        """
+        self.sparseMode = enabled
+
+    def calculate_stage_matrices(self):
+        """
+        Builds one sparse matrix per transition function from the (state, factor) successor pairs
+        of the compiled successor index.
+        :return: list of stage matrices in compressed sparse row format
+        """
+        successor_index = self.get_successor_index()
+        factor_distributions = self.get_markov_chain().get_factor_distributions()
+        number_of_states = len(successor_index[0])
+        stage_matrices = []
+        for index in range(len(successor_index)):
+            successors = successor_index[index]
+            (number_of_curr_states, number_of_factors) = successors.shape
+            rows = np.repeat(np.arange(number_of_curr_states), number_of_factors)
+            weights = np.tile(np.asarray(factor_distributions[index], dtype=float), number_of_curr_states)
+            stage_matrix = scipy.sparse.coo_matrix((weights, (rows, successors.ravel())),
+                                                   shape=(number_of_states, number_of_states)).tocsr()
+            stage_matrix.eliminate_zeros()
+            stage_matrices.append(stage_matrix)
+        return stage_matrices
+
     def calculate_transition_matrix(self):
         """
         Calculates the transition matrix by applying the forwarding algorithm.
+        In sparse mode the stage matrices are multiplied sparsely and P is returned in compressed sparse row format.
+        With a result store the matrix is loaded from the store or added to it.
         :return: transition matrix
         """
-        if not self.cythonMode:
-            states = self.get_markov_chain().get_states()
-            number_of_states = len(states[0])
-            factors = self.get_markov_chain().get_factors()
-            factor_distributions = self.get_markov_chain().get_factor_distributions()
-            transition_functions = self.create_transition_function_from_file_path(
-                                            self.get_markov_chain().get_transition_functions())
-            transition_matrix = np.eye(number_of_states)
-            for index in range(len(transition_functions)):
-                new_transition_matrix = np.zeros((number_of_states, number_of_states))
-                curr_states = states[index]
-                map = {}
-                for state_index in range(len(curr_states)):
-                    try:
-                        map[str(float(curr_states[state_index]))] = int(state_index)
-                        map[str(int(curr_states[state_index]))] = int(state_index)
-                    except:
-                        map[str(tuple(curr_states[state_index]))] = int(state_index)
-                for j in range(len(curr_states)):
-                    curr_factors = factors[index]
-                    curr_factor_distribution = factor_distributions[index]
-                    l = len(curr_factors)
-                    for k in range(l):
-
-                        new_transition_matrix[map[str(self.adjust_input_type(curr_states[j]))],
-                                              map[str(self.adjust_input_type(transition_functions[index](curr_states[j], curr_factors[k])))]] \
-                            += curr_factor_distribution[k]
-                transition_matrix = np.dot(transition_matrix, new_transition_matrix)
-
-        elif self.cythonMode:
-
-            transition_matrix = FA.transition_matrix(
-                                        self.get_markov_chain().get_states(),
-                                        self.get_markov_chain().get_factors(),
-                                        self.get_markov_chain().get_factor_distributions(),
-                                        self.create_transition_function_from_file_path(
-                                            self.get_markov_chain().get_transition_functions())
-                                        )
+        result_store = self.get_result_store()
+        if result_store is not None:
+            fingerprint = result_store.get_fingerprint(self.get_markov_chain())
+            transition_matrix = result_store.load_transition_matrix(fingerprint, self.sparseMode)
+            if transition_matrix is not None:
+                return transition_matrix
+
+        if self.sparseMode:
+            stage_matrices = self.calculate_stage_matrices()
+            transition_matrix = stage_matrices[0]
+            for stage_matrix in stage_matrices[1:]:
+                transition_matrix = transition_matrix.dot(stage_matrix)
+            transition_matrix.sum_duplicates()
+            transition_matrix.eliminate_zeros()
+
+        elif not self.cythonMode:
+            stage_matrices = self.calculate_stage_matrices()
+            transition_matrix = np.eye(stage_matrices[0].shape[0])
+            for stage_matrix in stage_matrices:
+                transition_matrix = np.dot(transition_matrix, stage_matrix.toarray())
+
+        else:
+            transition_matrix = FA.transition_matrix(self.get_successor_index(),
+                                                     self.get_markov_chain().get_factor_distributions())
+        if result_store is not None:
+            result_store.save_transition_matrix(fingerprint, transition_matrix)
         return transition_matrix
 
     def adjust_input_type(self, input):
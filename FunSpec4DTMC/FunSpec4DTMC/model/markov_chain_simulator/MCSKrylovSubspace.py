@@ -0,0 +1,191 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import combine_class_distributions
+import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
+
+
+class MCSKrylovSubspace(MarkovChainSimulator):
+
+    def __init__(self, scheme="GMRES", markov_chain: MarkovChain = None, identification: str = None,
+                 cycle_length: int = 20):
+        """
+        Constructor MCSKrylovSubspace
+        :param scheme: "GMRES", "BiCGSTAB" or "Arnoldi"
+        :param markov_chain: MarkovChainConventionalApproach
+        :param identification: designation of the simulator
+        :param cycle_length: number of Krylov iterations between two convergence checks
+        """
+        MarkovChainSimulator.__init__(self, markov_chain, identification)
+        self._type = "MCSKrylovSubspace"
+        self._scheme = scheme
+        self._cycle_length = cycle_length
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, self._scheme, self._cycle_length)
+
+    def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
+        """
+        Method for calculating the stationary state distribution.
+        GMRES and BiCGSTAB solve (I-P)^T x = 0 with the last equation replaced by x_n = 1 and an incomplete LU
+        preconditioner. They are restarted every cycle_length iterations; after each cycle the normalized iterate
+        is compared with its predecessor like in the power iteration strategies. Arnoldi computes the dominant
+        left eigenvector of the lazy chain (I+P)/2, which is the stationary state distribution of P also for periodic
+        classes.
+        The systems are set up on the closed class of the chain, transient states have probability 0. Chains with
+        several closed classes have no unique stationary state distribution and are rejected, they are solved by
+        the decomposition approach.
+        :param simulation_steps: number of cycles, 0 to iterate until the calculation precision is reached
+        :param alpha: value used for the alpha relaxation
+        :param specified_period: specified value for period
+        :return stationary state distribution
+        """
+        transition_matrix = scipy.sparse.csr_matrix(self.get_markov_chain().get_transition_matrix())
+        number_of_states = transition_matrix.shape[0]
+        closed_classes = self.get_structural_analysis().get_closed_classes()
+        if len(closed_classes) != 1:
+            raise ValueError("The Krylov subspace approach requires a single closed class, "
+                             "use the decomposition approach for reducible chains")
+        closed_class = closed_classes[0]
+        state_distribution = self.get_start_vector()[closed_class]
+        if np.sum(state_distribution) == 0:
+            state_distribution = np.ones(len(closed_class))
+        state_distribution = state_distribution / np.sum(state_distribution)
+        if len(closed_class) < number_of_states:
+            transition_matrix = transition_matrix[closed_class][:, closed_class]
+
+        if self._scheme == "Arnoldi":
+            return combine_class_distributions(number_of_states, closed_classes,
+                                               [self.arnoldi_iteration(transition_matrix, state_distribution)], [1])
+
+        A, b = self.normalized_system(transition_matrix)
+        M = self.ilu_preconditioner(A)
+        predecessor_state_distribution = np.zeros(len(state_distribution))
+        x = state_distribution / state_distribution[-1] if state_distribution[-1] != 0 else b.copy()
+
+        step = 0
+        norm = self.norm(state_distribution, predecessor_state_distribution)
+        while (simulation_steps == 0 and norm > self.get_calculation_precision()) or \
+                (simulation_steps != 0 and step < simulation_steps):
+            if simulation_steps == 0:
+                self.check_iterations(step, norm)
+            step += 1
+            try:
+                self.notify_calculation_listeners(step, norm)
+            except:
+                raise InterruptedError
+            x = self._cycle(A, b, x, M)
+            predecessor_state_distribution = state_distribution
+            state_distribution = x / np.sum(x)
+            norm = self.norm(state_distribution, predecessor_state_distribution)
+        try:
+            self.notify_calculation_listeners(step, norm)
+        except:
+            raise InterruptedError
+        return combine_class_distributions(number_of_states, closed_classes, [state_distribution], [1])
+
+    def normalized_system(self, transition_matrix):
+        """
+        Method to set up the linear system (I-P)^T x = e_n with the last equation replaced by x_n = 1
+        :param transition_matrix: transition matrix in compressed sparse row format
+        :return: system matrix and right hand side
+        """
+        n = transition_matrix.shape[0]
+        keep = np.ones(n)
+        keep[-1] = 0
+        A = scipy.sparse.diags(keep).dot((scipy.sparse.identity(n) - transition_matrix).transpose()) + \
+            scipy.sparse.csr_matrix(([1.0], ([n - 1], [n - 1])), shape=(n, n))
+        A = A.tocsr()
+        A.eliminate_zeros()
+        b = np.zeros(n)
+        b[-1] = 1
+        return A, b
+
+    def ilu_preconditioner(self, A):
+        """
+        Method to create an incomplete LU preconditioner, falls back to no preconditioning if the
+        incomplete factors are singular
+        :param A: system matrix
+        :return: preconditioner or None
+        """
+        try:
+            ilu = scipy.sparse.linalg.spilu(A.tocsc(), drop_tol=1e-6, fill_factor=5)
+        except RuntimeError:
+            return None
+        return scipy.sparse.linalg.LinearOperator(A.shape, ilu.solve)
+
+    def _cycle(self, A, b, x, M):
+        """
+        Performs one restart cycle of the selected Krylov solver
+        :param A: system matrix
+        :param b: right hand side
+        :param x: current iterate
+        :param M: preconditioner
+        :return: successor iterate
+        """
+        precision = self.get_calculation_precision()
+        if self._scheme == "BiCGSTAB":
+            x, info = scipy.sparse.linalg.bicgstab(A, b, x0=x, rtol=precision, atol=0.0,
+                                                   maxiter=self._cycle_length, M=M)
+        else:
+            x, info = scipy.sparse.linalg.gmres(A, b, x0=x, rtol=precision, atol=0.0,
+                                                restart=self._cycle_length, maxiter=1, M=M)
+        # info > 0 only reports that the precision has not been reached within the cycle
+        if info < 0 or not np.all(np.isfinite(x)):
+            raise ArithmeticError("{scheme} broke down, the system is singular or ill-conditioned"
+                                  .format(scheme=self._scheme))
+        return x
+
+    def arnoldi_iteration(self, transition_matrix, state_distribution):
+        """
+        Method to calculate the stationary state distribution as dominant left eigenvector with the implicitly
+        restarted Arnoldi method. A periodic class with period d has d eigenvalues of modulus 1, so the eigenvector
+        is calculated for the lazy chain (I+P)/2, whose only eigenvalue of modulus 1 is 1 and which has the same
+        stationary state distribution.
+        :param transition_matrix: transition matrix of the closed class in compressed sparse row format
+        :param state_distribution: initial state distribution used as start vector
+        :return: stationary state distribution
+        """
+        try:
+            self.notify_calculation_listeners(0)
+        except:
+            raise InterruptedError
+        lazy_transition_matrix = (scipy.sparse.identity(transition_matrix.shape[0], format="csr") +
+                                  transition_matrix) / 2
+        if transition_matrix.shape[0] < 3:
+            values, vectors = np.linalg.eig(lazy_transition_matrix.toarray().T)
+        else:
+            values, vectors = scipy.sparse.linalg.eigs(lazy_transition_matrix.transpose(), k=1, which="LM",
+                                                       v0=state_distribution + 1.0 / len(state_distribution),
+                                                       tol=self.get_calculation_precision())
+        # the Perron vector is determined up to a complex factor, its entries share one phase
+        x = np.abs(np.real(vectors[:, np.argmax(np.real(values))]))
+        x /= np.sum(x)
+        norm = self.norm(x, self.vector_matrix_product(x, transition_matrix))
+        try:
+            self.notify_calculation_listeners(1, norm)
+        except:
+            raise InterruptedError
+        if norm > self.get_calculation_precision():
+            raise ArithmeticError("Arnoldi has not reached the calculation precision, the residual is {norm:.3e}"
+                                  .format(norm=norm))
+        return x
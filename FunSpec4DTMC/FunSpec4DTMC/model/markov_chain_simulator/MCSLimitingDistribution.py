@@ -31,53 +31,22 @@ class MCSLimitingDistribution(MarkovChainSimulator):
 
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
         """
-        Method for calculating the stationary state distribution
+        Method for calculating the stationary state distribution as a batch with a single row
         :param simulation_steps: number of iteration steps
         :param alpha: value used for the alpha relaxation
         :param specified_period: specified value for period
         :return stationary state distribution
         """
-        state_distribution = self.get_markov_chain().get_initial_state_vector()[:]
-        predecessor_state_distribution = np.zeros(len(state_distribution))
+        return self.calculate_state_distributions(self.get_start_vector(), simulation_steps, alpha)[0]
 
-        if simulation_steps == 0:
-            step = 0
-            norm = self.norm(state_distribution, predecessor_state_distribution)
-            while norm > self.get_calculation_precision():
-                step += 1
-                try:
-                    self.notify_calculation_listeners(step, norm)
-                except:
-                    raise InterruptedError
-                predecessor_state_distribution = state_distribution
-                state_distribution = alpha * self._transition(state_distribution) + \
-                                                (1 - alpha) * state_distribution
-                state_distribution /= sum(state_distribution)
-                norm = self.norm(state_distribution, predecessor_state_distribution)
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
-        else:
-            step = 0
-            for step in range(1, simulation_steps):
-                self.notify_calculation_listeners(step)
-                state_distribution = alpha * self._transition(state_distribution) + \
-                                                (1 - alpha) * state_distribution
-                state_distribution /= sum(state_distribution)
-            norm = self.norm(state_distribution, predecessor_state_distribution)
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
-        return state_distribution
-
-    def _transition(self, state_distribution):
+    def calculate_subsequent_state_distributions(self, state_distributions: np.ndarray, step: int, alpha: float = 1):
         """
-        Calculates state distribution after a single transition step
-        state distribution after transition i:
-        x_{i+1} =  x_i * P
-        :param state_distribution: current state distribution
-        :return: successor state distribution
+        Calculates the state distributions after a single transition step
+        x_{i+1} = alpha x_i P + (1 - alpha) x_i
+        :param state_distributions: current state distributions as rows
+        :param step: current step
+        :param alpha: value used for the alpha relaxation
+        :return: successor state distributions
         """
-        return np.dot(state_distribution, self._markov_chain.get_transition_matrix())
+        return alpha * self.matrix_product(state_distributions, self.get_markov_chain().get_transition_matrix()) + \
+            (1 - alpha) * state_distributions
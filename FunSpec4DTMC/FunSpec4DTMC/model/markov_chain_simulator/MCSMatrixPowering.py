@@ -14,79 +14,189 @@
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import numpy as np
+import scipy.sparse
 from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
 import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
 
 
 class MCSMatrixPowering(MarkovChainSimulator):
-    def __init__(self, markov_chain: MarkovChain = None, identification: str = None):
+    def __init__(self, markov_chain: MarkovChain = None, identification: str = None, sparseMode=False,
+                 drop_tolerance: float = 0.0, density_threshold: float = 0.25):
         """
         Constructor MCSMatrixPowering
         :param: markov_chain: MarkovChainConventionalApproach
         :param: get_identification: str
+        :param sparseMode: selection of sparse matrix products
+        :param drop_tolerance: entries of the powers below this value are dropped in the sparse mode
+        :param density_threshold: fraction of nonzero entries from which the powers are continued densely
         """
         MarkovChainSimulator.__init__(self, markov_chain, identification)
         self._type = "MCSMatrixPowering"
+        self.sparseMode = sparseMode
+        self._drop_tolerance = drop_tolerance
+        self._density_threshold = density_threshold
+        self._limit_matrix = None
+
+    def enableSparseMode(self, enabled):
+        """
+        Method to enable sparse matrix products
+        :param enabled: sparse mode selection
+        """
+        self.sparseMode = enabled
+
+    def set_drop_tolerance(self, drop_tolerance: float):
+        """
+        Setter method of the drop tolerance of the sparse mode
+        :param drop_tolerance: entries of the powers below this value are dropped
+        """
+        self._drop_tolerance = drop_tolerance
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, self.sparseMode, self._drop_tolerance)
+
+    def get_limit_matrix(self):
+        """
+        Getter method of the limit matrix of the last calculation
+        :return: limit matrix, dense or in compressed sparse row format
+        """
+        return self._limit_matrix
 
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha: float = 1, specified_period:int=1):
         """
-        Method for calculating the stationary state distribution
-        :param simulation_steps: number of iteration steps
-        :param alpha: value used for the alpha relaxation
+        Method for calculating the stationary state distribution x = x_0 P^(2^k)
+        :param simulation_steps: number of squaring steps k, every step is one squaring, so the result uses 2^k
+        transitions, 0 to square until the calculation precision is reached
+        :param alpha: weight of the square in P_{k+1} = alpha P_k^2 + (1 - alpha) P_k
         :param specified_period: specified value for period
         :return stationary state distribution
         """
-        state_distribution = self.get_markov_chain().get_initial_state_vector()[:]
-        transition_matrix = self.get_markov_chain().get_transition_matrix().copy()
-        predecessor_state_distribution = np.zeros(len(state_distribution))
-        if simulation_steps == 0:
-            step = 0
-            norm = self.norm(state_distribution, predecessor_state_distribution)
-            while norm > self.get_calculation_precision():
-                step += 1
-                try:
-                    self.notify_calculation_listeners(step, norm)
-                except:
-                    raise InterruptedError
-                predecessor_state_distribution = state_distribution
-                transition_matrix = self._transition(transition_matrix)
-                state_distribution = transition_matrix[0]
-                state_distribution = alpha * state_distribution + \
-                                     (1 - alpha) * predecessor_state_distribution
-                state_distribution /= sum(state_distribution)
-                norm = self.norm(state_distribution, predecessor_state_distribution)
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
+        state_distribution = self.calculate_state_distributions(
+            np.atleast_2d(np.asarray(self.get_markov_chain().get_initial_state_vector(), dtype=float)),
+            simulation_steps, alpha, specified_period)[0]
+        return state_distribution / np.sum(state_distribution)
+
+    def calculate_state_distributions(self, initial_state_vectors: np.ndarray, simulation_steps: int = 0,
+                                      alpha: float = 1, specified_period: int = 1):
+        """
+        Method for calculating the limiting distributions of several initial state vectors with a single
+        limit matrix
+        :param initial_state_vectors: k x n matrix with one initial state vector per row
+        :param simulation_steps: number of squaring steps, every step is one squaring, 0 to iterate until the
+        calculation precision is reached
+        :param alpha: weight of the square in P_{k+1} = alpha P_k^2 + (1 - alpha) P_k
+        :param specified_period: not used, periodic chains are handled by squaring the lazy chain
+        :return: k x n matrix with one limiting distribution per row
+        """
+        limit_matrix = self.calculate_limit_matrix(simulation_steps, alpha)
+        initial_state_vectors = np.atleast_2d(np.asarray(initial_state_vectors, dtype=float))
+        if scipy.sparse.issparse(limit_matrix):
+            return np.asarray(limit_matrix.transpose().dot(initial_state_vectors.T)).T
+        return initial_state_vectors.dot(limit_matrix)
+
+    def calculate_limit_matrix(self, simulation_steps: int = 0, alpha: float = 1):
+        """
+        Method for calculating the limit matrix by repeated squaring
+        P_{k+1} = alpha P_k^2 + (1 - alpha) P_k
+        The rows of every power are renormalized. The calculation stops as soon as all rows of P_k agree up to the
+        calculation precision or no row changes any more, the latter also covers reducible chains.
+        The powers of a periodic chain cycle and never converge, so the lazy chain (I + P) / 2 is squared instead.
+        Its powers converge to the Cesaro limit of the powers of P, which is the limit matrix of every chain.
+        Without a number of steps, the squaring is stopped after the maximum number of iterations.
+        :param simulation_steps: number of squaring steps, every step is one squaring, 0 to iterate until the
+        calculation precision is reached
+        :param alpha: weight of the square in P_{k+1} = alpha P_k^2 + (1 - alpha) P_k
+        :return: limit matrix, dense or in compressed sparse row format
+        """
+        transition_matrix = self.get_markov_chain().get_transition_matrix()
+        if self.sparseMode:
+            transition_matrix = scipy.sparse.csr_matrix(transition_matrix, dtype=float)
+        elif scipy.sparse.issparse(transition_matrix):
+            transition_matrix = transition_matrix.toarray()
         else:
-            step = 0
-            for step in range(1, simulation_steps):
-                try:
-                    self.notify_calculation_listeners(step)
-                except:
-                    raise InterruptedError
-                predecessor_state_distribution = state_distribution
-                transition_matrix = self._transition(transition_matrix)
-                state_distribution = transition_matrix[0]
-                state_distribution = alpha * state_distribution + \
-                                     (1 - alpha) * predecessor_state_distribution
-                state_distribution\
-                    /= np.sum(state_distribution)
-            norm = self.norm(state_distribution, predecessor_state_distribution)
+            transition_matrix = np.array(transition_matrix, dtype=float)
+        if self.calculate_mc_period() > 1:
+            identity = scipy.sparse.identity(transition_matrix.shape[0], format="csr") \
+                if scipy.sparse.issparse(transition_matrix) else np.eye(transition_matrix.shape[0])
+            transition_matrix = (identity + transition_matrix) / 2
+        predecessor_transition_matrix = None
+        step = 0
+        norm = np.inf
+        while (simulation_steps == 0 and norm > self.get_calculation_precision()) or \
+                (simulation_steps != 0 and step < simulation_steps):
+            if simulation_steps == 0:
+                self.check_iterations(step, norm)
+            step += 1
             try:
-                self.notify_calculation_listeners(step, norm)
+                self.notify_calculation_listeners(step, None if np.isinf(norm) else norm)
             except:
                 raise InterruptedError
-        return state_distribution
+            predecessor_transition_matrix = transition_matrix
+            transition_matrix = self._transition(transition_matrix)
+            if alpha != 1:
+                transition_matrix = alpha * transition_matrix + (1 - alpha) * predecessor_transition_matrix
+            norm = min(self.row_deviation(transition_matrix),
+                       self.matrix_norm(transition_matrix, predecessor_transition_matrix))
+        try:
+            self.notify_calculation_listeners(step, norm)
+        except:
+            raise InterruptedError
+        self._limit_matrix = transition_matrix
+        return transition_matrix
 
     def _transition(self, transition_matrix):
         """
-        Method for calculating the successor state distribution
-        :param cesaro_sum: current state distribution
-        :return: successor state distribution
+        Method for calculating the square of the current power of the transition matrix
+        :param transition_matrix: current power of the transition matrix
+        :return: squared and renormalized power
         """
-        transition_matrix = np.dot(transition_matrix, transition_matrix)
-        for index in range(len(transition_matrix)):
-            transition_matrix[index] = transition_matrix[index]/sum(transition_matrix[index])
-        return transition_matrix
+        if scipy.sparse.issparse(transition_matrix):
+            transition_matrix = transition_matrix.dot(transition_matrix).tocsr()
+            if self._drop_tolerance > 0:
+                transition_matrix.data[transition_matrix.data < self._drop_tolerance] = 0
+                transition_matrix.eliminate_zeros()
+            transition_matrix = self.normalize_rows(transition_matrix)
+            if transition_matrix.nnz > self._density_threshold * np.prod(transition_matrix.shape):
+                transition_matrix = transition_matrix.toarray()
+            return transition_matrix
+        return self.normalize_rows(np.dot(transition_matrix, transition_matrix))
+
+    @staticmethod
+    def normalize_rows(transition_matrix):
+        """
+        Method for normalizing all rows of a dense or sparse matrix to sum one
+        :param transition_matrix: matrix
+        :return: row stochastic matrix
+        """
+        row_sums = np.asarray(transition_matrix.sum(axis=1)).ravel()
+        row_sums[row_sums == 0] = 1
+        if scipy.sparse.issparse(transition_matrix):
+            return scipy.sparse.diags(1 / row_sums).dot(transition_matrix).tocsr()
+        return transition_matrix / row_sums[:, None]
+
+    @staticmethod
+    def row_deviation(transition_matrix):
+        """
+        Method for determining how far the rows of a matrix differ, zero if all rows are identical
+        :param transition_matrix: matrix
+        :return: max_j (max_i P_ij - min_i P_ij)
+        """
+        if scipy.sparse.issparse(transition_matrix):
+            return float(np.max(transition_matrix.max(axis=0).toarray() - transition_matrix.min(axis=0).toarray()))
+        return float(np.max(np.max(transition_matrix, axis=0) - np.min(transition_matrix, axis=0)))
+
+    @staticmethod
+    def matrix_norm(transition_matrix, predecessor_transition_matrix):
+        """
+        Method for determining the maximum entrywise deviation of two powers
+        :param transition_matrix: current power
+        :param predecessor_transition_matrix: predecessor power
+        :return: ||P_k - P_{k-1}||
+        """
+        difference = transition_matrix - predecessor_transition_matrix
+        if scipy.sparse.issparse(difference):
+            return float(abs(difference).max()) if difference.nnz else 0.0
+        return float(np.max(np.abs(difference)))
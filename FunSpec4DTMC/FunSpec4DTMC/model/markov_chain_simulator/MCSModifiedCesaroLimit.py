@@ -31,65 +31,32 @@ class MCSModifiedCesaroLimit(MarkovChainSimulator):
 
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period: int=1):
         """
-        Method for calculating the stationary state distribution
+        Method for calculating the stationary state distribution as a batch with a single row, the mean of the
+        last period state vectors
         :param simulation_steps: number of iteration steps
         :param alpha: value used for the alpha relaxation
         :param specified_period: specified value for period
         :return stationary state distribution
         """
-        step = 0
-        if (specified_period == 0) or (specified_period is None):
-            period = self.calculate_mc_period()
-        else:
-            period = specified_period
-        state_vector = self.get_markov_chain().get_initial_state_vector()[:]
-        n = len(state_vector)
-        x = []
-        norm = []
-        for i in range(period):
-            x.append(np.zeros(n))
-            norm.append(False)
-        index = 0
-
-
-        if simulation_steps == 0:
-            while False in norm:
-                step += 1
-                x[index] = state_vector
-                state_vector = self._transition(state_vector)
-                state_vector /= sum(state_vector)
-                index = (index + 1) % period
-                curr_norm = self.norm(state_vector, x[index])
-                norm[index] = curr_norm < self.get_calculation_precision()
-                try:
-                    self.notify_calculation_listeners(step, curr_norm)
-                except:
-                    raise InterruptedError
-        else:
-            step = 0
-            for step in range(1, simulation_steps):
-                self.notify_calculation_listeners(step)
-                x[index] = state_vector
-                state_vector = self._transition(state_vector)
-                state_vector /= sum(state_vector)
-                index = (index +1) % period
-                norm = self.norm(state_vector, x[index])
-            try:
-                self.notify_calculation_listeners(step, norm)
-            except:
-                raise InterruptedError
-
-        xs = np.zeros(n)
-        for index in range(period):
-            xs = xs + x[index] / period
+        return self.calculate_state_distributions(self.get_start_vector(), simulation_steps, alpha,
+                                                  specified_period)[0]
 
-        xs /= sum(xs)
-        return xs
+    def get_batch_period(self, specified_period: int = 1):
+        """
+        Method that returns the period the state vectors are averaged over
+        :param specified_period: specified value for period, 0 or None to use the period of the Markov chain
+        :return: period
+        """
+        if (specified_period == 0) or (specified_period is None):
+            return self.calculate_mc_period()
+        return specified_period
 
-    def _transition(self, state_vector):
+    def calculate_subsequent_state_distributions(self, state_vectors: np.ndarray, step: int, alpha: float = 1):
         """
-        Method for calculating the successor state distribution
-        :param cesaro_sum: current state distribution
-        :return: successor state distribution
+        Method for calculating the successor state distributions
+        :param state_vectors: current state distributions as rows
+        :param step: current step
+        :param alpha: not used
+        :return: successor state distributions
         """
-        return np.dot(state_vector, self.get_markov_chain().get_transition_matrix())
\ No newline at end of file
+        return self.matrix_product(state_vectors, self.get_markov_chain().get_transition_matrix())
@@ -0,0 +1,86 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import numpy as np
+import scipy.sparse
+from concurrent.futures import ProcessPoolExecutor
+from FunSpec4DTMC.model.markov_chain_simulator.MCSDecompositionApproach import MCSDecompositionApproach
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import solve_closed_class
+import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
+
+
+class MCSPeriodicApproach(MCSDecompositionApproach):
+
+    def __init__(self, markov_chain: MarkovChain = None, identification: str = None, parallel_threshold: int = 20000):
+        """
+        Constructor MCSPeriodicApproach
+        :param markov_chain: MarkovChainConventionalApproach
+        :param identification: designation of the simulator
+        :param parallel_threshold: number of recurrent states from which the closed classes are solved on a
+        process pool
+        """
+        MCSDecompositionApproach.__init__(self, markov_chain, identification, parallel_threshold)
+        self._type = "MCSPeriodicApproach"
+
+    def calculate_class_distributions(self, sub_matrices: list, class_periods: list):
+        """
+        Method for calculating the stationary state distributions of the closed classes. A closed class with
+        period p > 1 is reordered into its cyclic classes C_0, ..., C_{p-1} with blocks P_r = P[C_r, C_{r+1}].
+        Only the aperiodic chain P_0 P_1 ... P_{p-1} on the smallest cyclic class C_0 is solved, the distributions
+        of the other cyclic classes follow from x_{r+1} = x_r P_r. The class distribution is the Cesaro limit
+        (x_0, ..., x_{p-1}) / p.
+        :param sub_matrices: transition matrices of the closed classes
+        :param class_periods: periods of the closed classes
+        :return: list of stationary state distributions
+        """
+        structural_analysis = self.get_structural_analysis()
+        local_cyclic_classes = []
+        for closed_class, cyclic_classes in zip(structural_analysis.get_closed_classes(),
+                                                structural_analysis.get_cyclic_classes()):
+            position = {vertex: index for index, vertex in enumerate(closed_class.tolist())}
+            local_cyclic_classes.append([np.array([position[vertex] for vertex in cyclic_class.tolist()],
+                                                  dtype=np.intp) for cyclic_class in cyclic_classes])
+        if len(sub_matrices) > 1 and sum(sub_matrix.shape[0] for sub_matrix in sub_matrices) >= self._parallel_threshold:
+            with ProcessPoolExecutor(max_workers=min(len(sub_matrices), os.cpu_count() or 1)) as executor:
+                return list(executor.map(_solve_periodic_class, sub_matrices, class_periods, local_cyclic_classes))
+        return [_solve_periodic_class(sub_matrix, class_period, cyclic_classes)
+                for sub_matrix, class_period, cyclic_classes in
+                zip(sub_matrices, class_periods, local_cyclic_classes)]
+
+
+def _solve_periodic_class(sub_matrix, class_period: int, cyclic_classes: list):
+    """
+    Calculates the stationary state distribution of a closed class from its block-cyclic form
+    :param sub_matrix: transition matrix of the closed class
+    :param class_period: period of the class
+    :param cyclic_classes: index arrays of the cyclic classes in the order of the cycle
+    :return: stationary state distribution of the class
+    """
+    if class_period == 1:
+        return solve_closed_class(sub_matrix)
+    first = int(np.argmin([len(cyclic_class) for cyclic_class in cyclic_classes]))
+    cyclic_classes = cyclic_classes[first:] + cyclic_classes[:first]
+    sub_matrix = scipy.sparse.csr_matrix(sub_matrix)
+    blocks = [sub_matrix[cyclic_classes[r]][:, cyclic_classes[(r + 1) % class_period]]
+              for r in range(class_period)]
+    reduced_matrix = blocks[0]
+    for block in blocks[1:]:
+        reduced_matrix = reduced_matrix.dot(block)
+    x = solve_closed_class(reduced_matrix.tocsr())
+    state_distribution = np.zeros(sub_matrix.shape[0])
+    for r in range(class_period):
+        state_distribution[cyclic_classes[r]] = x
+        x = blocks[r].transpose().dot(x)
+    return state_distribution / class_period
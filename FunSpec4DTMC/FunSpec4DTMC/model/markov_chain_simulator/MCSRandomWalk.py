@@ -15,22 +15,43 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+import scipy.sparse
+import scipy.stats
 from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
 import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
 
 
 class MCSRandomWalk(MarkovChainSimulator):
 
-    def __init__(self, markov_chain: MarkovChain.MarkovChain = None, start_state = 0, identification: str=None):
+    def __init__(self, markov_chain: MarkovChain.MarkovChain = None, start_state = 0, identification: str=None,
+                 replications: int = 1, relative_ci_width: float = 0.05, confidence_level: float = 0.95,
+                 seed: int = None):
         """
         Constructor MCSMarkovChainSimulation
         :get_type markov_chain: MarkovChainConventionalApproach
         :get_type get_identification: str
+        :param replications: number of independent random walks, more than one enables the replicated mode
+        :param relative_ci_width: target relative width of the confidence intervals in the replicated mode
+        :param confidence_level: confidence level of the confidence intervals
+        :param seed: seed of the random number stream of the walk or the streams of the replications, None to use
+        the global numpy generator
         """
         MarkovChainSimulator.__init__(self, markov_chain, identification)
         self._type = "MCSRandomWalk"
         self._start_state = start_state
         self.randomWalk = None
+        self._batch_size = 65536
+        self._cumulative_rows = None
+        self._cumulative_rows_matrix = None
+        self._replications = replications
+        self._relative_ci_width = relative_ci_width
+        self._confidence_level = confidence_level
+        self._minimum_probability = 1e-3
+        self._seed = seed
+        self._random_generator = None
+        self._confidence_intervals = None
 
     def get_index_from_start_state(self, start_state):
         if self._markov_chain is not None:
@@ -43,14 +64,38 @@ class MCSRandomWalk(MarkovChainSimulator):
             return start_state
         else:
             return 0
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, str(self._start_state), self._replications, self._relative_ci_width,
+                self._confidence_level, self._seed)
+
+    def is_reproducible(self):
+        """
+        Method to check whether the random walks return the same result for the same key
+        :return: True if the random walks are seeded
+        """
+        return self._seed is not None
+
     def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
         """
-        Method for calculating the stationary state distribution
-        :param simulation_steps: number of iteration steps
+        Method for calculating the stationary state distribution as the relative visit frequencies of a random walk.
+        The visits are divided by the number of visited states in both modes, so the result sums up to 1.
+        Without a number of steps the norm compares the frequencies with and without the last visit, which is 1/n
+        after n visited states. It is evaluated after every batch, so the walk continues until 1/n is below the
+        calculation precision, i.e. for at least 1/precision steps.
+        :param simulation_steps: number of iteration steps, 0 to walk until the calculation precision is reached
         :param alpha: value used for the alpha relaxation
         :param specified_period: specified value for period
         :return stationary state distribution
         """
+        if self._replications > 1:
+            return self.calculate_replicated_stationary_state_distribution(simulation_steps)
+
+        self._reset_random_generator()
         current_state = self.get_index_from_start_state(self._start_state)
         state_distribution = np.array([0] * self._markov_chain.get_number_of_states(), dtype=float)
         state_distribution[current_state] = 1
@@ -60,27 +105,26 @@ class MCSRandomWalk(MarkovChainSimulator):
             step = 1
             norm = self.norm(state_distribution / step,  predecessor_state_distribution / step)
             while norm > self.get_calculation_precision() or step < 10:
-                step += 1
                 try:
                     self.notify_calculation_listeners(step, norm)
                 except:
                     raise InterruptedError
+                passed_states, current_state = self._walk(current_state, self._batch_size)
+                state_distribution += np.bincount(passed_states, minlength=len(state_distribution))
+                step += len(passed_states)
                 predecessor_state_distribution = state_distribution.copy()
-                current_state = self._transition(current_state)
-                state_distribution[current_state] += 1
+                predecessor_state_distribution[current_state] -= 1
                 norm = self.norm(state_distribution / step, predecessor_state_distribution / step)
+            state_distribution /= step
             try:
                 self.notify_calculation_listeners(step, norm)
             except:
                 raise InterruptedError
         else:
-            for step in range(simulation_steps):
-                state_distribution[current_state] += 1
-                current_state = self._transition(current_state)
-            for state in range(len(state_distribution)):
-                state_distribution[state] /= simulation_steps
+            passed_states = self._simulate_random_walk(simulation_steps)
+            state_distribution = np.bincount(passed_states, minlength=len(state_distribution)) / simulation_steps
             try:
-                self.notify_calculation_listeners(step)
+                self.notify_calculation_listeners(simulation_steps - 1)
             except:
                 raise InterruptedError
         return state_distribution
@@ -88,25 +132,150 @@ class MCSRandomWalk(MarkovChainSimulator):
 
 
 
+    def calculate_replicated_stationary_state_distribution(self, simulation_steps: int):
+        """
+        Method for calculating the stationary state distribution with independent random walks.
+        Every replication has its own random number stream and the replications advance in rounds of
+        batch_size steps on a process pool. The visit counts of all replications are merged, the confidence
+        intervals follow from the variance between the replications. Without a number of steps, the rounds
+        continue until the relative width of the confidence interval of every state with an estimated probability
+        of at least minimum_probability is below relative_ci_width.
+        :param simulation_steps: number of steps of every replication, 0 to use the confidence interval criterion
+        :return: stationary state distribution
+        """
+        start_state = self.get_index_from_start_state(self._start_state)
+        number_of_states = self._markov_chain.get_number_of_states()
+        random_generators = [np.random.default_rng(seed_sequence)
+                             for seed_sequence in np.random.SeedSequence(self._seed).spawn(self._replications)]
+        current_states = [start_state] * self._replications
+        counts = np.zeros((self._replications, number_of_states))
+        counts[:, start_state] = 1
+        step = 1
+        width = np.inf
+
+        with ProcessPoolExecutor(initializer=_initialize_replication,
+                                 initargs=(self.get_cumulative_rows(),)) as executor:
+            try:
+                while (simulation_steps == 0 and width > self._relative_ci_width) or \
+                        (simulation_steps != 0 and step < simulation_steps):
+                    try:
+                        self.notify_calculation_listeners(step, width)
+                    except:
+                        raise InterruptedError
+                    steps = self._batch_size if simulation_steps == 0 else \
+                        min(self._batch_size, simulation_steps - step)
+                    results = list(executor.map(_replicate, current_states, [steps] * self._replications,
+                                                random_generators))
+                    for replication, (visits, current_state, random_generator) in enumerate(results):
+                        counts[replication] += np.bincount(visits, minlength=number_of_states)
+                        current_states[replication] = current_state
+                        random_generators[replication] = random_generator
+                    step += steps
+                    width = self.calculate_confidence_intervals(counts / step)
+            except InterruptedError:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        try:
+            self.notify_calculation_listeners(step, width)
+        except:
+            raise InterruptedError
+        return np.sum(counts, axis=0) / np.sum(counts)
+
+    def calculate_confidence_intervals(self, replicated_distributions: np.ndarray):
+        """
+        Calculates the confidence intervals of the state probabilities from the state distributions of the
+        replications with the student t distribution
+        :param replicated_distributions: state distributions of the replications, one per row
+        :return: largest relative width of the confidence intervals of the states above minimum_probability
+        """
+        replications = len(replicated_distributions)
+        mean = np.mean(replicated_distributions, axis=0)
+        half_width = scipy.stats.t.ppf((1 + self._confidence_level) / 2, replications - 1) * \
+            np.std(replicated_distributions, axis=0, ddof=1) / np.sqrt(replications)
+        self._confidence_intervals = (mean - half_width, mean + half_width)
+        relevant_states = mean >= self._minimum_probability
+        if not np.any(relevant_states):
+            return np.inf
+        return np.max(2 * half_width[relevant_states] / mean[relevant_states])
+
+    def get_confidence_intervals(self):
+        """
+        Returns the confidence intervals of the last replicated calculation
+        :return: lower and upper bounds of the state probabilities
+        """
+        return self._confidence_intervals
+
+    def set_replications(self, replications: int, relative_ci_width: float = 0.05):
+        """
+        Sets the number of independent random walks and the target relative width of the confidence intervals
+        :param replications: number of independent random walks
+        :param relative_ci_width: target relative width of the confidence intervals
+        """
+        self._replications = replications
+        self._relative_ci_width = relative_ci_width
+
     def _simulate_random_walk(self, simulation_steps: int) -> list:
         """
         Returns list of simulated steps
         :param simulation_steps: iteration steps
         :return: list of simulated steps
         """
-
+        self._reset_random_generator()
         resent_state = self.get_index_from_start_state(self._start_state)
 
         passed_states = [resent_state]
-        for i in range(1, simulation_steps):
-            resent_state = self._transition(resent_state)
-            passed_states.append(resent_state)
+        while len(passed_states) < simulation_steps:
+            steps, resent_state = self._walk(resent_state, min(self._batch_size, simulation_steps - len(passed_states)))
+            passed_states.extend(steps)
             try:
                 self.notify_calculation_listeners("", "")
             except:
                 raise InterruptedError
         return passed_states
 
+    def get_cumulative_rows(self):
+        """
+        Returns the cumulative transition rows, they are calculated once per transition matrix
+        :return: row pointers, successor states and cumulative transition probabilities
+        """
+        transition_matrix = self._markov_chain.get_transition_matrix()
+        if self._cumulative_rows is None or self._cumulative_rows_matrix is not transition_matrix:
+            self._cumulative_rows = self.calculate_cumulative_rows(transition_matrix)
+            self._cumulative_rows_matrix = transition_matrix
+        return self._cumulative_rows
+
+    def calculate_cumulative_rows(self, transition_matrix):
+        """
+        Calculates the cumulative sums of the non-zero transition probabilities of every row.
+        Row i is stored in the positions indptr[i] to indptr[i + 1] of the returned lists.
+        :param transition_matrix: dense or sparse transition matrix
+        :return: row pointers, successor states and cumulative transition probabilities
+        """
+        transition_matrix = scipy.sparse.csr_matrix(transition_matrix, copy=True)
+        transition_matrix.eliminate_zeros()
+        transition_matrix.sort_indices()
+        indptr = transition_matrix.indptr
+        cumulative_probabilities = np.cumsum(transition_matrix.data)
+        row_offsets = np.concatenate(([0.0], cumulative_probabilities))[indptr[:-1]]
+        cumulative_probabilities -= np.repeat(row_offsets, np.diff(indptr))
+        return indptr.tolist(), transition_matrix.indices.tolist(), cumulative_probabilities.tolist()
+
+    def _walk(self, resent_state: int, simulation_steps: int):
+        """
+        Simulates a number of transition steps with a batch of random numbers
+            x_n = i
+            x_{n+1} = min{k: sum_{j=0}^k pij >= U)
+        :param resent_state: State
+        :param simulation_steps: number of transitions
+        :return: list of subsequent states and the last state
+        """
+        return _walk(self.get_cumulative_rows(), resent_state, simulation_steps, self._random_generator)
+
+    def _reset_random_generator(self):
+        """
+        Restarts the random number stream of a seeded walk, so every calculation with the seed walks the same path
+        """
+        self._random_generator = None if self._seed is None else np.random.default_rng(self._seed)
 
     def _transition(self, resent_state: int):
         """
@@ -117,15 +286,7 @@ class MCSRandomWalk(MarkovChainSimulator):
         :param resent_state: State
         :return: subsequent state: State
         """
-        u = _get_random_number()
-        transition_probabilities = self._markov_chain.get_transition_matrix()[resent_state, :].tolist()
-
-        sum_of_first = 0
-        subsequent_state = -1
-        while sum_of_first < u:
-            sum_of_first += transition_probabilities.pop(0)
-            subsequent_state += 1
-        return subsequent_state
+        return self._walk(resent_state, 1)[1]
 
 #######################################################################################################################
 #                                                                                                                     #
@@ -133,20 +294,32 @@ class MCSRandomWalk(MarkovChainSimulator):
 #                                                                                                                     #
 #######################################################################################################################
 
-    def plot_random_walk(self, simulation_steps):
+    def simulate_random_walk(self, simulation_steps: int) -> list:
+        """
+        Method for simulating the random walk that is shown by the random walk plots
+        :param simulation_steps: iteration steps
+        :return: list of passed states
+        """
+        passed_states = self._simulate_random_walk(max(simulation_steps, 1))
+        try:
+            self.notify_calculation_listeners(len(passed_states))
+        except:
+            raise InterruptedError
+        return passed_states
+
+    def plot_random_walk(self, simulation_steps, passed_states: list = None):
         """
         Method for generating a plot of a possible random walk
         :param simulation_steps: iteration steps
+        :param passed_states: already simulated random walk, None to simulate it
         :return: figure: plot of the random walk
         """
-        simulation_steps = max(simulation_steps, 1)
+        if passed_states is None:
+            passed_states = self.simulate_random_walk(simulation_steps)
         figure = plt.figure()
         ax = plt.subplot()
-        try:
-            x_values = range(simulation_steps)
-            y_values = self._simulate_random_walk(simulation_steps)
-        except:
-            raise InterruptedError
+        x_values = range(len(passed_states))
+        y_values = passed_states
         ax.plot(x_values, y_values, "x-")
         plt.xlabel("Steps")
         plt.ylabel('State')
@@ -157,26 +330,20 @@ class MCSRandomWalk(MarkovChainSimulator):
             ax.set_yticks(self._markov_chain.get_states())
         return figure
 
-    def plot_evolution_of_state_probabilities(self, simulation_steps: int):
+    def plot_evolution_of_state_probabilities(self, simulation_steps: int, passed_states: list = None):
         """
         Method for generating a plot of of the state probabilities over time
         :param simulation_steps: iteration steps
+        :param passed_states: already simulated random walk, None to simulate it
         :return: figure: plot of the state probability evolution
         """
-        simulation_steps = max(simulation_steps, 1)
+        if passed_states is None:
+            passed_states = self.simulate_random_walk(simulation_steps)
         figure = plt.figure()
-        try:
-            passed_states = self._simulate_random_walk(simulation_steps)
-            states = self._markov_chain.get_number_of_states()
-        except:
-            raise InterruptedError
-        probability = [[] for states in range(0, states)]
-        for step in range(1, simulation_steps + 1):
-            resent_states = passed_states[0:step]
-
-            for state in range(0, states):
-                probability[state].append(resent_states.count(state) / step)
-        x = range(1, simulation_steps + 1)
+        states = self._markov_chain.get_number_of_states()
+        passed_states = np.array(passed_states)
+        x = range(1, len(passed_states) + 1)
+        probability = [np.cumsum(passed_states == state) / x for state in range(0, states)]
 
         ax = plt.subplot()
         for state in range(0, states):
@@ -188,23 +355,18 @@ class MCSRandomWalk(MarkovChainSimulator):
 
         return figure
 
-    def plot_evolution_of_state_average(self, simulation_steps: int):
+    def plot_evolution_of_state_average(self, simulation_steps: int, passed_states: list = None):
         """
         Method for generating a plot of of the evolution of the average state over time
         :param simulation_steps: iteration steps
+        :param passed_states: already simulated random walk, None to simulate it
         :return: figure: plot of the evolution of the average state
         """
-        simulation_steps = max(simulation_steps, 1)
+        if passed_states is None:
+            passed_states = self.simulate_random_walk(simulation_steps)
         figure = plt.figure()
-        average_state_distributions = []
-        try:
-            passed_states = self._simulate_random_walk(simulation_steps)
-            for steps in range(1, simulation_steps + 1):
-                self.notify_calculation_listeners(steps)
-                average_state_distributions.append(np.mean(passed_states[0:steps]))
-        except:
-            raise InterruptedError
-        x = range(1, simulation_steps + 1)
+        average_state_distributions = np.cumsum(passed_states) / np.arange(1, len(passed_states) + 1)
+        x = range(1, len(passed_states) + 1)
         plt.plot(x, passed_states, "x", label='State')
         plt.plot(x, average_state_distributions, ".-", label='Average state', color='red')
         plt.legend(loc='upper right', fontsize='x-large')
@@ -215,12 +377,60 @@ class MCSRandomWalk(MarkovChainSimulator):
         return figure
 
 
-def _get_random_number():
+def _walk(cumulative_rows, resent_state: int, simulation_steps: int, random_generator=None):
+    """
+    Simulates a number of transition steps with a batch of random numbers
+    :param cumulative_rows: row pointers, successor states and cumulative transition probabilities
+    :param resent_state: State
+    :param simulation_steps: number of transitions
+    :param random_generator: random number generator, the global numpy generator is used if None
+    :return: list of subsequent states and the last state
+    """
+    indptr, successors, cumulative_probabilities = cumulative_rows
+    passed_states = []
+    for u in _get_random_numbers(simulation_steps, random_generator).tolist():
+        start = indptr[resent_state]
+        end = indptr[resent_state + 1]
+        index = bisect_left(cumulative_probabilities, u, start, end)
+        if index == end:
+            index = end - 1
+        resent_state = successors[index]
+        passed_states.append(resent_state)
+    return passed_states, resent_state
+
+
+_replication_cumulative_rows = None
+
+
+def _initialize_replication(cumulative_rows):
+    """
+    Stores the cumulative transition rows once per worker process of a replicated random walk
+    :param cumulative_rows: row pointers, successor states and cumulative transition probabilities
+    """
+    global _replication_cumulative_rows
+    _replication_cumulative_rows = cumulative_rows
+
+
+def _replicate(resent_state: int, simulation_steps: int, random_generator):
+    """
+    Continues a single replication of a replicated random walk
+    :param resent_state: State
+    :param simulation_steps: number of transitions
+    :param random_generator: random number generator of the replication
+    :return: subsequent states, last state and the advanced random number generator
+    """
+    passed_states, resent_state = _walk(_replication_cumulative_rows, resent_state, simulation_steps,
+                                        random_generator)
+    return passed_states, resent_state, random_generator
+
+
+def _get_random_numbers(size: int, random_generator=None):
     """
-    Calculates a U(0,1) random number
-    :return: u: float
+    Calculates a batch of U(0,1] random numbers
+    :param size: number of random numbers
+    :param random_generator: random number generator, the global numpy generator is used if None
+    :return: u: np.ndarray
     """
-    u = np.random.uniform()
-    if u == 0:
-        u = _get_random_number()
-    return u
+    if random_generator is None:
+        return 1.0 - np.random.random_sample(size)
+    return 1.0 - random_generator.random(size)
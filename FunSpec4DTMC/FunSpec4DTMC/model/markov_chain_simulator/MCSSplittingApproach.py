@@ -0,0 +1,167 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import combine_class_distributions
+import FunSpec4DTMC.model.markov_chain.MarkovChain as MarkovChain
+
+
+class MCSSplittingApproach(MarkovChainSimulator):
+
+    def __init__(self, scheme="Gauss-Seidel", markov_chain: MarkovChain = None, identification: str = None,
+                 damping: float = 0.5):
+        """
+        Constructor MCSSplittingApproach
+        :param scheme: "Jacobi", "Gauss-Seidel" or "SOR"
+        :param markov_chain: MarkovChainConventionalApproach
+        :param identification: designation of the simulator
+        :param damping: damping factor of the Jacobi scheme, 1 for the undamped iteration
+        """
+        MarkovChainSimulator.__init__(self, markov_chain, identification)
+        self._type = "MCSSplittingApproach"
+        self._scheme = scheme
+        self._damping = damping
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results
+        :return: tuple
+        """
+        return (self._type, self._scheme, self._damping)
+
+    def set_damping(self, damping: float):
+        """
+        Setter method of the damping factor of the Jacobi scheme
+        :param damping: damping factor, 1 for the undamped iteration
+        """
+        self._damping = damping
+
+    def get_damping(self):
+        """
+        Getter method of the damping factor of the Jacobi scheme
+        :return: damping factor
+        """
+        return self._damping
+
+    def calculate_stationary_state_distribution(self, simulation_steps: int, alpha=1, specified_period:int=1):
+        """
+        Method for calculating the stationary state distribution.
+        The matrix (I-P)^T = D + L + U is split into its diagonal, strictly lower and strictly upper part.
+        Jacobi:       D x_{i+1} = ((1 - w) D - w (L + U)) x_i with w = damping * alpha
+        Gauss-Seidel: (D + L) x_{i+1} = -U x_i
+        SOR:          (D + alpha L) x_{i+1} = ((1 - alpha) D - alpha U) x_i
+        The undamped Jacobi iteration oscillates if its iteration matrix has the eigenvalue -1, e.g. on a chain
+        that alternates between two groups of states; the default damping of 0.5 moves every other eigenvalue
+        into the unit disk.
+        The sweeps are performed on the closed class of the chain, transient states have probability 0. Chains with
+        several closed classes have no unique stationary state distribution and are rejected, they are solved by
+        the decomposition approach. The iteration starts from the warm start vector or the uniform distribution,
+        since a point mass can be annihilated by the first sweep.
+        :param simulation_steps: number of iteration steps, 0 to iterate until the calculation precision is reached
+        or the maximum number of iterations is exceeded
+        :param alpha: relaxation parameter of the Jacobi and SOR scheme
+        :param specified_period: specified value for period
+        :return stationary state distribution
+        """
+        transition_matrix = scipy.sparse.csr_matrix(self.get_markov_chain().get_transition_matrix())
+        number_of_states = transition_matrix.shape[0]
+        closed_classes = self.get_structural_analysis().get_closed_classes()
+        if len(closed_classes) != 1:
+            raise ValueError("The splitting approach requires a single closed class, "
+                             "use the decomposition approach for reducible chains")
+        closed_class = closed_classes[0]
+        if len(closed_class) == 1:
+            return combine_class_distributions(number_of_states, closed_classes, [np.ones(1)], [1])
+        if len(closed_class) < number_of_states:
+            transition_matrix = transition_matrix[closed_class][:, closed_class]
+
+        if self._scheme == "Gauss-Seidel":
+            alpha = 1
+        elif self._scheme == "Jacobi":
+            alpha = self._damping * alpha
+        (D, L, U) = self.splitting(transition_matrix)
+        if self._scheme == "Jacobi":
+            R = scipy.sparse.diags((1 - alpha) * D) - alpha * (L + U)
+        else:
+            R = scipy.sparse.diags((1 - alpha) * D) - alpha * U
+            L = (scipy.sparse.diags(D) + alpha * L).tocsr()
+        R = R.tocsr()
+
+        state_distribution = self.get_warm_start_vector()
+        if state_distribution is None or not np.any(state_distribution[closed_class]):
+            state_distribution = np.full(len(closed_class), 1.0 / len(closed_class))
+        else:
+            state_distribution = state_distribution[closed_class] / np.sum(state_distribution[closed_class])
+        predecessor_state_distribution = np.zeros(len(state_distribution))
+
+        if simulation_steps == 0:
+            step = 0
+            norm = self.norm(state_distribution, predecessor_state_distribution)
+            while norm > self.get_calculation_precision():
+                self.check_iterations(step, norm)
+                step += 1
+                try:
+                    self.notify_calculation_listeners(step, norm)
+                except:
+                    raise InterruptedError
+                predecessor_state_distribution = state_distribution
+                state_distribution = self._sweep(state_distribution, D, L, R)
+                norm = self.norm(state_distribution, predecessor_state_distribution)
+            try:
+                self.notify_calculation_listeners(step, norm)
+            except:
+                raise InterruptedError
+        else:
+            step = 0
+            for step in range(1, simulation_steps):
+                self.notify_calculation_listeners(step)
+                predecessor_state_distribution = state_distribution
+                state_distribution = self._sweep(state_distribution, D, L, R)
+            norm = self.norm(state_distribution, predecessor_state_distribution)
+            try:
+                self.notify_calculation_listeners(step, norm)
+            except:
+                raise InterruptedError
+        return combine_class_distributions(number_of_states, closed_classes, [state_distribution], [1])
+
+    def splitting(self, transition_matrix):
+        """
+        Method to split (I-P)^T into its diagonal, strictly lower and strictly upper triangular part
+        :param transition_matrix: transition matrix
+        :return: D: diagonal as vector
+        :return: L: strictly lower triangular matrix
+        :return: U: strictly upper triangular matrix
+        """
+        n = transition_matrix.shape[0]
+        Q = scipy.sparse.csr_matrix(scipy.sparse.identity(n) - scipy.sparse.csr_matrix(transition_matrix))
+        Q = Q.transpose().tocsr()
+        return Q.diagonal(), scipy.sparse.tril(Q, -1, format="csr"), scipy.sparse.triu(Q, 1, format="csr")
+
+    def _sweep(self, state_distribution, D, L, R):
+        """
+        Performs a single sweep of the selected splitting scheme
+        :param state_distribution: current state distribution
+        :param D: diagonal of (I-P)^T
+        :param L: lower triangular matrix of the splitting
+        :param R: right hand side matrix of the splitting
+        :return: normalized successor state distribution
+        """
+        if self._scheme == "Jacobi":
+            x = R.dot(state_distribution) / D
+        else:
+            x = scipy.sparse.linalg.spsolve_triangular(L, R.dot(state_distribution), lower=True)
+        return x / np.sum(x)
@@ -13,15 +13,17 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import copy
 import numpy as np
+import scipy.sparse
 import networkx as nx
 import matplotlib.pyplot as plt
-import importlib
 from FunSpec4DTMC.model.markov_chain.MarkovChainConventionalApproach import MarkovChainConventionalApproach
 from FunSpec4DTMC.model.markov_chain.MarkovChainForwardApproach import MarkovChainForwardApproach
+from FunSpec4DTMC.model.markov_chain.MarkovChainGraph import MarkovChainGraph
+from FunSpec4DTMC.model.markov_chain.StructuralAnalysis import StructuralAnalysis
 
 class MarkovChainSimulator(object):
-    global succ
     number_of_simulators = 0
 
     def __init__(self,
@@ -42,7 +44,13 @@ class MarkovChainSimulator(object):
 
         self._simulator_type = "markov_chain_simulator"
         self._calculation_precision = 10e-16
+        self._maximum_iterations = 1000000
         self._calculation_listeners = []
+        self._warm_start = False
+        self._last_state_distribution = None
+        self._single_closed_class = False
+        self._single_closed_class_chain = None
+        self._result_store = None
 
     def __str__(self):
         """
@@ -60,6 +68,254 @@ class MarkovChainSimulator(object):
         """
         raise NotImplementedError
 
+    def get_stationary_state_distribution(self, simulation_steps: int, alpha: float = 1, specified_period: int = 1):
+        """
+        Method that returns the stationary state distribution of the Markov chain. The distributions are stored on
+        the Markov chain for the strategy, steps, alpha, period and precision they have been calculated with, so the
+        vector and every plot of a run share a single calculation. They are calculated anew once the chain has been
+        changed. With a result store the distributions are also looked up in and added to the store.
+        :param simulation_steps: number of iteration steps
+        :param alpha: value used for the alpha relaxation
+        :param specified_period: specified value for period
+        :return: stationary state distribution
+        """
+        key = self.get_result_key(simulation_steps, alpha, specified_period)
+        stationary_state_distribution = self.get_cached_stationary_state_distribution(key)
+        if stationary_state_distribution is None:
+            result_store = self.get_result_store() if self.is_reproducible() else None
+            if result_store is not None:
+                fingerprint = result_store.get_fingerprint(self.get_markov_chain())
+                stationary_state_distribution = result_store.load_stationary_state_distribution(fingerprint, key)
+            if stationary_state_distribution is None:
+                stationary_state_distribution = self.calculate_stationary_state_distribution(simulation_steps, alpha,
+                                                                                             specified_period)
+                if result_store is not None:
+                    result_store.save_stationary_state_distribution(fingerprint, key, stationary_state_distribution)
+            self.set_cached_stationary_state_distribution(key, stationary_state_distribution)
+            self._last_state_distribution = stationary_state_distribution
+        return stationary_state_distribution
+
+    def get_cached_stationary_state_distribution(self, key: tuple):
+        """
+        Method that returns the stationary state distribution stored on the Markov chain for a calculation,
+        results that are not reproducible are never taken from the chain
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :return: stationary state distribution or None
+        """
+        if not self.is_reproducible():
+            return None
+        return self.get_markov_chain().get_cached_stationary_state_distribution(key)
+
+    def set_cached_stationary_state_distribution(self, key: tuple, stationary_state_distribution):
+        """
+        Method that stores a stationary state distribution on the Markov chain for the calculation it results from.
+        Results that are not reproducible only become the latest stationary state distribution of the chain.
+        :param key: strategy, steps, alpha, period and precision of the calculation
+        :param stationary_state_distribution: stationary state distribution
+        """
+        if self.is_reproducible():
+            self.get_markov_chain().set_cached_stationary_state_distribution(key, stationary_state_distribution)
+        else:
+            self.get_markov_chain().set_stationary_state_distribution(stationary_state_distribution)
+
+    def get_strategy_key(self):
+        """
+        Method that returns the strategy and the settings that determine its results, strategies with further
+        settings extend the key
+        :return: tuple
+        """
+        return (self._type,)
+
+    def get_result_key(self, simulation_steps: int, alpha: float = 1, specified_period: int = 1):
+        """
+        Method that returns the key a stationary state distribution is stored with on the Markov chain
+        :param simulation_steps: number of iteration steps
+        :param alpha: value used for the alpha relaxation
+        :param specified_period: specified value for period
+        :return: strategy, steps, alpha, period and precision
+        """
+        return self.get_strategy_key() + (simulation_steps, alpha, specified_period,
+                                          self.get_calculation_precision())
+
+    def is_reproducible(self):
+        """
+        Method to check whether the strategy returns the same result for the same key, only reproducible results
+        are kept in the result store
+        :return: True
+        """
+        return True
+
+    def set_result_store(self, result_store):
+        """
+        Setter method of the store the results are persisted in
+        :param result_store: ResultStore or None
+        """
+        self._result_store = result_store
+
+    def get_result_store(self):
+        """
+        Getter method of the store the results are persisted in
+        :return: ResultStore or None
+        """
+        return self._result_store
+
+    def enableWarmStart(self, enabled: bool):
+        """
+        Method to enable the warm start of the iterative strategies from a previously calculated stationary state
+        distribution instead of the initial state vector
+        :param enabled: warm start selection
+        """
+        self._warm_start = enabled
+
+    def get_warm_start_vector(self):
+        """
+        Method that returns the vector an iterative strategy starts from in warm start mode. The last stationary
+        state distribution of the Markov chain is used, even if the chain has been changed since, otherwise the
+        last result of this simulator padded or truncated to the state space, e.g. after q_max has changed.
+        The warm start is only used for chains with a single closed class, whose limit does not depend on the
+        initial state vector.
+        :return: start vector or None
+        """
+        if not self._warm_start:
+            return None
+        warm_start_vector = self.get_markov_chain().get_warm_start_vector()
+        if warm_start_vector is None:
+            warm_start_vector = self._last_state_distribution
+        if warm_start_vector is None or not self.has_single_closed_class():
+            return None
+        return self.adapt_state_vector(warm_start_vector, self.get_markov_chain().get_number_of_states())
+
+    def has_single_closed_class(self):
+        """
+        Method to check whether the Markov chain has a single closed class. The structural analysis is only
+        calculated for the first check of a Markov chain; after a change that discards it, e.g. a single transition
+        probability, the result of the cached analysis or of the last check of the chain is used, so a warm
+        started re-solve does not analyse the chain again.
+        :return: True if the Markov chain has a single closed class
+        """
+        markov_chain = self.get_markov_chain()
+        structural_analysis = markov_chain.get_structural_analysis()
+        if structural_analysis is None and self._single_closed_class_chain is not markov_chain:
+            structural_analysis = self.get_structural_analysis()
+        if structural_analysis is not None:
+            self._single_closed_class = len(structural_analysis.get_closed_classes()) == 1
+            self._single_closed_class_chain = markov_chain
+        return self._single_closed_class
+
+    def get_start_vector(self):
+        """
+        Method that returns the vector an iterative strategy starts from, the warm start vector if available and
+        the initial state vector otherwise
+        :return: start vector
+        """
+        warm_start_vector = self.get_warm_start_vector()
+        if warm_start_vector is not None:
+            return warm_start_vector
+        return np.array(self.get_markov_chain().get_initial_state_vector(), dtype=float)
+
+    def calculate_state_distributions(self, initial_state_vectors: np.ndarray, simulation_steps: int = 0,
+                                      alpha: float = 1, specified_period: int = 1):
+        """
+        Method for calculating the stationary state distributions of several initial state vectors at once.
+        All rows are propagated with calculate_subsequent_state_distributions, one matrix-matrix product per step.
+        Every row keeps a ring of the last get_batch_period state vectors and is retired once all slots of its ring
+        have converged; with a period above 1 the result is the mean of the ring.
+        :param initial_state_vectors: k x n matrix with one initial state vector per row
+        :param simulation_steps: number of iteration steps, 0 to iterate until every row has converged
+        :param alpha: value used for the alpha relaxation
+        :param specified_period: specified value for period
+        :return: k x n matrix with one stationary state distribution per row
+        """
+        period = self.get_batch_period(specified_period)
+        precision = self.get_calculation_precision()
+
+        def batch_step(states, step):
+            (state_vectors, x, converged) = states
+            index = (step - 1) % period
+            x[:, index] = state_vectors
+            state_vectors = self.calculate_subsequent_state_distributions(state_vectors, step, alpha)
+            state_vectors /= np.sum(state_vectors, axis=1, keepdims=True)
+            index = step % period
+            norms = self.row_norm(state_vectors, x[:, index])
+            converged[:, index] = norms <= precision
+            return [state_vectors, x, converged], norms, np.all(converged, axis=1)
+
+        def batch_result(states):
+            if period == 1:
+                return states[0]
+            xs = np.mean(states[1], axis=1)
+            return xs / np.sum(xs, axis=1, keepdims=True)
+
+        state_vectors = np.array(np.atleast_2d(initial_state_vectors), dtype=float)
+        (number_of_rows, number_of_states) = state_vectors.shape
+        return self.iterate_state_distributions([state_vectors,
+                                                 np.zeros((number_of_rows, period, number_of_states)),
+                                                 np.zeros((number_of_rows, period), dtype=bool)],
+                                                batch_step, batch_result, simulation_steps)
+
+    def calculate_subsequent_state_distributions(self, state_distributions: np.ndarray, step: int, alpha: float = 1):
+        """
+        Interface method for calculating the successor state distributions of a batch in
+        calculate_state_distributions
+        :param state_distributions: k x n matrix with the current state distributions as rows
+        :param step: current step, starting with 1
+        :param alpha: value used for the alpha relaxation
+        :return: k x n matrix with the successor state distributions, normalized by the caller
+        """
+        raise NotImplementedError
+
+    def get_batch_period(self, specified_period: int = 1):
+        """
+        Method that returns the number of state vectors kept per row in calculate_state_distributions
+        :param specified_period: specified value for period
+        :return: 1, strategies that average over the period resolve it here
+        """
+        return 1
+
+    def iterate_state_distributions(self, states: list, batch_step, batch_result, simulation_steps: int = 0):
+        """
+        Advances a batch of iterations in lockstep, one matrix-matrix product per step. All arrays of the iteration
+        state carry the batch as first axis. A row is retired as soon as its iteration has converged, the remaining
+        rows continue with a smaller batch.
+        :param states: list of arrays of the iteration state, each of shape (k, ...)
+        :param batch_step: function (states, step) -> (states, norms, converged) advancing the active rows
+        :param batch_result: function (states) -> distributions of the given rows
+        :param simulation_steps: number of iteration steps, 0 to iterate until every row has converged
+        :return: k x n matrix with one stationary state distribution per row
+        """
+        number_of_rows = states[0].shape[0]
+        active = np.arange(number_of_rows)
+        results = None
+        step = 0
+        norm = None
+        while len(active) and (simulation_steps == 0 or step + 1 < simulation_steps):
+            if simulation_steps == 0:
+                self.check_iterations(step, np.inf if norm is None else norm)
+            step += 1
+            try:
+                self.notify_calculation_listeners(step, norm)
+            except:
+                raise InterruptedError
+            states, norms, converged = batch_step(states, step)
+            norm = float(np.max(norms))
+            if simulation_steps == 0 and np.any(converged):
+                retired = batch_result([state[converged] for state in states])
+                if results is None:
+                    results = np.zeros((number_of_rows, retired.shape[1]))
+                results[active[converged]] = retired
+                active = active[~converged]
+                states = [state[~converged] for state in states]
+        if len(active):
+            remaining = batch_result(states)
+            if results is None:
+                results = np.zeros((number_of_rows, remaining.shape[1]))
+            results[active] = remaining
+        try:
+            self.notify_calculation_listeners(step, norm)
+        except:
+            raise InterruptedError
+        return results
+
     def calculate_subsequent_state_distribution(self, state_distribution: np.ndarray):
         """
         Interface function for calculating the successor state distribution
@@ -79,21 +335,15 @@ class MarkovChainSimulator(object):
                   "#FF9400","#71F8FF", "#80E868",
                   "#FFB400", "E93FFF", "#DFFF47"]
 
-        graph = self.get_markov_chain().get_graph()
-
-        if graph is None:
-            (V, E) = self.calculate_graph()
-            self.get_markov_chain().set_graph((V, E))
-        else:
-            (V, E) = graph
-        closures = self.get_markov_chain().get_closures()
+        structural_analysis = self.get_structural_analysis()
+        graph = structural_analysis.get_graph()
+        closures = structural_analysis.get_closures()
         for closure in closures:
             colors.append("#000000")
-        if not closures:
-            closures = self.closures((V, E))
-            self.get_markov_chain().set_closures(closures)
         G = nx.DiGraph()
-        E = [(str(e[0]), str(e[1])) for e in list(E)]
+        vertices = [str(v) for v in graph.get_vertices()]
+        sources, targets = graph.get_edges()
+        E = [(vertices[u], vertices[v]) for (u, v) in zip(sources.tolist(), targets.tolist())]
         G.add_edges_from(E)
         color_map = []
         num_closures = len(closures)
@@ -125,72 +375,68 @@ class MarkovChainSimulator(object):
     def calculate_graph(self):
         """
         Method for determining the graph from the Markov chain specification
-        :return: Graph (V, E) of the Markov chain
+        :return: MarkovChainGraph of the Markov chain
         """
         if self.get_markov_chain().get_type() == "MarkovChainForwardApproach":
-            (V, E) = self.calculate_graph_from_functional_definition()
+            graph = self.calculate_graph_from_functional_definition()
         elif self.get_markov_chain().get_type() == "MarkovChainConventionalApproach":
-            (V, E) = self.calculate_graph_from_conventional_definition()
+            graph = self.calculate_graph_from_conventional_definition()
         else:
             raise NotImplementedError
-        return (V, E)
+        return graph
+
+    def get_structural_analysis(self):
+        """
+        Method that returns the structural analysis of the Markov chain, the graph is determined on first use
+        and the analysis is kept on the Markov chain. With a result store the analysis is loaded from the store or
+        added to it together with its closures and periods.
+        :return: StructuralAnalysis of the Markov chain
+        """
+        structural_analysis = self.get_markov_chain().get_structural_analysis()
+        if structural_analysis is None:
+            result_store = self.get_result_store()
+            if result_store is not None:
+                fingerprint = result_store.get_fingerprint(self.get_markov_chain())
+                structural_analysis = result_store.load_structural_analysis(
+                    fingerprint, self.get_markov_chain().get_number_of_states())
+            if structural_analysis is None:
+                structural_analysis = StructuralAnalysis(self.calculate_graph())
+                if result_store is not None:
+                    result_store.save_structural_analysis(fingerprint, structural_analysis)
+            self.get_markov_chain().set_structural_analysis(structural_analysis)
+        return structural_analysis
 
     def calculate_mc_period(self):
         """
-        Method for determining the period of the Markov chain.
+        Method for determining the period of the Markov chain. The period is stored in the structural analysis
+        of the Markov chain.
         :return: Period p of the Markov chain
         """
-        period = self.get_markov_chain().get_period()
-        if period == 0:
-
-            graph = self.get_markov_chain().get_graph()
-
-            if graph is None:
-
-                (V, E) = self.calculate_graph()
-                self.get_markov_chain().set_graph((V, E))
-            else:
-                (V, E) = graph
-            if self.get_markov_chain().get_type() == "MarkovChainForwardApproach":
-                N = len(self.get_markov_chain().get_transition_functions())
-                return self.period((V, E))
-            elif self.get_markov_chain().get_type() == "MarkovChainConventionalApproach":
-                return self.period((V, E))
-            else:
-                raise NotImplementedError
-        else:
-            return period
+        return self.get_structural_analysis().get_period()
 
     def calculate_graph_from_functional_definition(self):
         """
-        Method for determining the graph from the functional Markov chain specification
-        :return: Graph (V, E) of the Markov chain
+        Method for determining the graph from the functional Markov chain specification. The edges of the
+        transition functions are composed on the compiled successor index, only factors with positive
+        probability contribute.
+        :return: MarkovChainGraph of the Markov chain
         """
-        V = set()
-        E = set()
-
         states = self.get_markov_chain().get_states()
-        factors = self.get_markov_chain().get_factors()
         factor_distributions = self.get_markov_chain().get_factor_distributions()
-        transition_functions = self.create_transition_function_from_file_path(
-            self.get_markov_chain().get_transition_functions())
-        transition_function = transition_functions[0]
-
-        for element in states[0]:
-            V.add(self.round_vedge(element))
-
-        for state in states[0]:
-            for factor_index in range(len(factors[0])):
-                if (factor_distributions[0])[factor_index] > 0:
-                    E.add((self.round_vedge(state), self.round_vedge((transition_function)(state, (factors[0])[factor_index]))))
-        for index in range(1, len(transition_functions)):
-            Enew = set()
-            for e in E:
-                for factor_index in range(len(factors[index])):
-                    if (factor_distributions[index])[factor_index] > 0:
-                        Enew.add((self.round_vedge(e[0]), self.round_vedge((transition_functions[index])(e[1], (factors[index])[factor_index]))))
-            E = Enew
-        return (V, E)
+        successor_index = self.get_successor_index()
+        number_of_states = len(states[0])
+
+        sources = np.arange(number_of_states)
+        targets = np.arange(number_of_states)
+        for index in range(len(successor_index)):
+            positive_factors = np.flatnonzero(np.asarray(factor_distributions[index]) > 0)
+            successors = successor_index[index][:, positive_factors]
+            sources = np.repeat(sources, len(positive_factors))
+            targets = successors[targets].ravel()
+            edges = np.unique(sources * number_of_states + targets)
+            sources, targets = np.divmod(edges, number_of_states)
+        return MarkovChainGraph(number_of_states, sources, targets,
+                                [self.round_vedge(state) for state in states[0]])
 
     def round_vedge(self, v):
         if type(v) in [list, np.ndarray, tuple]:
@@ -198,80 +444,69 @@ class MarkovChainSimulator(object):
         else:
             return round(float(v), 13)
 
+    def get_successor_index(self):
+        """
+        Method that returns the successor index of the functional Markov chain and compiles it on first use
+        :return: successor index: one integer array succ[state, factor] -> subsequent state per transition function
+        """
+        successor_index = self.get_markov_chain().get_successor_index()
+        if successor_index is None:
+            successor_index = self.calculate_successor_index()
+            self.get_markov_chain().set_successor_index(successor_index)
+        return successor_index
+
+    def calculate_successor_index(self):
+        """
+        Method for compiling the successor index of the functional Markov chain. Every transition function is
+        evaluated exactly once per (state, factor) pair. Factors without probability mass are not evaluated, their
+        entry points back to the current state.
+        :return: successor index: one integer array succ[state, factor] -> subsequent state per transition function
+        """
+        states = self.get_markov_chain().get_states()
+        factors = self.get_markov_chain().get_factors()
+        factor_distributions = self.get_markov_chain().get_factor_distributions()
+        transition_functions = self.get_markov_chain().get_resolved_transition_functions()
+        successor_index = []
+        for index in range(len(transition_functions)):
+            curr_states = states[index]
+            curr_factors = factors[index]
+            curr_factor_distribution = factor_distributions[index]
+            state_map = {}
+            for state_index in range(len(curr_states)):
+                state_map[self.round_vedge(curr_states[state_index])] = state_index
+            successors = np.empty((len(curr_states), len(curr_factors)), dtype=np.intp)
+            for j in range(len(curr_states)):
+                for k in range(len(curr_factors)):
+                    if curr_factor_distribution[k] > 0:
+                        successors[j, k] = state_map[self.round_vedge(
+                            transition_functions[index](curr_states[j], curr_factors[k]))]
+                    else:
+                        successors[j, k] = j
+            successor_index.append(successors)
+        return successor_index
+
 
     def calculate_graph_from_conventional_definition(self):
         """
-        Method for determining the graph from the conventional Markov chain specification
-        :return: Graph (V, E) of the Markov chain
+        Method for determining the graph from the non-zero pattern of the conventional transition matrix
+        :return: MarkovChainGraph of the Markov chain
         """
-        V = set()
-        E = set()
         matrix = self.get_markov_chain().get_transition_matrix()
-        number_of_states = len(matrix)
-        for state in range(number_of_states):
-            V.add(state)
-            for next_state in range(number_of_states):
-                if matrix[state][next_state] > 0:
-                    E.add((state, next_state))
-        return (V, E)
-
-    def depth_first_search(self, graph):
-        """
-        Method that performs a depth search on a graph.
-        :param graph: Graph that is being examined.
-        :return: Vord: Search order of the depth first search
-        :return: cc: connected components of graph
-        """
-        self.calculate_successors(graph)
-        (V, E) = graph
-        color = {}
-        cc = []
-        Vord = []
-        for v in V:
-            color[v] = "white"
-        for v in V:
-
-            if color[v] == "white":
-                finished = []
-                color, finished = self.depth_first_search_visit(v,
-                                                    color,
-                                                    finished)
-                Vord += finished
-                cc.append(finished)
-        return Vord, cc
-
-    def depth_first_search_visit(self, v, color, finished):
-        """
-        Auxiliary function that enables the depth search
-        :param v: current vertex
-        :param color: Colors of the individual vertices that indicate the visit status of each vertices
-        :param finished: Contains all vertices that have been fully investigated in an ordered list.
-        :return: color, finished
-        """
-        color[v] = "gray"
-
-        for s in succ[v]:
-
-            if color[s] == "white":
-                color, finished \
-                    = self.depth_first_search_visit(s, color, finished)
-
-        color[v] = "black"
-        finished.append(v)
-
-        return color, finished
-
-    def reverse_graph(self, graph):
-        """
-        Method for determining the reverse graph
-        :param graph: Graph to be inverted
-        :return: (V, revE): reversed graph
-        """
-        (V, E) = graph
-        revE = set()
-        for e in E:
-            revE.add(tuple(reversed(e)))
-        return V, revE
+        if scipy.sparse.issparse(matrix):
+            (sources, targets) = (matrix > 0).nonzero()
+        else:
+            (sources, targets) = np.nonzero(np.asarray(matrix) > 0)
+        return MarkovChainGraph(matrix.shape[0], sources, targets)
+
+    def get_graph_engine(self, graph):
+        """
+        Method that returns the adjacency based graph engine of a graph
+        :param graph: graph (V, E) or MarkovChainGraph
+        :return: MarkovChainGraph
+        """
+        if isinstance(graph, MarkovChainGraph):
+            return graph
+        return MarkovChainGraph.from_edge_set(graph)
 
     def scc(self, graph):
         """
@@ -279,14 +514,9 @@ class MarkovChainSimulator(object):
         :param graph: Graph that is being analyzed
         :return: scc: stringly connected components of the graph
         """
-
-        (V, E) = graph
-        revGraph = self.reverse_graph(graph)
-        expansion_finishing_order, connected_components = self.depth_first_search(revGraph)
-        expansion_finishing_order.reverse()
-        expansion_finishing_order, connected_components = self.depth_first_search((expansion_finishing_order, E))
-        scc = connected_components
-        return scc
+        graph = self.get_graph_engine(graph)
+        vertices = graph.get_vertices()
+        return [[vertices[v] for v in component] for component in graph.strongly_connected_components()]
 
     def closures(self, graph):
         """
@@ -294,114 +524,9 @@ class MarkovChainSimulator(object):
         :param graph: Graph that is being analyzed
         :return: closures: closures of the graph
         """
-        (V, E) = graph
-        sccs = self.scc(graph)
-        for scc in sccs:
-            for u in scc:
-                for v in succ[u]:
-                    if v not in scc:
-                            scc.clear()
-        return [scc for scc in sccs if scc]
-
-    def cycle_length(self, graph, closure):
-        """
-        Calculation of the minimum cycle length by means of a deep first search
-        :param graph: Graph to be analyzed
-        :param closure: closure to be analysed
-        :return: cycle_lenth: minimum cycle length
-        """
-        color = {}
-        depth = {}
-        for v in closure:
-            color[v] = "white"
-            depth[v] = 0
-        v = closure[0]
-        cycle_length = float('inf')
-        cycle_length = self.dfs_cycle_length(v, graph, closure, color, depth, cycle_length)
-        return cycle_length
-
-    def dfs_cycle_length(self, v, graph, closure, color, depth, cycle_length):
-        """
-        Auxiliary function for determining the minimum cycle length. This method enables the depth first search.
-        :param v: current vertex
-        :param graph: graph to be analyzed
-        :param closure: closure to be analyzed
-        :param color: colors indicating the visiting status
-        :param depth: current depth of the vertex
-        :param cycle_length: currently smallest found cycles length
-        :return: cycle_length: smallest found cycles length
-        """
-        (V, E) = graph
-
-        for u in succ[v]:
-            if u in closure:
-                if color[u] == "white":
-
-                    depth[u] = depth[v] + 1
-                    color[u] = "gray"
-                    cycle_length = min(cycle_length,
-                                       self.dfs_cycle_length(u, graph, closure, color, depth, cycle_length))
-                else:
-                    cycle_length = min(cycle_length, abs(depth[v] - depth[u]) + 1)
-        color[v] = "black"
-        return cycle_length
-
-    def dfs_period_devisor(self, v, closure, graph, pc, color, partition):
-        """
-        Function for verifying the partition-specific of a possible period candidate
-        :param v: currently considered vertex
-        :param closure: closure to be analyzed
-        :param graph: graph to be analyzed
-        :param pc: possible candidate
-        :param color: colors indicating the visiting status
-        :param partition: list holding the partition numbers
-        :return: color, partition, is_period_devisor
-        """
-        (V, E) = graph
-        is_period_devisor = True
-        for u in succ[v]:
-            if u in closure:
-
-                if color[u] == "white":
-                    color[u] = "gray"
-                    partition[u] = (partition[v] + 1) % pc
-                    color, partition, is_period_devisor = self.dfs_period_devisor(u, closure, graph, pc, color,
-                                                                                  partition)
-                    color[u] = "black"
-                elif ((abs((partition[u] - partition[v])) + 1) % pc) != 0:
-                    is_period_devisor = False
-
-        return color, partition, is_period_devisor
-
-    def dfs_period(self, graph, closure):
-        """
-        Function for determining the period of a closure
-        :param closure: closure to be analyzed
-        :param graph: graph to be analyzed
-        :return: period: period of the closure
-        """
-        (V, E) = graph
-        color = {}
-        partition = {}
-
-        cycle_length = self.cycle_length(graph, closure)
-
-        pc = 1
-        pgcd = 1
-        while pc <= cycle_length:
-            pc = pc + 1
-            if (pc % pgcd == 0) and (cycle_length % pc == 0):
-                for v in closure:
-                    color[v] = "white"
-                v = closure[0]
-                partition[v] = 0
-                color[v] = "gray"
-                color, partition, is_period_devisor = self.dfs_period_devisor(v, closure, graph, pc, color, partition)
-                if is_period_devisor:
-                    pgcd = pc
-        period = pgcd
-        return period
-
+        graph = self.get_graph_engine(graph)
+        vertices = graph.get_vertices()
+        return [[vertices[v] for v in closed_class] for closed_class in graph.closed_classes()]
 
     def gcd(self, numbers: list):
         """
@@ -432,41 +557,22 @@ class MarkovChainSimulator(object):
         :param b: second number
         :return: gcd: gratest common divider
         """
-        while b is not 0:
+        while b != 0:
             h = a % b
             a = int(b)
             b = int(h)
         return a
 
-    def calculate_successors(self, graph):
-        """
-        Method for calculation of the successor vertices of all vertices of a graph
-        :param graph:graph to be analyzed
-        """
-        global succ
-        succ  = {}
-        (V, E) = graph
-        for v in V:
-            succ[v] = []
-            for e in E:
-                if e[0] == v:
-                    succ[v].append(e[1])
-
     def period(self, graph):
         """
         Method for calculating the period of a graph
         :param graph: graph to be analyzed
         :return: period: period of the graph
         """
-        closures = self.closures(graph)
-        periods = []
-        for closure in closures:
-            periods.append(self.dfs_period(graph, closure))
-        period = int(self.lcm(periods))
-        return period
+        return self.get_graph_engine(graph).period()
 
     def plot_stationary_state_distribution(self, simulation_steps: int, alpha: float = 1, specified_period:int=1,
-                                           figure = None, label=None):
+                                           figure = None, label=None, stationary_state_distribution=None):
         """
         Plots the stationary state distribution
         :param simulation_steps: iteration steps of the stationary state distribution calculation
@@ -474,19 +580,17 @@ class MarkovChainSimulator(object):
         :param specified_period: specified value for period
         :param figure: figure into which the plot is integrated
         :param label: possible labels of the markov Chains
+        :param stationary_state_distribution: already calculated stationary state distribution, None to calculate it
         :return plot of the stationary state distribution
         """
         if figure is None:
             figure = plt.figure()
             figure.clear()
-        try:
-            if self.get_markov_chain().get_stationary_state_distribution() is None or simulation_steps > 0:
-                ssd = self.calculate_stationary_state_distribution(simulation_steps, alpha, specified_period)
-                self.get_markov_chain().set_stationary_state_distribution(ssd)
-            y_values = self.get_markov_chain().get_stationary_state_distribution()
-            x_values = range(len(y_values))
-        except:
-            raise InterruptedError
+        if stationary_state_distribution is None:
+            stationary_state_distribution = self.get_stationary_state_distribution(simulation_steps, alpha,
+                                                                                   specified_period)
+        y_values = stationary_state_distribution
+        x_values = range(len(y_values))
         ax1 = figure.add_subplot(111)
         if label is None:
             ax1.plot(x_values, y_values, 'o')
@@ -506,7 +610,8 @@ class MarkovChainSimulator(object):
                 ax1.set_xticklabels(self._markov_chain.get_states()[0], rotation=90)
         return figure
 
-    def plot_cumulative_stationary_state_distribution(self, simulation_steps: int, alpha: float=1, specified_period:int=1, figure = None, label=None):
+    def plot_cumulative_stationary_state_distribution(self, simulation_steps: int, alpha: float=1, specified_period:int=1, figure = None, label=None,
+                                                      stationary_state_distribution=None):
         """
         Plots the cumulative stationary state distribution
         :param simulation_steps: iteration steps of the stationary state distribution calculation
@@ -514,21 +619,18 @@ class MarkovChainSimulator(object):
         :param specified_period: specified value for period
         :param figure: figure into which the plot is integrated
         :param label: possible labels of the markov Chains
+        :param stationary_state_distribution: already calculated stationary state distribution, None to calculate it
         :return plot of the cumulative stationary state distribution
         """
         if figure is None:
             figure = plt.figure()
             figure.clear()
-        try:
-            if self.get_markov_chain().get_stationary_state_distribution() is None or simulation_steps > 0:
-                self.get_markov_chain().set_stationary_state_distribution(self.calculate_stationary_state_distribution(
-                    simulation_steps, alpha, specified_period))
-            y_values = self.get_markov_chain().get_stationary_state_distribution()
-            y_values = np.insert(y_values, 0, 0., axis=0)
-            y_values = np.cumsum(y_values)
-            x_values = range(len(y_values))
-        except:
-            raise InterruptedError
+        if stationary_state_distribution is None:
+            stationary_state_distribution = self.get_stationary_state_distribution(simulation_steps, alpha,
+                                                                                   specified_period)
+        y_values = np.insert(stationary_state_distribution, 0, 0., axis=0)
+        y_values = np.cumsum(y_values)
+        x_values = range(len(y_values))
 
         ax1 = figure.add_subplot(111)
         if label is None:
@@ -555,7 +657,8 @@ class MarkovChainSimulator(object):
                                                                     alpha: float=1,
                                                                     specified_period: int=1,
                                                                     figure = None,
-                                                                    label = None):
+                                                                    label = None,
+                                                                    stationary_state_distribution=None):
         """
         Plots the complementary cumulative stationary state distribution
         :param simulation_steps: iteration steps of the stationary state distribution calculation
@@ -563,20 +666,17 @@ class MarkovChainSimulator(object):
         :param specified_period: specified value for period
         :param figure: figure into which the plot is integrated
         :param label: possible labels of the markov Chains
+        :param stationary_state_distribution: already calculated stationary state distribution, None to calculate it
         :return plot of the complementary cumulative stationary state distribution
         """
         if figure is None:
             figure = plt.figure()
             figure.clear()
-        try:
-            if self.get_markov_chain().get_stationary_state_distribution() is None or simulation_steps > 0:
-                self.get_markov_chain().set_stationary_state_distribution(
-                    self.calculate_stationary_state_distribution(simulation_steps, alpha, specified_period))
-            y_values = self.get_markov_chain().get_stationary_state_distribution()
-            y_values = 1 - np.insert(np.cumsum(y_values), 0, 0., axis=0)
-            x_values = range(len(y_values))
-        except:
-            raise InterruptedError
+        if stationary_state_distribution is None:
+            stationary_state_distribution = self.get_stationary_state_distribution(simulation_steps, alpha,
+                                                                                   specified_period)
+        y_values = 1 - np.insert(np.cumsum(stationary_state_distribution), 0, 0., axis=0)
+        x_values = range(len(y_values))
         ax1 = figure.add_subplot(111)
         if label is None:
             ax1.step(x_values, y_values, where="pre")
@@ -653,6 +753,33 @@ class MarkovChainSimulator(object):
         """
         return self._calculation_precision
 
+    def set_maximum_iterations(self, maximum_iterations: int):
+        """
+        Method for adjusting the number of iteration steps after which an iteration that has not reached the
+        calculation precision is stopped
+        :param maximum_iterations: maximum number of iteration steps
+        """
+        self._maximum_iterations = maximum_iterations
+
+    def get_maximum_iterations(self):
+        """
+        Method to read the maximum number of iteration steps
+        :return maximum_iterations: maximum number of iteration steps
+        """
+        return self._maximum_iterations
+
+    def check_iterations(self, step: int, norm: float):
+        """
+        Method that stops an iteration which has not reached the calculation precision within the maximum number of
+        iteration steps
+        :param step: current step
+        :param norm: current accuracy of the calculation
+        """
+        if step >= self._maximum_iterations:
+            raise ArithmeticError("{strategy} has not converged within {steps} steps, the norm is still {norm:.3e}"
+                                  .format(strategy=self._type,
+                                          steps=step, norm=norm))
+
     def notify_calculation_listeners(self, step: int, norm=None):
         """
         Function that informs all registered listeners about the calculation status
@@ -672,6 +799,86 @@ class MarkovChainSimulator(object):
         """
         self._calculation_listeners.append(listener)
 
+    def remove_calculation_listeners(self):
+        """
+        Function to unregister all calculation listeners
+        """
+        self._calculation_listeners = []
+
+    def replace_calculation_listener(self, listener: object, replacement: object):
+        """
+        Function to replace a calculation listener, e.g. the listener of the project by the listener of a job
+        :param listener: calculation listener to be replaced
+        :param replacement: new calculation listener
+        """
+        self._calculation_listeners = [replacement if function == listener else function
+                                       for function in self._calculation_listeners]
+
+    def get_job_copy(self):
+        """
+        Returns a copy of the simulator with the current strategy and settings for a calculation on a worker thread.
+        Subsequent changes of the simulator or of its calculation listeners do not affect the copy, the Markov chain
+        and the result store are shared.
+        :return: MarkovChainSimulator
+        """
+        job_copy = copy.copy(self)
+        job_copy._calculation_listeners = list(self._calculation_listeners)
+        return job_copy
+
+    @staticmethod
+    def vector_matrix_product(x: np.ndarray, matrix):
+        """
+        Method for calculating the product x * P for dense and sparse transition matrices
+        :param x: state vector
+        :param matrix: transition matrix, either dense or scipy.sparse
+        :return: x * P
+        """
+        if scipy.sparse.issparse(matrix):
+            return matrix.T.dot(x)
+        return np.dot(x, matrix)
+
+    @staticmethod
+    def matrix_product(X: np.ndarray, matrix):
+        """
+        Method for calculating the product X * P of a k x n matrix of state vectors for dense and sparse
+        transition matrices
+        :param X: state vectors as rows
+        :param matrix: transition matrix, either dense or scipy.sparse
+        :return: X * P
+        """
+        if scipy.sparse.issparse(matrix):
+            return np.asarray(matrix.T.dot(X.T)).T
+        return np.dot(X, matrix)
+
+    @staticmethod
+    def row_norm(X: np.ndarray, Xpred: np.ndarray):
+        """
+        method for determining the infinite norm of every row of two matrices of state vectors
+        :param X: current state vectors
+        :param Xpred: predecessor state vectors
+        :return: ||x_i, xpred_i|| for every row i
+        """
+        return np.max(np.abs(X - Xpred), axis=-1)
+
+    @staticmethod
+    def adapt_state_vector(state_vector: np.ndarray, number_of_states: int):
+        """
+        Method for adapting a state distribution to a state space of another size, e.g. after q_max has changed.
+        A longer state space is padded with zeros, for a shorter one the probability mass of the removed states
+        is added to the new last state.
+        :param state_vector: state distribution
+        :param number_of_states: cardinality of the new state space
+        :return: state distribution of length number_of_states
+        """
+        state_vector = np.asarray(state_vector, dtype=float)
+        if len(state_vector) < number_of_states:
+            state_vector = np.concatenate((state_vector, np.zeros(number_of_states - len(state_vector))))
+        elif len(state_vector) > number_of_states:
+            tail = np.sum(state_vector[number_of_states:])
+            state_vector = state_vector[:number_of_states].copy()
+            state_vector[-1] += tail
+        return state_vector / np.sum(state_vector)
+
     @staticmethod
     def norm(x: np.ndarray, xpred: np.ndarray):
         """
@@ -680,16 +887,5 @@ class MarkovChainSimulator(object):
         :param xpred: predecessor state vector
         :return: ||x, xpred||
         """
-        return max([abs(diff) for diff in x-xpred])
-
+        return np.max(np.abs(x - xpred))
 
-    def create_transition_function_from_file_path(self, file_path):
-        TransitionFunction = importlib.import_module(file_path)
-        transition_functions = []
-        index = 1
-        while hasattr(TransitionFunction
-                , 'transition_function{index}'.format(index=index)):
-            transition_functions.append(
-                getattr(TransitionFunction, 'transition_function{index}'.format(index=index)))
-            index += 1
-        return transition_functions
@@ -0,0 +1,122 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+
+def solve_coupling(coupling):
+    """
+    Calculates the stationary state distribution of an irreducible chain from its off-diagonal part C. The generator
+    Q = diag(C 1) - C is formed without subtracting from the identity, so small couplings are not cancelled. The last
+    equation of xQ = 0 is replaced by x_n = 1, which is nonsingular for an irreducible chain, and the solution is
+    normalized afterwards. The columns are ordered by COLAMD to reduce the fill-in.
+    :param coupling: off-diagonal transition probabilities of an irreducible chain, zero diagonal
+    :return: stationary state distribution
+    """
+    n = coupling.shape[0]
+    if n == 1:
+        return np.ones(1)
+    coupling = scipy.sparse.csr_matrix(coupling, dtype=float)
+    Q = (scipy.sparse.diags(np.asarray(coupling.sum(axis=1)).ravel()) - coupling).transpose().tocsr()
+    keep = np.ones(n)
+    keep[-1] = 0
+    Q = scipy.sparse.diags(keep).dot(Q) + scipy.sparse.csr_matrix(([1.0], ([n - 1], [n - 1])), shape=(n, n))
+    Q = Q.tocsc()
+    Q.eliminate_zeros()
+    b = np.zeros(n)
+    b[-1] = 1
+    xs = scipy.sparse.linalg.splu(Q, permc_spec="COLAMD").solve(b)
+    return xs / np.sum(xs)
+
+
+def solve_closed_class(sub_matrix):
+    """
+    Calculates the stationary state distribution of a closed class with a sparse LU-decomposition. The stationary
+    state distribution of a closed class is unique for every period, so the period is not needed.
+    :param sub_matrix: transition matrix of the closed class
+    :return: stationary state distribution of the class
+    """
+    coupling = scipy.sparse.csr_matrix(sub_matrix, dtype=float, copy=True)
+    coupling.setdiag(0)
+    coupling.eliminate_zeros()
+    return solve_coupling(coupling)
+
+
+def calculate_absorption_probabilities(transition_matrix, initial_state_vector: np.ndarray, closed_classes: list,
+                                       transient_states: np.ndarray):
+    """
+    Calculates the probabilities to end up in each closed class when starting with the initial state vector.
+    With the transient states T and Q = P[T, T] the probability of C_k is
+    a_k = x_0[C_k] 1 + x_0[T] (I - Q)^-1 P[T, C_k] 1,
+    the transient part is solved with a sparse LU-decomposition of (I - Q)^T.
+    :param transition_matrix: transition matrix in compressed sparse row format
+    :param initial_state_vector: initial state vector
+    :param closed_classes: list of vertex index arrays of the closed classes
+    :param transient_states: vertex index array of the transient states
+    :return: absorption probability of every closed class
+    """
+    absorption_probabilities = np.array([np.sum(initial_state_vector[closed_class])
+                                         for closed_class in closed_classes])
+    if len(transient_states) and np.any(initial_state_vector[transient_states]):
+        Q = transition_matrix[transient_states][:, transient_states]
+        I_Q = scipy.sparse.identity(len(transient_states), format="csc") - Q.tocsc()
+        visits = scipy.sparse.linalg.splu(I_Q.transpose().tocsc(), permc_spec="COLAMD")\
+            .solve(initial_state_vector[transient_states])
+        leaving = transition_matrix[transient_states]
+        for k, closed_class in enumerate(closed_classes):
+            absorption_probabilities[k] += visits.dot(np.asarray(leaving[:, closed_class].sum(axis=1)).ravel())
+    if np.sum(absorption_probabilities) == 0:
+        absorption_probabilities[:] = 1
+    return absorption_probabilities
+
+
+def combine_class_distributions(number_of_states: int, closed_classes: list, class_distributions: list,
+                                absorption_probabilities: np.ndarray):
+    """
+    Combines the stationary state distributions x_k of the closed classes to the limiting distribution
+    x = sum_k a_k x_k of the chain, transient states have probability 0
+    :param number_of_states: number of states of the chain
+    :param closed_classes: list of vertex index arrays of the closed classes
+    :param class_distributions: stationary state distributions of the closed classes
+    :param absorption_probabilities: absorption probability of every closed class
+    :return: limiting distribution
+    """
+    state_distribution = np.zeros(number_of_states)
+    for closed_class, class_distribution, absorption_probability in \
+            zip(closed_classes, class_distributions, absorption_probabilities):
+        state_distribution[closed_class] = absorption_probability * class_distribution
+    return state_distribution / np.sum(state_distribution)
+
+
+def solve_stationary_state_distribution(transition_matrix, initial_state_vector: np.ndarray, structural_analysis):
+    """
+    Calculates the limiting distribution of a chain for its initial state vector with sparse LU-decompositions.
+    Every closed class is solved on its own sub-matrix, so transient states and several closed classes do not
+    make the system singular. For periodic classes the result is the Cesaro limit of the class.
+    :param transition_matrix: transition matrix
+    :param initial_state_vector: initial state vector
+    :param structural_analysis: StructuralAnalysis of the chain
+    :return: limiting distribution
+    """
+    transition_matrix = scipy.sparse.csr_matrix(transition_matrix, dtype=float)
+    closed_classes = structural_analysis.get_closed_classes()
+    class_distributions = [solve_closed_class(transition_matrix[closed_class][:, closed_class])
+                           for closed_class in closed_classes]
+    absorption_probabilities = calculate_absorption_probabilities(
+        transition_matrix, np.asarray(initial_state_vector, dtype=float), closed_classes,
+        structural_analysis.get_transient_states())
+    return combine_class_distributions(transition_matrix.shape[0], closed_classes, class_distributions,
+                                       absorption_probabilities)
@@ -15,98 +15,89 @@
 
 import numpy as np
 cimport numpy as np
-import importlib
 
-cdef list create_transition_function_from_file_path(str file_path):
-        cdef tf
-        cpdef tf2
-        TransitionFunction = importlib.import_module(file_path)
-
-        transition_functions = []
-        index = 1
-        while hasattr(TransitionFunction
-                , 'transition_function{index}'.format(index=index)):
-            try:
-                tf = getattr(TransitionFunction, 'transition_function{index}'.format(index=index))
-                transition_functions.append(tf)
-            except:
-                tf2 = getattr(TransitionFunction, 'transition_function{index}'.format(index=index))
-                transition_functions.append(tf2)
-
-
-            index += 1
-        return transition_functions
-
-cpdef forward_algorithm(list states_list, np.ndarray initial_state_distribution, factor_list, list factor_distributions, str functions):
+cpdef list successor_index(list states_list, list factor_list, list factor_distributions, list transition_functions):
     """
-    Method for calculating the stationary state distribution
-    :param simulation_steps: number of iteration steps
-    :param alpha: value used for the alpha relaxation
-    :return stationary state distribution
+    Compiles the successor index of the functional Markov chain. Every transition function is evaluated once per
+    (state, factor) pair, factors without probability mass point back to the current state.
+    :return: successor index: one integer array succ[state, factor] -> subsequent state per transition function
     """
-    cdef list transition_functions
-    transition_functions = create_transition_function_from_file_path(functions)
-    cdef int index = 0
+    cdef int index
     cdef int state_index
     cdef int j
-    cdef int number_of_states = len(states_list[0])
-    cdef int number_of_functions = len(transition_functions)
+    cdef int k
+    cdef dict state_map
+    cdef np.ndarray[np.intp_t, ndim=2] successors
+    cdef list successor_index = []
+    for index in range(len(transition_functions)):
+        curr_states = states_list[index]
+        curr_factors = factor_list[index]
+        curr_factor_distribution = factor_distributions[index]
+        state_map = {}
+        for state_index in range(len(curr_states)):
+            state_map[adjust_input_type(curr_states[state_index])] = state_index
+        successors = np.empty((len(curr_states), len(curr_factors)), dtype=np.intp)
+        for j in range(len(curr_states)):
+            for k in range(len(curr_factors)):
+                if curr_factor_distribution[k] > 0:
+                    successors[j, k] = state_map[adjust_input_type(
+                        transition_functions[index](curr_states[j], curr_factors[k]))]
+                else:
+                    successors[j, k] = j
+        successor_index.append(successors)
+    return successor_index
+
+cpdef forward_algorithm(list successor_index, np.ndarray initial_state_distribution, list factor_distributions):
+    """
+    Calculates the subsequent state distribution by applying the forward algorithm on the compiled successor index
+    :param successor_index: compiled successor index of the Markov chain
+    :param initial_state_distribution: current state distribution
+    :param factor_distributions: distributions of the factors
+    :return subsequent state distribution
+    """
+    cdef int index
+    cdef int j
+    cdef int k
+    cdef int number_of_states = len(initial_state_distribution)
+    cdef Py_ssize_t[:, :] successors
+    cdef double[:] curr_factor_distribution
     cdef double[:] new_dist
-    cdef np.ndarray curr_states
-    cdef dict map
-    cdef int i
     cdef double[:] old
-    old = initial_state_distribution[:]
-    for index in range(number_of_functions):
+    old = np.asarray(initial_state_distribution, dtype=float)
+    for index in range(len(successor_index)):
         new_dist = np.zeros(number_of_states)
-        curr_states = states_list[index]
-        map = {}
-        for state_index in range(len(curr_states)):
-            try:
-                map[str(float(curr_states[state_index]))] = int(state_index)
-            except:
-                map[str(tuple(curr_states[state_index]))] = int(state_index)
-        for j in range(number_of_states):
+        successors = successor_index[index]
+        curr_factor_distribution = np.asarray(factor_distributions[index], dtype=float)
+        for j in range(successors.shape[0]):
             if old[j] != 0.0:
-                curr_factors = factor_list[index]
-                curr_factor_distribution = factor_distributions[index]
-                l = len(curr_factors)
-                for k in range(l):
-                    i = map[str(adjust_input_type(transition_functions[index](curr_states[j], curr_factors[k])))]
-                    new_dist[i] += old[j] * curr_factor_distribution[k]
+                for k in range(successors.shape[1]):
+                    new_dist[successors[j, k]] += old[j] * curr_factor_distribution[k]
         old = new_dist
-    xs = old
-    return np.asarray(xs)
+    return np.asarray(old)
 
-cpdef transition_matrix(list states_list, list factor_list, list factor_distributions, list transition_functions):
+cpdef transition_matrix(list successor_index, list factor_distributions):
     """
-    Calculates the transition matrix by applying the forwarding algorithm.
+    Calculates the transition matrix by applying the forwarding algorithm on the compiled successor index.
+    :param successor_index: compiled successor index of the Markov chain
+    :param factor_distributions: distributions of the factors
     :return: transition matrix
     """
-    cdef int number_of_states = len(states_list[0])
-    cdef int number_of_functions = len(transition_functions)
-    cdef np.ndarray new_transition_matrix
-    cdef np.ndarray curr_states
-    cdef dict map
-    cdef np.ndarray transition_matrix =  np.eye(number_of_states)
-    for index in range(number_of_functions):
+    cdef int index
+    cdef int j
+    cdef int k
+    cdef int number_of_states = len(successor_index[0])
+    cdef Py_ssize_t[:, :] successors
+    cdef double[:] curr_factor_distribution
+    cdef double[:, :] new_transition_matrix
+    cdef np.ndarray transition_matrix = np.eye(number_of_states)
+    for index in range(len(successor_index)):
         new_transition_matrix = np.zeros((number_of_states, number_of_states))
-        curr_states = states_list[index]
-        map = {}
-        for state_index in range(len(curr_states)):
-            try:
-                map[str(float(curr_states[state_index]))] = int(state_index)
-            except:
-                map[str(tuple(curr_states[state_index]))] = int(state_index)
-        for j in range(len(curr_states)):
-            curr_factors = factor_list[index]
-            curr_factor_distribution = factor_distributions[index]
-            l = len(curr_factors)
-            for k in range(l):
-              new_transition_matrix[map[str(adjust_input_type(curr_states[j]))],
-                                            map[str(adjust_input_type(transition_functions[index](curr_states[j], curr_factors[k])))]] \
-                            += curr_factor_distribution[k]
-        transition_matrix = np.dot(transition_matrix, new_transition_matrix)
+        successors = successor_index[index]
+        curr_factor_distribution = np.asarray(factor_distributions[index], dtype=float)
+        for j in range(successors.shape[0]):
+            for k in range(successors.shape[1]):
+                new_transition_matrix[j, successors[j, k]] += curr_factor_distribution[k]
+        transition_matrix = np.dot(transition_matrix, np.asarray(new_transition_matrix))
     return transition_matrix
 
 
@@ -13,6 +13,7 @@
 #  You should have received a copy of the GNU General Public License
 #  along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
 import json
 import os
 import os.path
@@ -20,7 +21,10 @@ import re
 import os.path
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.sparse
 import subprocess
+from FunSpec4DTMC.model.markov_chain.MarkovChainForwardApproach import invalidate_transition_functions
+from FunSpec4DTMC.model.markov_chain.StructuralAnalysis import StructuralAnalysis
 plt.rc('text', usetex=True)
 
 
@@ -1109,6 +1113,9 @@ class FunSpecParser:
                         for line in tf:
                             transition_function.write(line + '\n')
                     transition_function.close()
+            invalidate_transition_functions(
+                'FunSpec4DTMC.model.parser.transition_functions.project{num_project}.mc{num_mc}.TransitionFunctions'.format(
+                    num_project=number_project, num_mc=number_mc))
         except:
             raise IOError
 
@@ -1232,6 +1239,7 @@ class FunSpecParser:
             config["Transition functions"] = transition_functions
             with open(file_path, 'w') as fp:
                 json.dump(config, indent=2, separators=(',', ': '), fp=fp)
+            self.save_structural_analysis(markov_chain, file_path)
         except:
 
             raise IOError
@@ -1249,8 +1257,11 @@ class FunSpecParser:
         print(list(markov_chain.get_state_designations()))
 
         try:
+            transition_matrix = markov_chain.get_transition_matrix()
+            if scipy.sparse.issparse(transition_matrix):
+                transition_matrix = transition_matrix.toarray()
             config = {'Initial state vector': list(markov_chain.get_initial_state_vector()),
-                      'Transition matrix': [line.tolist() for line in list(markov_chain.get_transition_matrix())]
+                      'Transition matrix': [line.tolist() for line in list(transition_matrix)]
                       }
             if markov_chain.get_state_designations() is None:
                 config["State designations"] = None
@@ -1259,18 +1270,77 @@ class FunSpecParser:
             with open(file_path, 'w') as fp:
                 json.dump(config,
                           indent=4, separators=(',', ': '), fp=fp)
+            FunSpecParser.save_structural_analysis(markov_chain, file_path)
         except:
             raise IOError
 
+    @staticmethod
+    def get_structural_analysis_path(file_path):
+        """
+        Returns the path of the structural analysis stored next to a Markov chain file
+        :param file_path: path of the Markov chain file
+        :return: path of the structural analysis file
+        """
+        return os.path.splitext(file_path)[0] + ".structure.npz"
+
+    @staticmethod
+    def get_file_fingerprint(file_path):
+        """
+        Returns the SHA-1 fingerprint of a Markov chain file
+        :param file_path: path of the Markov chain file
+        :return: hexadecimal fingerprint
+        """
+        with open(file_path, 'rb') as fp:
+            return hashlib.sha1(fp.read()).hexdigest()
+
+    @staticmethod
+    def save_structural_analysis(markov_chain, file_path):
+        """
+        Method to store the structural analysis of a Markov chain next to the Markov chain file,
+        nothing is stored if the analysis has not been calculated
+        :param markov_chain: Markov chain whose analysis is stored
+        :param file_path: path of the Markov chain file
+        """
+        structural_analysis = markov_chain.get_structural_analysis()
+        if structural_analysis is not None:
+            structural_analysis.save(FunSpecParser.get_structural_analysis_path(file_path),
+                                     FunSpecParser.get_file_fingerprint(file_path))
+
+    @staticmethod
+    def load_structural_analysis(markov_chain, file_path):
+        """
+        Method to attach the structural analysis stored next to a Markov chain file. The analysis is only used if
+        it has been stored for the current content of the Markov chain file.
+        :param markov_chain: Markov chain loaded from the file
+        :param file_path: path of the Markov chain file
+        """
+        structural_analysis_path = FunSpecParser.get_structural_analysis_path(file_path)
+        if os.path.isfile(structural_analysis_path):
+            try:
+                structural_analysis = StructuralAnalysis.load(structural_analysis_path,
+                                                              FunSpecParser.get_file_fingerprint(file_path))
+            except (OSError, ValueError, KeyError):
+                return
+            if structural_analysis is not None and \
+                    structural_analysis.get_graph().get_number_of_vertices() == markov_chain.get_number_of_states():
+                markov_chain.set_structural_analysis(structural_analysis)
+
     @staticmethod
     def save_matrix(matrix, file_path):
         """
-        Method to store matrix to memory
+        Method to store matrix to memory. Sparse matrices are stored in coordinate format.
         :param matrix: matrix to store
         :param file_path: external file used as storage path
         """
         try:
-            config = {'Transition matrix': matrix.tolist()}
+            if scipy.sparse.issparse(matrix):
+                matrix = matrix.tocoo()
+                config = {'Transition matrix shape': list(matrix.shape),
+                          'Rows': matrix.row.tolist(),
+                          'Columns': matrix.col.tolist(),
+                          'Transition probabilities': matrix.data.tolist()}
+            else:
+                config = {'Transition matrix': matrix.tolist()}
             with open(file_path, 'w') as fp:
                 json.dump(config,
                           indent=4, separators=(',', ': '), fp=fp)
@@ -1378,7 +1448,7 @@ class FunSpecParser:
         tm = markov_chain.get_transition_matrix()
 
 
-        if len(tm[0]) > 10:
+        if tm.shape[1] > 10:
             matrix = []
             for i in range(5):
                 line = []
@@ -1399,6 +1469,8 @@ class FunSpecParser:
                 for j in range(-5, 0):
                     line.append(float(tm[i, j]))
                 matrix.append(line)
+        elif scipy.sparse.issparse(tm):
+            matrix = tm.toarray()
         else:
             matrix = tm
 
@@ -1550,7 +1622,7 @@ class FunSpecParser:
         ax1.get_yaxis().set_visible(False)
         tm = matrix
 
-        if len(matrix[0]) > 10:
+        if matrix.shape[1] > 10:
             matrix = []
             for i in range(5):
                 line = []
@@ -1571,6 +1643,8 @@ class FunSpecParser:
                 for j in range(-5, 0):
                     line.append(float(tm[i, j]))
                 matrix.append(line)
+        elif scipy.sparse.issparse(tm):
+            matrix = tm.toarray()
         else:
             matrix = tm
 
@@ -43,6 +43,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     discretizationPrecisionAdjusted = pyqtSignal(float, name='discretizationPrecisionAdjusted')
     displayPrecisionAdjusted = pyqtSignal(int, name='displayPrecisionAdjusted')
     ignoreInputVisualization = pyqtSignal(bool, name='ignoreInputVisualisation')
+    calculationOptionsSet = pyqtSignal(bool, bool, bool, bool, name='calculationOptionsSet')
+    storedResultsCleared = pyqtSignal(name='storedResultsCleared')
 
     def __init__(self):
         """
@@ -74,6 +76,17 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.QActionGroupResearch = QtWidgets.QActionGroup(self)
         self.QActionGroupResearch.addAction(self.actionResearchUsage)
         self.QActionGroupResearch.addAction(self.actionTeachingUsage)
+        self.menuCalculation = QtWidgets.QMenu("Calculation", self.menuSettings)
+        self.menuCalculation.setObjectName("menuCalculation")
+        self.actionWarmStart = self.menuCalculation.addAction("Warm start from previous results")
+        self.actionSparseMode = self.menuCalculation.addAction("Sparse transition matrices")
+        self.actionParallelChains = self.menuCalculation.addAction("Analyse Markov chains in parallel")
+        self.actionStoreResults = self.menuCalculation.addAction("Store results on disk")
+        for action in (self.actionWarmStart, self.actionSparseMode, self.actionParallelChains,
+                       self.actionStoreResults):
+            action.setCheckable(True)
+        self.actionClearStoredResults = self.menuCalculation.addAction("Clear stored results")
+        self.menuSettings.addAction(self.menuCalculation.menuAction())
 
         icon = QtGui.QIcon()
         icon.addPixmap(QtGui.QPixmap("resources/icons/new_project.ico"), QtGui.QIcon.Normal, QtGui.QIcon.Off)
@@ -102,6 +115,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.actionTrue.toggled.connect(self.adapt_input_visualization)
         self.actionResearchUsage.toggled.connect(self.set_mode)
         self.actionDisplay_plots_of_previous_simulations.toggled.connect(self.set_persistence)
+        self.actionWarmStart.toggled.connect(self.set_calculation_options)
+        self.actionSparseMode.toggled.connect(self.set_calculation_options)
+        self.actionParallelChains.toggled.connect(self.set_calculation_options)
+        self.actionStoreResults.toggled.connect(self.set_calculation_options)
+        self.actionClearStoredResults.triggered.connect(self.clear_stored_results)
         self.activate_new_projects_slots()
 
     def activate_new_projects_slots(self):
@@ -153,6 +171,20 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         self.modeSelected.emit(cythonMode, researchMode)
 
+    def set_calculation_options(self):
+        """
+        Interface method to set the options of the calculation: warm start, sparse mode, parallel Markov chains and
+        the result store
+        """
+        self.calculationOptionsSet.emit(self.actionWarmStart.isChecked(), self.actionSparseMode.isChecked(),
+                                        self.actionParallelChains.isChecked(), self.actionStoreResults.isChecked())
+
+    def clear_stored_results(self):
+        """
+        Interface method to remove the results of the result store
+        """
+        self.storedResultsCleared.emit()
+
     def set_persistence(self):
         """
         Interface method to set the persistence of the visualized results
@@ -266,6 +298,20 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         """
         self.currentProjectTab.set_current_mc_type(type)
 
+    def set_calculation_progress(self, calculation_progress):
+        """
+        Method to hand over the calculation progress of the current project
+        :param calculation_progress: CalculationProgress of the project
+        """
+        self.currentProjectTab.set_calculation_progress(calculation_progress)
+
+    def set_analysis_executor(self, analysis_executor):
+        """
+        Method to hand over the analysis executor of the current project
+        :param analysis_executor: AnalysisExecutor of the project
+        """
+        self.currentProjectTab.set_analysis_executor(analysis_executor)
+
     def update_calculation_characteristics(self, steps: int, norm: float):
         """
         Method to update the calculation caracteristivs in the GUI
@@ -18,16 +18,18 @@ from PyQt5.QtWidgets import QDialog
 from matplotlib.backends.backend_qt5agg import (
     FigureCanvasQTAgg as FigureCanvas,
     NavigationToolbar2QT as NavigationToolbar)
-import time
 import numpy as np
 from FunSpec4DTMC.view.ui_projecttab import Ui_ProjectTab
 from FunSpec4DTMC.view.inputdialog import InputDialog
 from FunSpec4DTMC.view.functionalinput import FunctionalInput
 from FunSpec4DTMC.view.strategyselectiondialog import StrategySelectionDialog
+from FunSpec4DTMC.view.ErrorDialogs.calculationerror import CalculationError
 
 
 class ProjectTab(QDialog, Ui_ProjectTab):
 
+    analysisFinished = QtCore.pyqtSignal(object, object)
+
     def __init__(self):
         """
         Constructor of the class ProjectTab
@@ -45,7 +47,10 @@ class ProjectTab(QDialog, Ui_ProjectTab):
         """
         self.inputDialog = InputDialog()
         self.strategySelectionDialog = StrategySelectionDialog()
-        self._cancel_analysis = False
+        self._calculation_progress = None
+        self._analysis_executor = None
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(100)
         self._bind_signals()
         self.scrollArea.setVisible(False)
 
@@ -56,6 +61,8 @@ class ProjectTab(QDialog, Ui_ProjectTab):
         self.pushButton_addMC.clicked.connect(self.set_markov_chain)
         self.pushButton_chMethod.clicked.connect(self.choose_strategy)
         self.pushButton_cancelAnalysis.clicked.connect(self.cancel_analysis)
+        self._progress_timer.timeout.connect(self.show_calculation_progress)
+        self.analysisFinished.connect(self.present_analysis)
 
     def set_markov_chain(self):
         """
@@ -68,7 +75,6 @@ class ProjectTab(QDialog, Ui_ProjectTab):
         """
         Method to start the strategy selection dialoque
         """
-        self._cancel_analysis = False
         self.strategySelectionDialog.set_conditional_visualisation()
         self.strategySelectionDialog.exec()
 
@@ -119,11 +125,54 @@ class ProjectTab(QDialog, Ui_ProjectTab):
         self.pushButton_chMethod.setEnabled(True)
         self.pushButton_cancelAnalysis.setEnabled(True)
 
+    def set_calculation_progress(self, calculation_progress):
+        """
+        Method to set the calculation progress of the project, its state is pulled periodically
+        :param calculation_progress: CalculationProgress of the project
+        """
+        self._calculation_progress = calculation_progress
+        self._progress_timer.start()
+
+    def set_analysis_executor(self, analysis_executor):
+        """
+        Method to set the analysis executor of the project, the results of the workers are passed to the thread of
+        the user interface with the signal analysisFinished
+        :param analysis_executor: AnalysisExecutor of the project
+        """
+        self._analysis_executor = analysis_executor
+        self._analysis_executor.set_result_listener(self.analysisFinished.emit)
+
+    def present_analysis(self, presentation, result):
+        """
+        Method to present the result of an analysis on the thread of the user interface, cancelled analyses are
+        dropped without a message
+        :param presentation: presentation function
+        :param result: result of the analysis
+        """
+        try:
+            presentation(result)
+        except InterruptedError:
+            pass
+        except Exception:
+            error_dialog = CalculationError()
+            error_dialog.exec()
+
+    def show_calculation_progress(self):
+        """
+        Method to show the latest state of the calculation progress
+        """
+        if self._calculation_progress is not None:
+            steps, norm = self._calculation_progress.get_state()
+            self.le_currentStep.setText(str(steps))
+            self.le_currentPrecision.setText(str(norm))
+
     def cancel_analysis(self):
         """
-        Method to initiate the analysis termination
+        Method to initiate the analysis termination, pending analyses are dropped and the running calculations stop
+        at their next step
         """
-        self._cancel_analysis = True
+        if self._analysis_executor is not None:
+            self._analysis_executor.cancel()
 
     def visualize_input(self, input_plots: list):
         """
@@ -204,8 +253,4 @@ class ProjectTab(QDialog, Ui_ProjectTab):
         self.le_currentStep.setText(str(steps))
         self.le_currentPrecision.setText(str(norm))
         QtCore.QCoreApplication.processEvents()
-        if self._cancel_analysis:
-            self._cancel_analysis = False
-            raise KeyboardInterrupt
-        time.sleep(0.01)
 
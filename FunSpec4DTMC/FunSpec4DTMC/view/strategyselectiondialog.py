@@ -138,6 +138,8 @@ class StrategySelectionDialog(QDialog, Ui_StrategySelectionDialog):
         """
         if self.cb_strategy.currentText() == "MCS - Direct approach":
             return self.cb_directScheme.currentText()
+        elif self.cb_strategy.currentText() == "MCS - Krylov subspace":
+            return self.cb_krylovScheme.currentText()
         else:
             return ""
 
@@ -244,6 +246,7 @@ class StrategySelectionDialog(QDialog, Ui_StrategySelectionDialog):
         self.cb_steps.setEnabled(True)
         self.la_directScheme.setVisible(False)
         self.cb_directScheme.setVisible(False)
+        self.cb_krylovScheme.setVisible(False)
         self.cb_transitionMatrix.setVisible(False)
 
         self.cb_saveSSD.setEnabled(False)
@@ -271,6 +274,12 @@ class StrategySelectionDialog(QDialog, Ui_StrategySelectionDialog):
             self.cb_strategy.model().item(3).setEnabled(False)
             self.cb_strategy.model().item(4).setEnabled(False)
             self.cb_strategy.model().item(5).setEnabled(False)
+            self.cb_strategy.model().item(7).setEnabled(False)
+            self.cb_strategy.model().item(8).setEnabled(False)
+            self.cb_strategy.model().item(9).setEnabled(False)
+            self.cb_strategy.model().item(10).setEnabled(False)
+            self.cb_strategy.model().item(11).setEnabled(False)
+            self.cb_strategy.model().item(12).setEnabled(False)
             self.cb_strategy.setCurrentIndex(6)
 
 
@@ -312,6 +321,21 @@ class StrategySelectionDialog(QDialog, Ui_StrategySelectionDialog):
             self.la_directScheme.setVisible(True)
             self.cb_directScheme.setVisible(True)
 
+        elif self.cb_strategy.currentText() == "MCS - Krylov subspace":
+            self.cb_alphaRelaxation.setEnabled(False)
+            self.la_directScheme.setVisible(True)
+            self.cb_krylovScheme.setVisible(True)
+
+        elif self.cb_strategy.currentText() == "MCS - Gauss-Seidel":
+            self.cb_alphaRelaxation.setEnabled(False)
+
+        elif self.cb_strategy.currentText() in ("MCS - Decomposition approach", "MCS - Periodic approach"):
+            self.cb_alphaRelaxation.setEnabled(False)
+            self.cb_steps.setEnabled(False)
+
+        elif self.cb_strategy.currentText() == "MCS - Aggregation-disaggregation":
+            self.cb_alphaRelaxation.setEnabled(False)
+
         if not self.cb_strategy.currentText() == "MCS - Random walk":
             self.cb_randomWalk.setChecked(False)
             self.cb_evoSt.setChecked(False)
@@ -41,6 +41,13 @@ class Ui_StrategySelectionDialog(object):
         self.cb_strategy.addItem("")
         self.cb_strategy.addItem("")
         self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
+        self.cb_strategy.addItem("")
         self.te_steps = QtWidgets.QTextEdit(self.widget)
         self.te_steps.setEnabled(False)
         self.te_steps.setGeometry(QtCore.QRect(840, 90, 81, 31))
@@ -197,6 +204,13 @@ class Ui_StrategySelectionDialog(object):
         self.cb_directScheme.setObjectName("cb_directScheme")
         self.cb_directScheme.addItem("")
         self.cb_directScheme.addItem("")
+        self.cb_directScheme.addItem("")
+        self.cb_krylovScheme = QtWidgets.QComboBox(self.widget)
+        self.cb_krylovScheme.setGeometry(QtCore.QRect(650, 229, 271, 31))
+        self.cb_krylovScheme.setObjectName("cb_krylovScheme")
+        self.cb_krylovScheme.addItem("")
+        self.cb_krylovScheme.addItem("")
+        self.cb_krylovScheme.addItem("")
         self.cb_transitionMatrix = QtWidgets.QCheckBox(self.widget)
         self.cb_transitionMatrix.setGeometry(QtCore.QRect(170, 730, 761, 51))
         font = QtGui.QFont()
@@ -276,6 +290,13 @@ class Ui_StrategySelectionDialog(object):
         self.cb_strategy.setItemText(4, _translate("StrategySelectionDialog", "MCS - Matrix powering"))
         self.cb_strategy.setItemText(5, _translate("StrategySelectionDialog", "MCS - Direct approach"))
         self.cb_strategy.setItemText(6, _translate("StrategySelectionDialog", "MCS - Forward approach"))
+        self.cb_strategy.setItemText(7, _translate("StrategySelectionDialog", "MCS - Krylov subspace"))
+        self.cb_strategy.setItemText(8, _translate("StrategySelectionDialog", "MCS - Jacobi"))
+        self.cb_strategy.setItemText(9, _translate("StrategySelectionDialog", "MCS - Gauss-Seidel"))
+        self.cb_strategy.setItemText(10, _translate("StrategySelectionDialog", "MCS - SOR"))
+        self.cb_strategy.setItemText(11, _translate("StrategySelectionDialog", "MCS - Decomposition approach"))
+        self.cb_strategy.setItemText(12, _translate("StrategySelectionDialog", "MCS - Periodic approach"))
+        self.cb_strategy.setItemText(13, _translate("StrategySelectionDialog", "MCS - Aggregation-disaggregation"))
         self.te_steps.setHtml(_translate("StrategySelectionDialog", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
 "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
 "p, li { white-space: pre-wrap; }\n"
@@ -313,6 +334,10 @@ class Ui_StrategySelectionDialog(object):
         self.la_directScheme.setText(_translate("StrategySelectionDialog", "Calculation scheme:"))
         self.cb_directScheme.setItemText(0, _translate("StrategySelectionDialog", "Gaussian scheme"))
         self.cb_directScheme.setItemText(1, _translate("StrategySelectionDialog", "Inverse iteration scheme"))
+        self.cb_directScheme.setItemText(2, _translate("StrategySelectionDialog", "Sparse LU scheme"))
+        self.cb_krylovScheme.setItemText(0, _translate("StrategySelectionDialog", "GMRES"))
+        self.cb_krylovScheme.setItemText(1, _translate("StrategySelectionDialog", "BiCGSTAB"))
+        self.cb_krylovScheme.setItemText(2, _translate("StrategySelectionDialog", "Arnoldi"))
         self.cb_transitionMatrix.setText(_translate("StrategySelectionDialog", "  Visualize transition matrix"))
         self.cb_saveSSD.setText(_translate("StrategySelectionDialog", "  Save results in external directory"))
         self.cb_saveTM.setText(_translate("StrategySelectionDialog", "  Save results in external directory"))
@@ -0,0 +1,79 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+from FunSpec4DTMC.model.markov_chain.MarkovChainConventionalApproach import MarkovChainConventionalApproach
+from FunSpec4DTMC.model.markov_chain.MarkovChainForwardApproach import MarkovChainForwardApproach
+
+PRECISION = 1e-12
+
+# irreducible aperiodic birth-death chain, stationary distribution [6, 10, 5] / 21
+IRREDUCIBLE = [[.5, .5, 0], [.3, .4, .3], [0, .6, .4]]
+IRREDUCIBLE_DISTRIBUTION = [6 / 21, 10 / 21, 5 / 21]
+
+# state 0 is absorbing, the other states are transient
+ABSORBING = [[1, 0, 0], [.3, .4, .3], [0, .6, .4]]
+ABSORBING_DISTRIBUTION = [1, 0, 0]
+
+# closed classes {0} and {2}, started in the transient state 1 both are reached with probability 1/2
+REDUCIBLE = [[1, 0, 0], [.3, .4, .3], [0, 0, 1]]
+REDUCIBLE_DISTRIBUTION = [.5, 0, .5]
+
+# cycle of period 3
+PERIODIC = [[0, 1, 0], [0, 0, 1], [1, 0, 0]]
+PERIODIC_DISTRIBUTION = [1 / 3, 1 / 3, 1 / 3]
+
+# factors and probabilities of the functional birth-death chain of forward_birth_death
+BIRTH_DEATH_FACTORS = [-1.0, 0.0, 1.0]
+BIRTH_DEATH_PROBABILITIES = [.4, .3, .3]
+
+
+def birth_death_distribution(number_of_states: int, p: float, q: float):
+    """
+    Stationary distribution of a birth-death chain with reflecting boundaries
+    :param number_of_states: number of states
+    :param p: probability of a birth
+    :param q: probability of a death
+    :return: stationary distribution
+    """
+    distribution = (p / q) ** np.arange(number_of_states)
+    return distribution / distribution.sum()
+
+
+def conventional_chain(transition_matrix, initial_state: int = 0, sparse: bool = False):
+    """
+    Creates a conventional Markov chain started in a single state
+    :param transition_matrix: transition matrix
+    :param initial_state: index of the initial state
+    :param sparse: sparse storage of the transition matrix
+    :return: MarkovChainConventionalApproach
+    """
+    transition_matrix = np.array(transition_matrix, dtype=float)
+    initial_state_vector = np.zeros(len(transition_matrix))
+    initial_state_vector[initial_state] = 1
+    return MarkovChainConventionalApproach(initial_state_vector, transition_matrix, None, sparse)
+
+
+@pytest.fixture
+def forward_chain():
+    """
+    Functional birth-death chain on the states 0 to 5
+    :return: MarkovChainForwardApproach
+    """
+    initial_state_vector = np.zeros(6)
+    initial_state_vector[0] = 1
+    return MarkovChainForwardApproach(initial_state_vector, None, [BIRTH_DEATH_FACTORS], None,
+                                      [np.array(BIRTH_DEATH_PROBABILITIES)], "forward_birth_death",
+                                      [np.arange(6, dtype=float)])
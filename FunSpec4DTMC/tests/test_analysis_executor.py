@@ -0,0 +1,58 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import functools
+import threading
+import pytest
+from FunSpec4DTMC.model.AnalysisExecutor import AnalysisExecutor
+from FunSpec4DTMC.model.CalculationProgress import CalculationProgress
+
+
+def endless_calculation(calculation_progress: CalculationProgress, started: threading.Event):
+    step = 0
+    started.set()
+    while True:
+        step += 1
+        calculation_progress.update(step)
+
+
+def test_cancelled_analysis_stays_cancelled():
+    calculation_progress = CalculationProgress()
+    executor = AnalysisExecutor(max_workers=2)
+    started = threading.Event()
+    try:
+        cancelled_progress = calculation_progress.create_job_progress()
+        cancelled = executor.submit(functools.partial(endless_calculation, cancelled_progress, started),
+                                    lambda result: None, calculation_progress=cancelled_progress)
+        assert started.wait(5)
+        executor.cancel()
+        job_progress = calculation_progress.create_job_progress()
+        finished = executor.submit(lambda: job_progress.update(1) or "finished", lambda result: None,
+                                   calculation_progress=job_progress)
+        assert finished.result(5) == "finished"
+        with pytest.raises(InterruptedError):
+            cancelled.result(5)
+        assert cancelled_progress.is_cancelled()
+        assert not job_progress.is_cancelled() and not calculation_progress.is_cancelled()
+    finally:
+        executor.shutdown()
+
+
+def test_job_progress_is_forwarded():
+    calculation_progress = CalculationProgress()
+    job_progress = calculation_progress.create_job_progress()
+    job_progress.update(3, .5)
+    assert calculation_progress.get_state() == (3, .5)
@@ -0,0 +1,35 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, REDUCIBLE, \
+    REDUCIBLE_DISTRIBUTION, conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSDirectApproach import MCSDirectApproach
+
+
+@pytest.mark.parametrize("research_mode", [False, True])
+@pytest.mark.parametrize("scheme", ["Gaussian scheme", "Sparse LU scheme"])
+def test_direct_approach(research_mode, scheme):
+    simulator = MCSDirectApproach(research_mode, scheme, conventional_chain(IRREDUCIBLE))
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), IRREDUCIBLE_DISTRIBUTION)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("transition_matrix, expected", [(ABSORBING, ABSORBING_DISTRIBUTION),
+                                                         (REDUCIBLE, REDUCIBLE_DISTRIBUTION)])
+def test_sparse_lu_reducible(sparse, transition_matrix, expected):
+    simulator = MCSDirectApproach(False, "Sparse LU scheme", conventional_chain(transition_matrix, 1, sparse=sparse))
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), expected, atol=1e-12)
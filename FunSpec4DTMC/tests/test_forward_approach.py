@@ -0,0 +1,66 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, birth_death_distribution
+from FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach import MCSForwardApproach
+
+
+def test_stationary_state_distribution(forward_chain):
+    simulator = MCSForwardApproach(forward_chain)
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0),
+                               birth_death_distribution(6, .3, .4), atol=1e-9)
+
+
+def test_state_distributions(forward_chain):
+    simulator = MCSForwardApproach(forward_chain)
+    simulator.set_calculation_precision(PRECISION)
+    state_distributions = simulator.calculate_state_distributions(np.eye(6))
+    np.testing.assert_allclose(state_distributions, np.tile(birth_death_distribution(6, .3, .4), (6, 1)), atol=1e-9)
+
+
+@pytest.mark.parametrize("sparse_mode", [False, True])
+def test_transition_matrix(forward_chain, sparse_mode):
+    transition_matrix = MCSForwardApproach(forward_chain, sparseMode=sparse_mode).calculate_transition_matrix()
+    if sparse_mode:
+        transition_matrix = transition_matrix.toarray()
+    expected = np.diag([.3] * 5, 1) + np.diag([.4] * 5, -1) + np.diag([.7, .3, .3, .3, .3, .6])
+    np.testing.assert_allclose(transition_matrix, expected)
+
+
+@pytest.mark.skipif(not MCSForwardApproach.is_cython_available(), reason="forward algorithm not compiled")
+def test_cython_mode(forward_chain):
+    simulator = MCSForwardApproach(forward_chain, cythonMode=True)
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0),
+                               birth_death_distribution(6, .3, .4), atol=1e-9)
+    np.testing.assert_allclose(simulator.calculate_transition_matrix(),
+                               MCSForwardApproach(forward_chain).calculate_transition_matrix())
+
+
+def test_cython_mode_without_extension(monkeypatch):
+    monkeypatch.setattr("FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach.FA", None)
+    with pytest.raises(ImportError):
+        MCSForwardApproach(cythonMode=True)
+
+
+def test_single_vector_iteration_is_capped(forward_chain):
+    simulator = MCSForwardApproach(forward_chain)
+    simulator.set_calculation_precision(0)
+    simulator.set_maximum_iterations(50)
+    with pytest.raises(ArithmeticError):
+        simulator.calculate_stationary_state_distribution(0)
@@ -0,0 +1,46 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, REDUCIBLE, \
+    conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSKrylovSubspace import MCSKrylovSubspace
+
+SCHEMES = ["GMRES", "BiCGSTAB", "Arnoldi"]
+TRANSIENT_LAST = [[.4, .6, 0, 0], [.2, .8, 0, 0], [.3, 0, .4, .3], [0, .5, .2, .3]]
+# closed class with period 5, the layers {0, 1}, {2}, {3}, {4}, {5} are passed cyclically
+PERIOD_5 = [[0, 0, 1, 0, 0, 0], [0, 0, 1, 0, 0, 0], [0, 0, 0, 1, 0, 0], [0, 0, 0, 0, 1, 0], [0, 0, 0, 0, 0, 1],
+            [.3, .7, 0, 0, 0, 0]]
+PERIOD_5_DISTRIBUTION = [.06, .14, .2, .2, .2, .2]
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+@pytest.mark.parametrize("transition_matrix, expected, initial_state",
+                         [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, 0), (ABSORBING, ABSORBING_DISTRIBUTION, 1),
+                          (TRANSIENT_LAST, [.25, .75, 0, 0], 3), (PERIOD_5, PERIOD_5_DISTRIBUTION, 0)])
+def test_krylov_subspace(scheme, transition_matrix, expected, initial_state):
+    simulator = MCSKrylovSubspace(scheme, conventional_chain(transition_matrix, initial_state, sparse=True))
+    simulator.set_calculation_precision(PRECISION)
+    state_distribution = simulator.calculate_stationary_state_distribution(0)
+    assert np.all(state_distribution >= 0)
+    np.testing.assert_allclose(state_distribution, expected, atol=1e-10)
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_krylov_subspace_reducible(scheme):
+    simulator = MCSKrylovSubspace(scheme, conventional_chain(REDUCIBLE, 1))
+    with pytest.raises(ValueError):
+        simulator.calculate_stationary_state_distribution(0)
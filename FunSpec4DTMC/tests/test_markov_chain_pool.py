@@ -0,0 +1,57 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, REDUCIBLE, conventional_chain
+from FunSpec4DTMC.model.CalculationProgress import CalculationProgress
+from FunSpec4DTMC.model.MarkovChainPool import MarkovChainPool, share_array, create_cancellation_listener
+from FunSpec4DTMC.model.markov_chain_simulator.MCSLimitingDistribution import MCSLimitingDistribution
+
+
+def test_cancelled_call_does_not_affect_the_next_call():
+    calculation_progress = CalculationProgress()
+    pool = MarkovChainPool(max_workers=2, calculation_progress=calculation_progress)
+    simulator = MCSLimitingDistribution()
+    simulator.set_calculation_precision(PRECISION)
+    try:
+        calculation_progress.cancel()
+        with pytest.raises(InterruptedError):
+            pool.map(simulator, [conventional_chain(IRREDUCIBLE)], "stationary state distribution", (0, 1, 1))
+        calculation_progress.reset()
+        results = pool.map(simulator, [conventional_chain(IRREDUCIBLE), conventional_chain(REDUCIBLE, 1)],
+                           "stationary state distribution", (0, 1, 1))
+    finally:
+        pool.shutdown()
+    np.testing.assert_allclose(results[0], np.array([6, 10, 5]) / 21, atol=1e-10)
+    np.testing.assert_allclose(results[1], [.5, 0, .5], atol=1e-10)
+
+
+def test_cancellation_flags_are_independent():
+    _, block = share_array(np.zeros(1, dtype=np.bool_))
+    _, other_block = share_array(np.zeros(1, dtype=np.bool_))
+    try:
+        flag = np.ndarray(1, dtype=np.bool_, buffer=block.buf)
+        other_flag = np.ndarray(1, dtype=np.bool_, buffer=other_block.buf)
+        flag[0] = True
+        with pytest.raises(InterruptedError):
+            create_cancellation_listener(flag)(1)
+        create_cancellation_listener(other_flag)(1)
+        del flag, other_flag
+    finally:
+        for shared_block in (block, other_block):
+            shared_block.close()
+            shared_block.unlink()
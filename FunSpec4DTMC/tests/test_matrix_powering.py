@@ -0,0 +1,44 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, REDUCIBLE, \
+    REDUCIBLE_DISTRIBUTION, PERIODIC, PERIODIC_DISTRIBUTION, conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSMatrixPowering import MCSMatrixPowering
+
+
+@pytest.mark.parametrize("sparse_mode", [False, True])
+@pytest.mark.parametrize("transition_matrix, expected, initial_state",
+                         [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, 0), (ABSORBING, ABSORBING_DISTRIBUTION, 1),
+                          (REDUCIBLE, REDUCIBLE_DISTRIBUTION, 1), (PERIODIC, PERIODIC_DISTRIBUTION, 0)])
+def test_matrix_powering(sparse_mode, transition_matrix, expected, initial_state):
+    simulator = MCSMatrixPowering(conventional_chain(transition_matrix, initial_state), sparseMode=sparse_mode)
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), expected, atol=1e-10)
+
+
+def test_limit_matrix():
+    simulator = MCSMatrixPowering(conventional_chain(REDUCIBLE))
+    simulator.set_calculation_precision(PRECISION)
+    state_distributions = simulator.calculate_state_distributions(np.eye(3))
+    np.testing.assert_allclose(state_distributions, [[1, 0, 0], [.5, 0, .5], [0, 0, 1]], atol=1e-10)
+
+
+def test_fixed_number_of_squarings():
+    simulator = MCSMatrixPowering(conventional_chain(IRREDUCIBLE))
+    transition_matrix = np.array(IRREDUCIBLE)
+    state_distributions = simulator.calculate_state_distributions(np.eye(3)[:1], 2, 1, specified_period=1)
+    np.testing.assert_allclose(state_distributions, np.linalg.matrix_power(transition_matrix, 4)[:1], atol=1e-12)
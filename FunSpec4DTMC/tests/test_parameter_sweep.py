@@ -0,0 +1,73 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import csv
+import sys
+import numpy as np
+import pytest
+from FunSpec4DTMC.model.Systems.ParameterSweep import ParameterSweep, create_markov_chain, get_point_input
+from FunSpec4DTMC.model.markov_chain_simulator.MCSForwardApproach import MCSForwardApproach
+
+TRANSITION_FUNCTIONS = ("def transition_function1(state, factor):\n    return min(state + factor, Qmax * service_time)\n \n"
+                        "def transition_function2(state, factor):\n    return max(state - factor, 0.0)\n \n")
+
+SYSTEM_INPUT = [{"name": "Exponential distribution", "rate": "1.0", "maximum": "10"},
+                {"name": "Exponential distribution", "rate": "1.0", "maximum": "10"},
+                1.0, 5, TRANSITION_FUNCTIONS]
+
+GRIDS = {"Qmax": [4, 6], "arrival time distribution.rate": [0.5, 1.0, 2.0]}
+
+
+def transition_matrix(parameters, settings):
+    module_name = "_test_parameter_sweep"
+    try:
+        markov_chain = create_markov_chain(get_point_input(SYSTEM_INPUT, parameters), settings, module_name)
+        return MCSForwardApproach(markov_chain).calculate_transition_matrix()
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+def test_sweep_writes_one_row_per_point(tmp_path):
+    results_file_path = str(tmp_path / "results.csv")
+    sweep = ParameterSweep(SYSTEM_INPUT, GRIDS, results_file_path, max_workers=2)
+    sweep.set_calculation_precision(1e-12)
+    progress = []
+    assert sweep.run(lambda finished, number_of_points: progress.append((finished, number_of_points))) == 6
+    assert progress[-1] == (6, 6)
+    with open(results_file_path, newline="") as results_file:
+        rows = list(csv.DictReader(results_file))
+    assert sorted((int(row["Qmax"]), float(row["arrival time distribution.rate"])) for row in rows) == \
+        [(q_max, rate) for q_max in GRIDS["Qmax"] for rate in GRIDS["arrival time distribution.rate"]]
+    for row in rows:
+        assert row["error"] == ""
+        q_max = int(row["Qmax"])
+        assert int(row["number of states"]) == q_max + 2
+        state_distribution = np.array(row["stationary state distribution"].split(), dtype=float)
+        assert abs(state_distribution.sum() - 1) < 1e-9
+        parameters = {"Qmax": q_max, "arrival time distribution.rate": row["arrival time distribution.rate"]}
+        np.testing.assert_allclose(state_distribution @ transition_matrix(parameters, sweep.get_settings()),
+                                   state_distribution, atol=1e-9)
+
+
+def test_listener_error_interrupts_the_sweep(tmp_path):
+    sweep = ParameterSweep(SYSTEM_INPUT, GRIDS, str(tmp_path / "results.csv"), max_workers=2)
+
+    def listener(finished, number_of_points):
+        raise ValueError("listener failed")
+
+    with pytest.raises(InterruptedError) as error:
+        sweep.run(listener)
+    assert isinstance(error.value.__cause__, ValueError)
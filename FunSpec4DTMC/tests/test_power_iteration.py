@@ -0,0 +1,74 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, REDUCIBLE, \
+    PERIODIC, PERIODIC_DISTRIBUTION, conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSCesaroLimit import MCSCesaroLimit
+from FunSpec4DTMC.model.markov_chain_simulator.MCSLimitingDistribution import MCSLimitingDistribution
+from FunSpec4DTMC.model.markov_chain_simulator.MCSModifiedCesaroLimit import MCSModifiedCesaroLimit
+
+STRATEGIES = [MCSLimitingDistribution, MCSCesaroLimit, MCSModifiedCesaroLimit]
+# the Cesaro sums damp the eigenvalue l of P only with n^(l - 1)
+CESARO_PRECISION = 1e-6
+
+
+def create_simulator(strategy, transition_matrix, initial_state=0, sparse=False):
+    simulator = strategy(conventional_chain(transition_matrix, initial_state, sparse=sparse))
+    simulator.set_calculation_precision(CESARO_PRECISION if strategy is MCSCesaroLimit else PRECISION)
+    return simulator
+
+
+@pytest.mark.parametrize("strategy", [MCSLimitingDistribution, MCSModifiedCesaroLimit])
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("transition_matrix, expected, initial_state",
+                         [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, 0), (ABSORBING, ABSORBING_DISTRIBUTION, 1)])
+def test_power_iteration(strategy, sparse, transition_matrix, expected, initial_state):
+    simulator = create_simulator(strategy, transition_matrix, initial_state, sparse)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), expected, atol=1e-10)
+
+
+@pytest.mark.parametrize("transition_matrix, expected", [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION),
+                                                         (PERIODIC, PERIODIC_DISTRIBUTION)])
+def test_cesaro_limit(transition_matrix, expected):
+    simulator = create_simulator(MCSCesaroLimit, transition_matrix)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(20000), expected, atol=5e-3)
+
+
+def test_modified_cesaro_periodic():
+    simulator = MCSModifiedCesaroLimit(conventional_chain(PERIODIC))
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0, specified_period=0),
+                               PERIODIC_DISTRIBUTION)
+
+
+def test_limiting_distribution_periodic_maximum_iterations():
+    simulator = MCSLimitingDistribution(conventional_chain(PERIODIC))
+    simulator.set_calculation_precision(PRECISION)
+    simulator.set_maximum_iterations(100)
+    with pytest.raises(ArithmeticError):
+        simulator.calculate_stationary_state_distribution(0)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+@pytest.mark.parametrize("simulation_steps", [0, 50])
+def test_state_distributions(strategy, simulation_steps):
+    simulator = create_simulator(strategy, REDUCIBLE)
+    initial_state_vectors = np.eye(3)
+    state_distributions = simulator.calculate_state_distributions(initial_state_vectors, simulation_steps)
+    for initial_state_vector, state_distribution in zip(initial_state_vectors, state_distributions):
+        single = create_simulator(strategy, REDUCIBLE, int(np.argmax(initial_state_vector)))
+        np.testing.assert_allclose(state_distribution, single.calculate_stationary_state_distribution(simulation_steps))
@@ -0,0 +1,54 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSRandomWalk import MCSRandomWalk
+
+
+@pytest.mark.parametrize("simulation_steps", [0, 200000])
+def test_random_walk(simulation_steps):
+    np.random.seed(1)
+    simulator = MCSRandomWalk(conventional_chain(IRREDUCIBLE))
+    simulator.set_calculation_precision(1e-6)
+    state_distribution = simulator.calculate_stationary_state_distribution(simulation_steps)
+    assert np.sum(state_distribution) == pytest.approx(1)
+    np.testing.assert_allclose(state_distribution, IRREDUCIBLE_DISTRIBUTION, atol=1e-2)
+
+
+def test_replicated_random_walk():
+    simulator = MCSRandomWalk(conventional_chain(IRREDUCIBLE), replications=4, seed=1)
+    state_distribution = simulator.calculate_stationary_state_distribution(100000)
+    np.testing.assert_allclose(state_distribution, IRREDUCIBLE_DISTRIBUTION, atol=1e-2)
+    (lower, upper) = simulator.get_confidence_intervals()
+    assert np.all(lower <= upper)
+
+
+def test_unseeded_random_walk_is_not_cached():
+    markov_chain = conventional_chain(IRREDUCIBLE)
+    simulator = MCSRandomWalk(markov_chain)
+    first = simulator.get_stationary_state_distribution(1000)
+    assert markov_chain.get_cached_stationary_state_distribution(simulator.get_result_key(1000)) is None
+    assert not np.array_equal(simulator.get_stationary_state_distribution(1000), first)
+
+
+def test_seeded_random_walk_is_reproducible():
+    markov_chain = conventional_chain(IRREDUCIBLE)
+    first = MCSRandomWalk(markov_chain, seed=3).calculate_stationary_state_distribution(1000)
+    np.testing.assert_array_equal(MCSRandomWalk(markov_chain, seed=3).calculate_stationary_state_distribution(1000),
+                                  first)
+    simulator = MCSRandomWalk(markov_chain, seed=3)
+    assert simulator.get_stationary_state_distribution(1000) is simulator.get_stationary_state_distribution(1000)
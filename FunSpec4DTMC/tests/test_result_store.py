@@ -0,0 +1,83 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from conftest import PRECISION, IRREDUCIBLE, conventional_chain
+from FunSpec4DTMC.model.ResultStore import ResultStore
+from FunSpec4DTMC.model.markov_chain_simulator.MCSLimitingDistribution import MCSLimitingDistribution
+
+
+def test_stored_result_is_found_again(tmp_path):
+    result_store = ResultStore(str(tmp_path))
+    simulator = MCSLimitingDistribution(conventional_chain(IRREDUCIBLE))
+    simulator.set_calculation_precision(PRECISION)
+    simulator.set_result_store(result_store)
+    expected = simulator.get_stationary_state_distribution(0)
+    other_simulator = MCSLimitingDistribution(conventional_chain(IRREDUCIBLE))
+    other_simulator.set_calculation_precision(PRECISION)
+    other_simulator.set_result_store(result_store)
+    steps = []
+    other_simulator.add_calculation_listener(lambda step, norm: steps.append(step))
+    np.testing.assert_allclose(other_simulator.get_stationary_state_distribution(0), expected)
+    assert steps == []
+
+
+def test_concurrent_writes(tmp_path):
+    result_store = ResultStore(str(tmp_path))
+    fingerprint = ResultStore.get_fingerprint(conventional_chain(IRREDUCIBLE))
+    distributions = [np.full(1000, index, dtype=float) for index in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda distribution: result_store.save_stationary_state_distribution(
+            fingerprint, ("key",), distribution), distributions))
+    stored = result_store.load_stationary_state_distribution(fingerprint, ("key",))
+    assert any(np.array_equal(stored, distribution) for distribution in distributions)
+    assert os.listdir(os.path.dirname(result_store.get_path(fingerprint, ""))) == [os.path.basename(
+        result_store.get_stationary_state_distribution_path(fingerprint, ("key",)))]
+
+
+def test_size_limit_removes_least_recently_used_chains(tmp_path):
+    result_store = ResultStore(str(tmp_path), max_size=3 * 8128 + 1000)
+    fingerprints = ["{index:040x}".format(index=index) for index in range(5)]
+    for time, fingerprint in enumerate(fingerprints):
+        result_store.save_stationary_state_distribution(fingerprint, ("key",), np.zeros(1000))
+        os.utime(os.path.dirname(result_store.get_path(fingerprint, "")), (time, time))
+    assert result_store.get_size() <= result_store.get_max_size()
+    assert result_store.load_stationary_state_distribution(fingerprints[0], ("key",)) is None
+    assert result_store.load_stationary_state_distribution(fingerprints[-1], ("key",)) is not None
+
+
+def test_clear(tmp_path):
+    result_store = ResultStore(str(tmp_path / "results"))
+    fingerprint = ResultStore.get_fingerprint(conventional_chain(IRREDUCIBLE))
+    result_store.save_stationary_state_distribution(fingerprint, ("key",), np.ones(3) / 3)
+    assert result_store.get_size() > 0
+    result_store.clear()
+    assert result_store.get_size() == 0
+    assert result_store.load_stationary_state_distribution(fingerprint, ("key",)) is None
+
+
+def test_fingerprint_is_kept_until_the_chain_changes():
+    markov_chain = conventional_chain(IRREDUCIBLE)
+    fingerprint = ResultStore.get_fingerprint(markov_chain)
+    assert markov_chain.get_fingerprint() == fingerprint
+    markov_chain.set_transition_probability(0, 0, .49)
+    markov_chain.set_transition_probability(0, 1, .51)
+    assert markov_chain.get_fingerprint() is None
+    changed_fingerprint = ResultStore.get_fingerprint(markov_chain)
+    assert changed_fingerprint != fingerprint
+    markov_chain.set_initial_state_vector(np.array([0, 1.0, 0]))
+    assert ResultStore.get_fingerprint(markov_chain) not in (fingerprint, changed_fingerprint)
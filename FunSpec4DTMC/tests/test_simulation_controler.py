@@ -0,0 +1,95 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, REDUCIBLE
+from FunSpec4DTMC.model.SimulationControler import SimulationControler
+
+
+def create_controler():
+    controler = SimulationControler()
+    controler.adjust_precision(PRECISION)
+    controler.add_conventional_markov_chain(np.array([1.0, 0, 0]), np.array(IRREDUCIBLE), None)
+    return controler
+
+
+def test_stationary_state_distributions():
+    controler = create_controler()
+    controler.instantiate_MCSLimitingDistribution()
+    np.testing.assert_allclose(controler.calculate_stationary_state_distributions(0, 1, 1)[0][0],
+                               IRREDUCIBLE_DISTRIBUTION, atol=1e-10)
+
+
+def test_reset_markov_chains():
+    controler = create_controler()
+    controler.instantiate_MCSLimitingDistribution()
+    controler.calculate_stationary_state_distributions(0, 1, 1)
+    markov_chain = controler.get_markov_chains()[0]
+    key = controler.MCSimulator.get_result_key(0, 1, 1)
+    assert markov_chain.get_cached_stationary_state_distribution(key) is not None
+    controler.instantiate_MCSLimitingDistribution()
+    assert markov_chain.get_cached_stationary_state_distribution(key) is None
+
+
+def test_job_controler_keeps_its_settings():
+    controler = create_controler()
+    controler.instantiate_MCSLimitingDistribution()
+    job_controler = controler.get_job_controler()
+    controler.adjust_precision(1e-3)
+    controler.MCSimulator.add_calculation_listener(lambda step, norm: None)
+    controler.add_conventional_markov_chain(np.array([1.0, 0, 0]), np.array(IRREDUCIBLE), None)
+    assert job_controler.MCSimulator.get_calculation_precision() == PRECISION
+    assert len(job_controler.MCSimulator._calculation_listeners) == 1
+    assert len(job_controler.get_markov_chains()) == 1
+
+
+def test_job_controlers_are_cancelled_separately():
+    controler = create_controler()
+    controler.instantiate_MCSLimitingDistribution()
+    cancelled_job_controler = controler.get_job_controler()
+    cancelled_job_controler.get_calculation_progress().cancel()
+    job_controler = controler.get_job_controler()
+    with pytest.raises(InterruptedError):
+        cancelled_job_controler.calculate_stationary_state_distributions(0, 1, 1)
+    np.testing.assert_allclose(job_controler.calculate_stationary_state_distributions(0, 1, 1)[0][0],
+                               IRREDUCIBLE_DISTRIBUTION, atol=1e-10)
+    assert cancelled_job_controler.get_calculation_progress().is_cancelled()
+    assert not controler.get_calculation_progress().is_cancelled()
+    assert controler.get_calculation_progress().get_state()[0] > 0
+
+
+def test_calculation_errors_are_not_cancellations():
+    controler = create_controler()
+    controler.add_conventional_markov_chain(np.array([0, 1.0, 0]), np.array(REDUCIBLE), None)
+    controler.instantiate_MCSKrylovSubspace()
+    with pytest.raises(ValueError):
+        controler.calculate_stationary_state_distributions(0, 1, 1)
+
+
+def test_plots_of_calculated_distributions():
+    controler = SimulationControler()
+    controler.add_conventional_markov_chain(np.array([1.0, 0, 0]), np.array(IRREDUCIBLE), ["0", "1", "2"])
+    controler.instantiate_MCSRandomWalk("0")
+    steps = []
+    controler.MCSimulator.add_calculation_listener(lambda step, norm=None: steps.append(step))
+    figures, titles = controler.plot_stationary_state_distributions(0, 1, 1, True,
+                                                                    [np.array(IRREDUCIBLE_DISTRIBUTION)])
+    assert len(figures) == 1 and steps == []
+    random_walks, titles = controler.simulate_random_walks(100)
+    assert len(random_walks[0]) == 100
+    steps.clear()
+    figures, titles = controler.plot_random_walk(100, random_walks)
+    assert len(figures) == 1 and steps == []
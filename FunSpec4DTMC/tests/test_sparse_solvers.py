@@ -0,0 +1,106 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+import scipy.sparse
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, \
+    REDUCIBLE, REDUCIBLE_DISTRIBUTION, PERIODIC, PERIODIC_DISTRIBUTION, conventional_chain, birth_death_distribution
+from FunSpec4DTMC.model.markov_chain_simulator.MarkovChainSimulator import MarkovChainSimulator
+from FunSpec4DTMC.model.markov_chain_simulator.MCSAggregationDisaggregation import MCSAggregationDisaggregation
+from FunSpec4DTMC.model.markov_chain_simulator.MCSDecompositionApproach import MCSDecompositionApproach
+from FunSpec4DTMC.model.markov_chain_simulator.MCSPeriodicApproach import MCSPeriodicApproach
+from FunSpec4DTMC.model.markov_chain_simulator.SparseSolvers import solve_closed_class, \
+    solve_stationary_state_distribution
+
+CHAINS = [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, 0),
+          (ABSORBING, ABSORBING_DISTRIBUTION, 1),
+          (REDUCIBLE, REDUCIBLE_DISTRIBUTION, 1),
+          (PERIODIC, PERIODIC_DISTRIBUTION, 0)]
+
+
+def birth_death_matrix(number_of_states: int, p: float, q: float):
+    main = np.full(number_of_states, 1 - p - q)
+    main[0] = 1 - p
+    main[-1] = 1 - q
+    return scipy.sparse.diags([np.full(number_of_states - 1, q), main, np.full(number_of_states - 1, p)],
+                              [-1, 0, 1], format="csr")
+
+
+def test_solve_closed_class():
+    np.testing.assert_allclose(solve_closed_class(scipy.sparse.csr_matrix(IRREDUCIBLE)), IRREDUCIBLE_DISTRIBUTION)
+
+
+@pytest.mark.parametrize("transition_matrix, expected, initial_state", CHAINS)
+def test_solve_stationary_state_distribution(transition_matrix, expected, initial_state):
+    markov_chain = conventional_chain(transition_matrix, initial_state)
+    structural_analysis = MarkovChainSimulator(markov_chain).get_structural_analysis()
+    np.testing.assert_allclose(solve_stationary_state_distribution(transition_matrix,
+                                                                   markov_chain.get_initial_state_vector(),
+                                                                   structural_analysis), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("strategy", [MCSDecompositionApproach, MCSPeriodicApproach])
+@pytest.mark.parametrize("transition_matrix, expected, initial_state", CHAINS)
+def test_decomposition(strategy, transition_matrix, expected, initial_state):
+    simulator = strategy(conventional_chain(transition_matrix, initial_state, sparse=True))
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("partition", ["Automatic", "Coupling"])
+def test_aggregation_disaggregation(partition):
+    markov_chain = conventional_chain(birth_death_matrix(30, .3, .34).toarray(), sparse=True)
+    simulator = MCSAggregationDisaggregation(markov_chain, partition=partition, coupling_threshold=.31)
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0),
+                               birth_death_distribution(30, .3, .34), atol=1e-10)
+
+
+def test_aggregation_disaggregation_absorbing():
+    simulator = MCSAggregationDisaggregation(conventional_chain(ABSORBING, 1))
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), ABSORBING_DISTRIBUTION)
+
+
+def test_aggregation_disaggregation_reducible():
+    simulator = MCSAggregationDisaggregation(conventional_chain(REDUCIBLE, 1))
+    with pytest.raises(ValueError):
+        simulator.calculate_stationary_state_distribution(0)
+
+
+def test_aggregation_disaggregation_is_capped():
+    transition_matrix = [[.5, .3, .1, .1, 0], [.4, .4, .1, 0, .1], [.1, .1, .4, .2, .2], [.1, 0, .3, .5, .1],
+                         [0, .3, .2, .1, .4]]
+    simulator = MCSAggregationDisaggregation(conventional_chain(transition_matrix, sparse=True),
+                                             partition="Coupling", coupling_threshold=.25)
+    simulator.set_calculation_precision(0)
+    simulator.set_maximum_iterations(3)
+    with pytest.raises(ArithmeticError):
+        simulator.calculate_stationary_state_distribution(0)
+
+
+def test_aggregation_disaggregation_block_without_mass():
+    # blocks {0, 1} and {2}, the second block has no probability mass
+    simulator = MCSAggregationDisaggregation(conventional_chain(IRREDUCIBLE, sparse=True))
+    transition_matrix = scipy.sparse.csr_matrix(IRREDUCIBLE)
+    aggregation = scipy.sparse.csr_matrix([[1., 0], [1, 0], [0, 1]])
+    same_block = np.array([[1, 1, 0], [1, 1, 0], [0, 0, 1]])
+    diagonal_blocks = transition_matrix.multiply(same_block).tocsr()
+    coupling = (transition_matrix - diagonal_blocks).tocsr()
+    state_distribution = simulator._transition(np.array([.5, .5, 0]), transition_matrix, aggregation, coupling,
+                                               simulator.block_solver(diagonal_blocks))
+    assert np.all(np.isfinite(state_distribution))
+    np.testing.assert_allclose(state_distribution, IRREDUCIBLE_DISTRIBUTION, atol=1e-12)
@@ -0,0 +1,47 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+import pytest
+from conftest import PRECISION, IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, ABSORBING, ABSORBING_DISTRIBUTION, REDUCIBLE, \
+    conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSSplittingApproach import MCSSplittingApproach
+
+SCHEMES = ["Jacobi", "Gauss-Seidel", "SOR"]
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("transition_matrix, expected, initial_state",
+                         [(IRREDUCIBLE, IRREDUCIBLE_DISTRIBUTION, 0), (ABSORBING, ABSORBING_DISTRIBUTION, 1)])
+def test_splitting_approach(scheme, sparse, transition_matrix, expected, initial_state):
+    simulator = MCSSplittingApproach(scheme, conventional_chain(transition_matrix, initial_state, sparse=sparse))
+    simulator.set_calculation_precision(PRECISION)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), expected, atol=1e-10)
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+def test_splitting_approach_reducible(scheme):
+    simulator = MCSSplittingApproach(scheme, conventional_chain(REDUCIBLE, 1))
+    with pytest.raises(ValueError):
+        simulator.calculate_stationary_state_distribution(0)
+
+
+def test_undamped_jacobi_maximum_iterations():
+    simulator = MCSSplittingApproach("Jacobi", conventional_chain(IRREDUCIBLE), damping=1)
+    simulator.set_calculation_precision(PRECISION)
+    simulator.set_maximum_iterations(1000)
+    with pytest.raises(ArithmeticError):
+        simulator.calculate_stationary_state_distribution(0)
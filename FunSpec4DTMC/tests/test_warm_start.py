@@ -0,0 +1,51 @@
+#  Copyright (C) 2018 University of Tuebingen
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, version 3.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+import numpy as np
+from conftest import PRECISION, IRREDUCIBLE, REDUCIBLE, conventional_chain
+from FunSpec4DTMC.model.markov_chain_simulator.MCSLimitingDistribution import MCSLimitingDistribution
+
+
+def count_steps(simulator):
+    steps = []
+    simulator.add_calculation_listener(lambda step, norm: steps.append(step))
+    simulator.calculate_stationary_state_distribution(0)
+    simulator.remove_calculation_listeners()
+    return steps[-1]
+
+
+def test_warm_start_after_change():
+    markov_chain = conventional_chain(IRREDUCIBLE)
+    simulator = MCSLimitingDistribution(markov_chain)
+    simulator.set_calculation_precision(PRECISION)
+    simulator.enableWarmStart(True)
+    simulator.get_stationary_state_distribution(0)
+    simulator.calculate_stationary_state_distribution(0)
+    markov_chain.set_transition_probability(0, 0, .49)
+    markov_chain.set_transition_probability(0, 1, .51)
+    cold_simulator = MCSLimitingDistribution(markov_chain)
+    cold_simulator.set_calculation_precision(PRECISION)
+    assert count_steps(simulator) < count_steps(cold_simulator)
+    # the closed classes of the changed chain are taken from the last check instead of a new analysis
+    assert markov_chain.get_structural_analysis() is None
+
+
+def test_no_warm_start_for_reducible_chains():
+    markov_chain = conventional_chain(REDUCIBLE, 1)
+    markov_chain.set_stationary_state_distribution(np.array([1.0, 0, 0]))
+    simulator = MCSLimitingDistribution(markov_chain)
+    simulator.set_calculation_precision(PRECISION)
+    simulator.enableWarmStart(True)
+    np.testing.assert_allclose(simulator.calculate_stationary_state_distribution(0), [.5, 0, .5], atol=1e-10)